@@ -53,6 +53,30 @@ def create_app(config_name=None):
     with app.app_context():
         from app import models
     
+    # Availability cache (ზომა/TTL კონფიგურაციიდან)
+    from app.availability import availability_cache
+    availability_cache.init_app(app)
+    from app.dashboard import dashboard_cache
+    dashboard_cache.init_app(app)
+    from app.catalog import directory_cache, service_catalog
+    directory_cache.init_app(app)
+    service_catalog.init_app(app)
+    
+    # კალენდრის delta sync - წაშლილი ჯავშნების კვალის listener
+    from app import calendar_feed  # noqa: F401
+    # სტატისტიკის დღიური rollup - ჯავშნების ჩაწერისას ნახლდება
+    from app import daily_stats  # noqa: F401
+    # კლიენტის ვიზიტების შეჯამება (/api/clients/lookup) - ჯავშნების ჩაწერისას ნახლდება
+    from app import client_summary  # noqa: F401
+
+    # ღია კალენდრების live განახლება (SSE); backend კონფიგურაციიდან
+    from app.booking_events import hub as booking_event_hub
+    booking_event_hub.init_app(app)
+    
+    # CLI ბრძანებები
+    from app.cli import register_commands
+    register_commands(app)
+    
     # Register blueprints
     from app.routes.main import main as main_bp
     app.register_blueprint(main_bp)
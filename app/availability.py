@@ -0,0 +1,687 @@
+"""ხელმისაწვდომობის ძრავი (Availability Engine)
+
+ბარბერის დღის ყველა ჯავშანი იტვირთება ერთი query-ით, თავისუფალი
+ინტერვალები ითვლება დალაგებული sweep-ით, სლოტები კი მეხსიერებაში.
+დღის შიგნით ყველაფერი (გრაფიკი, თავისუფალი ინტერვალები, სლოტები) არის
+მთელი წუთები შუაღამიდან; "HH:MM" ფორმატირება მხოლოდ JSON-ის საზღვარზე ხდება.
+"""
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple
+from datetime import date, datetime, timedelta, time
+from functools import lru_cache
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app import db
+from app.cache import LRUCache
+from app.changes import before_commit, on_commit
+from app.models import User, Barber, BarberSchedule, BarberDayAvailability, Booking
+
+DEFAULT_INTERVAL = 30
+MIN_INTERVAL = 5
+MAX_INTERVAL = 240
+MAX_SLOTS_PER_DAY = 288  # 24 სთ / 5 წთ
+MAX_RANGE_DAYS = 62
+MAX_SEARCH_DAYS = 31
+MAX_SEARCH_RESULTS = 50
+MAX_NEXT_DATES = 14
+MAX_NEXT_HORIZON_DAYS = 120  # შემდეგი თავისუფალი დღის ძებნის ზღვარი
+NEXT_BATCH_DAYS = 14  # ჯავშნების პირველი query-ის შუალედი; ყოველ შემდეგზე ორმაგდება
+MATERIALIZE_DAYS = 60  # რამდენი დღე ინახება barber_day_availability-ში
+
+ONE_MINUTE = timedelta(minutes=1)
+
+# is_working=False შემთხვევაში reason: 'vacation' ან 'day_off'
+# open_minute / close_minute / free - წუთები შუაღამიდან, free: [(start, end), ...]
+DayAvailability = namedtuple(
+    'DayAvailability',
+    ['day', 'is_working', 'reason', 'return_date', 'open_minute', 'close_minute', 'free']
+)
+
+# "HH:MM" ყოველი წუთისთვის - strftime სლოტებზე აღარ გამოიძახება
+MINUTE_LABELS = tuple(f'{minute // 60:02d}:{minute % 60:02d}' for minute in range(24 * 60))
+
+# (user_id, day, duration, interval) -> (DayAvailability, სლოტების წუთების tuple)
+availability_cache = LRUCache(max_entries=2048, ttl=60, config_prefix='AVAILABILITY_CACHE')
+
+
+def minute_of_day(value):
+    """time / datetime -> წუთები შუაღამიდან"""
+    return value.hour * 60 + value.minute
+
+
+def format_minute(minute):
+    return MINUTE_LABELS[minute]
+
+
+def clamp_interval(interval):
+    """ინტერვალის შეზღუდვა, რომ ?interval=1 ვერ აწარმოებდეს ათასობით სლოტს"""
+    if not interval:
+        return DEFAULT_INTERVAL
+    return max(MIN_INTERVAL, min(interval, MAX_INTERVAL))
+
+
+def load_barber(user_id):
+    """User და მისი Barber პროფილი ერთი query-ით"""
+    return db.session.query(User, Barber)\
+        .outerjoin(Barber, Barber.user_id == User.id)\
+        .filter(User.id == user_id)\
+        .first()
+
+
+def is_on_vacation(barber, day):
+    if barber is None or not barber.vacation_start or not barber.vacation_end:
+        return False
+    return barber.vacation_start <= day <= barber.vacation_end
+
+
+def load_busy(barber_id, window_start, window_end):
+    """ერთი query: არა-გაუქმებული ჯავშნები შუალედში, გაერთიანებული ინტერვალებად"""
+    if barber_id is None:
+        return []
+    rows = db.session.query(Booking.start_time, Booking.end_time).filter(
+        Booking.barber_id == barber_id,
+        Booking.status != 'cancelled',
+        Booking.start_time != None,
+        Booking.start_time < window_end,
+        Booking.end_time > window_start
+    ).all()
+    return merge_intervals(rows)
+
+
+def load_busy_by_barber(barber_ids, window_start, window_end):
+    """ერთი query ბევრი ბარბერისთვის: {barber_id: [(start, end), ...]}"""
+    if not barber_ids:
+        return {}
+    rows = db.session.query(Booking.barber_id, Booking.start_time, Booking.end_time).filter(
+        Booking.barber_id.in_(barber_ids),
+        Booking.status != 'cancelled',
+        Booking.start_time != None,
+        Booking.start_time < window_end,
+        Booking.end_time > window_start
+    ).all()
+    grouped = defaultdict(list)
+    for barber_id, start, end in rows:
+        grouped[barber_id].append((start, end))
+    return {barber_id: merge_intervals(intervals) for barber_id, intervals in grouped.items()}
+
+
+def merge_intervals(intervals):
+    """გადამფარავი/მიმდებარე ინტერვალების გაერთიანება (დალაგებული sweep)"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def free_intervals(open_minute, close_minute, busy):
+    """სამუშაო ფანჯარას გამოაკლებს დაკავებულ (დალაგებულ) ინტერვალებს"""
+    free = []
+    cursor = open_minute
+    for start, end in busy:
+        if end <= cursor:
+            continue
+        if start >= close_minute:
+            break
+        if start > cursor:
+            free.append((cursor, start))
+        cursor = end
+        if cursor >= close_minute:
+            break
+    if cursor < close_minute:
+        free.append((cursor, close_minute))
+    return free
+
+
+def load_schedules(user_id):
+    """კვირის გრაფიკი ერთი query-ით: {day_of_week: BarberSchedule}"""
+    rows = BarberSchedule.query.filter_by(barber_id=user_id, is_working=True).all()
+    return {row.day_of_week: row for row in rows}
+
+
+def load_active_barbers(user_ids=None):
+    """აქტიური ბარბერები Barber პროფილით: [(User, Barber), ...] ერთი query-ით"""
+    query = db.session.query(User, Barber)\
+        .join(Barber, Barber.user_id == User.id)\
+        .filter(User.role == 'barber', User.is_active == True)
+    if user_ids is not None:
+        query = query.filter(User.id.in_(user_ids))
+    return query.order_by(User.id).all()
+
+
+def load_schedules_by_user(user_ids):
+    """სამუშაო დღეები ბევრი ბარბერისთვის: {user_id: {day_of_week: BarberSchedule}}"""
+    schedules = defaultdict(dict)
+    if not user_ids:
+        return schedules
+    rows = BarberSchedule.query.filter(
+        BarberSchedule.barber_id.in_(user_ids),
+        BarberSchedule.is_working == True
+    ).all()
+    for row in rows:
+        schedules[row.barber_id][row.day_of_week] = row
+    return schedules
+
+
+def build_day(day, barber, schedule, busy):
+    """ერთი დღის DayAvailability უკვე ჩატვირთული მონაცემებიდან (query-ს გარეშე)"""
+    if is_on_vacation(barber, day):
+        return DayAvailability(day, False, 'vacation', barber.vacation_end + timedelta(days=1),
+                               None, None, [])
+    if schedule is None:
+        return DayAvailability(day, False, 'day_off', None, None, None, [])
+
+    # ჯავშნები წუთებში დღის შუაღამიდან (შუაღამეზე გადასული - უარყოფითი / 1440-ზე მეტი)
+    midnight = datetime.combine(day, time.min)
+    busy_minutes = [((start - midnight) // ONE_MINUTE, -((midnight - end) // ONE_MINUTE))
+                    for start, end in busy]
+    open_minute = minute_of_day(schedule.start_time)
+    close_minute = minute_of_day(schedule.end_time)
+    return DayAvailability(day, True, None, None, open_minute, close_minute,
+                           free_intervals(open_minute, close_minute, busy_minutes))
+
+
+def compute_day_availability(user_id, day, user_barber=None):
+    """ბარბერის (User ID) დღის თავისუფალი ინტერვალები პირდაპირ bookings-დან - მაქსიმუმ 3 query"""
+    if user_barber is None:
+        user_barber = load_barber(user_id)
+    barber = user_barber[1] if user_barber else None
+
+    if is_on_vacation(barber, day):
+        return build_day(day, barber, None, [])
+
+    schedule = BarberSchedule.query.filter_by(
+        barber_id=user_id, day_of_week=day.weekday(), is_working=True
+    ).first()
+    if not schedule:
+        return build_day(day, barber, None, [])
+
+    open_start = datetime.combine(day, schedule.start_time)
+    open_end = datetime.combine(day, schedule.end_time)
+    busy = load_busy(barber.id if barber else None, open_start, open_end)
+    return build_day(day, barber, schedule, busy)
+
+
+def day_busy(busy, busy_starts, busy_ends, day):
+    """ერთი დღის ჯავშნები დალაგებული busy-დან (bisect)"""
+    day_start = datetime.combine(day, time.min)
+    first = bisect_right(busy_ends, day_start)
+    last = bisect_left(busy_starts, day_start + timedelta(days=1))
+    return busy[first:last]
+
+
+def iter_days(barber, schedules, busy, first_day, last_day):
+    """DayAvailability თითო დღისთვის; busy ერთხელ ჩატვირთული სიიდან იჭრება bisect-ით"""
+    # busy დალაგებული და გაერთიანებულია, ამიტომ ბოლოებიც დალაგებულია
+    busy_starts = [start for start, _ in busy]
+    busy_ends = [end for _, end in busy]
+
+    day = first_day
+    while day <= last_day:
+        yield build_day(day, barber, schedules.get(day.weekday()), day_busy(busy, busy_starts, busy_ends, day))
+        day += timedelta(days=1)
+
+
+def working_days(barber, schedules, first_day, last_day):
+    """სამუშაო დღეები [first_day, last_day]-ში დღე-დღე შემოწმების გარეშე:
+    შვებულება ერთი ნახტომით, დასვენების დღეები - კვირის გრაფიკის შემდეგ სამუშაო დღეზე"""
+    weekdays = sorted(schedules)
+    if not weekdays:
+        return
+    day = first_day
+    while day <= last_day:
+        if is_on_vacation(barber, day):
+            day = barber.vacation_end + timedelta(days=1)
+            continue
+        ahead = min((weekday - day.weekday()) % 7 for weekday in weekdays)
+        if ahead:
+            day += timedelta(days=ahead)
+            continue
+        yield day
+        day += timedelta(days=1)
+
+
+def compute_range_availability(user_id, first_day, last_day, user_barber=None):
+    """[first_day, last_day] შუალედის ყველა დღე - 3 query დღეების რაოდენობის მიუხედავად"""
+    if user_barber is None:
+        user_barber = load_barber(user_id)
+    barber = user_barber[1] if user_barber else None
+
+    schedules = load_schedules(user_id)
+    window_start = datetime.combine(first_day, time.min)
+    window_end = datetime.combine(last_day + timedelta(days=1), time.min)
+    busy = load_busy(barber.id if barber else None, window_start, window_end) if schedules else []
+    return list(iter_days(barber, schedules, busy, first_day, last_day))
+
+
+def find_earliest_slots(first_day, duration, interval, limit, days=14, not_before=None):
+    """ნებისმიერი ბარბერი: პირველი limit თავისუფალი (user, barber, day, minute).
+
+    ყველაფერი იტვირთება წინასწარ 3 query-ით (ბარბერები, გრაფიკები, ჯავშნები),
+    შემდეგ თითოეული ბარბერის ქრონოლოგიური სლოტები ერთიანდება k-way heap-ით.
+    """
+    last_day = first_day + timedelta(days=days - 1)
+    user_barbers = load_active_barbers()
+    if not user_barbers:
+        return []
+
+    schedules = load_schedules_by_user([user.id for user, _ in user_barbers])
+    busy = load_busy_by_barber(
+        [barber.id for _, barber in user_barbers],
+        datetime.combine(first_day, time.min),
+        datetime.combine(last_day + timedelta(days=1), time.min)
+    )
+
+    def barber_slots(position, user, barber):
+        for day in iter_days(barber, schedules[user.id], busy.get(barber.id, []), first_day, last_day):
+            after = None
+            if not_before is not None:
+                if day.day < not_before.date():
+                    continue
+                if day.day == not_before.date():
+                    after = minute_of_day(not_before)
+            for minute in slot_minutes(day, duration, interval, after=after):
+                # position ტოლი დროის შემთხვევაში სტაბილურ რიგს იძლევა
+                yield day.day, minute, position, user, barber
+
+    streams = [barber_slots(position, user, barber)
+               for position, (user, barber) in enumerate(user_barbers)
+               if schedules.get(user.id)]
+
+    results = []
+    for day, minute, _, user, barber in heapq.merge(*streams, key=lambda item: item[:3]):
+        results.append((user, barber, day, minute))
+        if len(results) >= limit:
+            break
+    return results
+
+
+def find_next_open_days(user_id, first_day, duration, interval, limit, horizon, now, user_barber):
+    """ბარბერის პირველი limit დღე მინიმუმ ერთი თავისუფალი სლოტით: ([(day, სლოტები)], ბოლო შემოწმებული დღე).
+
+    კანდიდატები მხოლოდ სამუშაო დღეებია (working_days); ჯავშნები იტვირთება ერთი
+    query-ით მთელ ბლოკზე (NEXT_BATCH_DAYS, შემდეგ ორმაგდება), ძებნა horizon დღეზე წყდება.
+    გამოთვლილი დღეები availability cache-შიც იწერება.
+    """
+    barber = user_barber[1]
+    barber_id = barber.id if barber else None
+    token = availability_cache.token()
+    schedules = load_schedules(user_id)
+    last_day = first_day + timedelta(days=horizon - 1)
+
+    results = []
+    batch_first = first_day
+    batch_days = NEXT_BATCH_DAYS
+    searched_until = first_day - timedelta(days=1)
+    while batch_first <= last_day and len(results) < limit:
+        batch_last = min(batch_first + timedelta(days=batch_days - 1), last_day)
+        candidates = list(working_days(barber, schedules, batch_first, batch_last))
+        if candidates:
+            busy = load_busy(barber_id, datetime.combine(candidates[0], time.min),
+                             datetime.combine(candidates[-1] + timedelta(days=1), time.min))
+            busy_starts = [start for start, _ in busy]
+            busy_ends = [end for _, end in busy]
+            for day in candidates:
+                day_availability = build_day(day, barber, schedules[day.weekday()],
+                                             day_busy(busy, busy_starts, busy_ends, day))
+                _, slots = cache_day_slots(user_id, day, duration, interval, day_availability, barber_id, token)
+                slots = upcoming_slots(slots, day, now)
+                searched_until = day
+                if slots:
+                    results.append((day, slots))
+                    if len(results) >= limit:
+                        break
+        if len(results) < limit:
+            searched_until = batch_last
+        batch_first = batch_last + timedelta(days=1)
+        batch_days *= 2
+    return results, searched_until
+
+
+@lru_cache(maxsize=1024)
+def slot_grid(open_minute, close_minute, interval):
+    """გრაფიკის ბადე (open_minute-იდან interval-ის ბიჯით) - ერთხელ ითვლება თითო გრაფიკზე"""
+    return tuple(range(open_minute, close_minute, interval))
+
+
+def slot_minutes(availability, duration, interval, after=None, limit=MAX_SLOTS_PER_DAY):
+    """სლოტების დასაწყისები (წუთები) გრაფიკის ბადეზე, რომლებშიც მთელი სერვისი
+    (duration) თავისუფალ ინტერვალში ეტევა; after - მხოლოდ ამ წუთის შემდეგ"""
+    if not availability.is_working:
+        return ()
+    grid = slot_grid(availability.open_minute, availability.close_minute, interval)
+    slots = []
+    for start, end in availability.free:
+        lower = start if after is None else max(start, after + 1)
+        slots.extend(grid[bisect_left(grid, lower):bisect_right(grid, end - duration)])
+        if len(slots) >= limit:
+            return tuple(slots[:limit])
+    return tuple(slots)
+
+
+def upcoming_slots(slots, day, now):
+    """დალაგებული სლოტებიდან მხოლოდ now-ის შემდეგი (cache-ში წარსული არ იფილტრება)"""
+    today = now.date()
+    if day > today:
+        return slots
+    if day < today:
+        return ()
+    return slots[bisect_right(slots, minute_of_day(now)):]
+
+
+def day_parts(slots):
+    """დალაგებული სლოტები (წუთები) -> {'morning', 'afternoon', 'evening'} "HH:MM" სიები.
+    მონაკვეთები bisect-ით იჭრება (12:00, 17:00)."""
+    noon = bisect_left(slots, 12 * 60)
+    evening = bisect_left(slots, 17 * 60)
+    return {
+        'morning': [format_minute(minute) for minute in slots[:noon]],
+        'afternoon': [format_minute(minute) for minute in slots[noon:evening]],
+        'evening': [format_minute(minute) for minute in slots[evening:]]
+    }
+
+
+def is_range_free(availability, start, end):
+    """მთლიანად ეტევა თუ არა [start, end) (წუთები) ერთ თავისუფალ ინტერვალში"""
+    for free_start, free_end in availability.free:
+        if free_start <= start and end <= free_end:
+            return True
+        if free_start > start:
+            break
+    return False
+
+
+# ========================
+# MATERIALIZED AVAILABILITY
+# ========================
+
+def day_from_row(row, barber):
+    """barber_day_availability ჩანაწერიდან DayAvailability (query-ს გარეშე)"""
+    if not row.is_working:
+        return_date = barber.vacation_end + timedelta(days=1) \
+            if row.reason == 'vacation' and barber and barber.vacation_end else None
+        return DayAvailability(row.day, False, row.reason, return_date, None, None, [])
+    return DayAvailability(row.day, True, None, None, row.open_minute, row.close_minute,
+                           [(start, end) for start, end in row.free_intervals])
+
+
+def row_values(day_availability):
+    """barber_day_availability-ს სვეტები გამოთვლილი დღიდან"""
+    working = day_availability.is_working
+    return {
+        'is_working': working,
+        'reason': day_availability.reason,
+        'open_minute': day_availability.open_minute if working else None,
+        'close_minute': day_availability.close_minute if working else None,
+        'free_intervals': [[start, end] for start, end in day_availability.free] if working else []
+    }
+
+
+def apply_to_row(row, day_availability):
+    """გამოთვლილი დღის ჩაწერა ჩანაწერში"""
+    for column, value in row_values(day_availability).items():
+        setattr(row, column, value)
+
+
+def materialize_window():
+    """(პირველი, ბოლო) დღე, რომელიც barber_day_availability-ში უნდა იყოს - ყოველდღე წინ მიიწევს"""
+    first_day = date.today()
+    return first_day, first_day + timedelta(days=MATERIALIZE_DAYS - 1)
+
+
+def _insert_values(barber_id, day_availability):
+    return {'barber_id': barber_id, 'day': day_availability.day, 'updated_at': datetime.utcnow(),
+            **row_values(day_availability)}
+
+
+def store_missing_rows(barber_id, days):
+    """წაკითხვისას გამოთვლილი დღეების ჩაწერა (მხოლოდ ჰორიზონტში), ცალკე კავშირით.
+
+    მოთხოვნის session-ს არ ეხება; დღე, რომელიც პარალელურმა ჩაწერამ უკვე შექმნა,
+    არ გადაიწერება (ჩამწერის მნიშვნელობა უფრო ახალია) - ასეთ დროს ბლოკი
+    გამოიტოვება და შემდეგი წაკითხვა ცდის ხელახლა.
+    """
+    first_day, last_day = materialize_window()
+    values = [_insert_values(barber_id, day) for day in days if first_day <= day.day <= last_day]
+    if not values:
+        return 0
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(BarberDayAvailability.__table__.insert(), values)
+    except (IntegrityError, OperationalError):
+        return 0
+    return len(values)
+
+
+def get_day_availability(user_id, day, user_barber=None):
+    """დღის ხელმისაწვდომობა მატერიალიზებული ჩანაწერიდან (1 query), თუ ის არსებობს"""
+    if user_barber is None:
+        user_barber = load_barber(user_id)
+    barber = user_barber[1] if user_barber else None
+    if barber is not None:
+        row = BarberDayAvailability.query.filter_by(barber_id=barber.id, day=day).first()
+        if row is not None:
+            return day_from_row(row, barber)
+    day_availability = compute_day_availability(user_id, day, user_barber)
+    if barber is not None:
+        store_missing_rows(barber.id, [day_availability])
+    return day_availability
+
+
+def get_range_availability(user_id, first_day, last_day, user_barber=None):
+    """შუალედის დღეები ჩანაწერებიდან; თუ რომელიმე დღე აკლია - გამოთვლა bookings-დან"""
+    if user_barber is None:
+        user_barber = load_barber(user_id)
+    barber = user_barber[1] if user_barber else None
+    if barber is not None:
+        rows = BarberDayAvailability.query.filter(
+            BarberDayAvailability.barber_id == barber.id,
+            BarberDayAvailability.day >= first_day,
+            BarberDayAvailability.day <= last_day
+        ).order_by(BarberDayAvailability.day).all()
+        if len(rows) == (last_day - first_day).days + 1:
+            return [day_from_row(row, barber) for row in rows]
+    days = compute_range_availability(user_id, first_day, last_day, user_barber)
+    if barber is not None:
+        stored = {row.day for row in rows}
+        store_missing_rows(barber.id, [day for day in days if day.day not in stored])
+    return days
+
+
+def _upsert_row(session, values):
+    """ჩანაწერი, რომელიც პარალელურმა წამკითხველმა შეიძლება უკვე შექმნა - ჩვენი მნიშვნელობა იმარჯვებს"""
+    table = BarberDayAvailability.__table__
+    match = (table.c.barber_id == values['barber_id']) & (table.c.day == values['day'])
+    update = table.update().where(match).values(
+        **{column: value for column, value in values.items() if column not in ('barber_id', 'day')}
+    )
+    if session.execute(update).rowcount == 0:
+        try:
+            with session.begin_nested():
+                session.execute(table.insert().values(**values))
+        except IntegrityError:
+            session.execute(update)
+
+
+def refresh_rows(barber_id, days=None):
+    """ჩანაწერების ხელახალი გამოთვლა; ჰორიზონტში (materialize_window) დაკლებული დღეები იქმნება.
+    days=None - ბარბერის ყველა მომავალი დღე"""
+    first_day, last_day = materialize_window()
+    query = BarberDayAvailability.query.filter(
+        BarberDayAvailability.barber_id == barber_id,
+        BarberDayAvailability.day >= first_day
+    )
+    if days is not None:
+        query = query.filter(BarberDayAvailability.day.in_(days))
+    rows = query.all()
+
+    barber = db.session.get(Barber, barber_id)
+    if barber is None or barber.user_id is None:
+        for row in rows:
+            db.session.delete(row)
+        return len(rows)
+
+    wanted = [first_day + timedelta(days=offset) for offset in range(MATERIALIZE_DAYS)] \
+        if days is None else [day for day in days if first_day <= day <= last_day]
+    existing = {row.day for row in rows}
+    missing = [day for day in wanted if day not in existing]
+    if not rows and not missing:
+        return 0
+
+    touched = existing | set(missing)
+    computed = {day.day: day for day in
+                compute_range_availability(barber.user_id, min(touched), max(touched), (None, barber))}
+    for row in rows:
+        apply_to_row(row, computed[row.day])
+    for day in missing:
+        _upsert_row(db.session, _insert_values(barber_id, computed[day]))
+    return len(touched)
+
+
+@before_commit
+def refresh_materialized(session, changes):
+    """ჯავშნის/გრაფიკის ცვლილება ანახლებს მხოლოდ შეხებულ დღეებს, იმავე ტრანზაქციაში"""
+    whole_barbers = set(changes.barbers)
+    if changes.schedule_users:
+        whole_barbers.update(barber_id for barber_id, in db.session.query(Barber.id).filter(
+            Barber.user_id.in_(changes.schedule_users)
+        ))
+
+    barber_days = defaultdict(set)
+    for change in changes.bookings:
+        for state in (change.before, change.after):
+            if state and state.barber_id is not None and state.start_time \
+                    and state.barber_id not in whole_barbers:
+                barber_days[state.barber_id].update(_booking_days(state))
+
+    for barber_id in whole_barbers:
+        refresh_rows(barber_id)
+    for barber_id, days in barber_days.items():
+        refresh_rows(barber_id, days)
+
+
+def rebuild_materialized(days=MATERIALIZE_DAYS):
+    """ცხრილის თავიდან აგება ყველა ბარბერისთვის [დღეს, დღეს + days)"""
+    first_day = date.today()
+    last_day = first_day + timedelta(days=days - 1)
+    BarberDayAvailability.query.delete()
+
+    count = 0
+    for barber in Barber.query.filter(Barber.user_id != None).all():
+        for day_availability in compute_range_availability(barber.user_id, first_day, last_day, (None, barber)):
+            row = BarberDayAvailability(barber_id=barber.id, day=day_availability.day)
+            apply_to_row(row, day_availability)
+            db.session.add(row)
+            count += 1
+    db.session.commit()
+    return count
+
+
+def check_materialized():
+    """ჩანაწერების შედარება bookings-დან გამოთვლილთან; აბრუნებს შეუსაბამობების სიას"""
+    mismatches = []
+    rows = BarberDayAvailability.query.filter(BarberDayAvailability.day >= date.today())\
+        .order_by(BarberDayAvailability.barber_id, BarberDayAvailability.day).all()
+    by_barber = defaultdict(list)
+    for row in rows:
+        by_barber[row.barber_id].append(row)
+
+    for barber_id, barber_rows in by_barber.items():
+        barber = db.session.get(Barber, barber_id)
+        if barber is None or barber.user_id is None:
+            mismatches.extend((row, None) for row in barber_rows)
+            continue
+        computed = {day.day: day for day in compute_range_availability(
+            barber.user_id, barber_rows[0].day, barber_rows[-1].day, (None, barber))}
+        for row in barber_rows:
+            if day_from_row(row, barber) != computed[row.day]:
+                mismatches.append((row, computed[row.day]))
+    return mismatches
+
+
+# ========================
+# CACHE
+# ========================
+
+def cache_tags(user_id, barber_id, day):
+    tags = [('user', user_id), ('user_day', user_id, day)]
+    if barber_id is not None:
+        tags += [('barber', barber_id), ('barber_day', barber_id, day)]
+    return tags
+
+
+def cache_day_slots(user_id, day, duration, interval, day_availability, barber_id, token):
+    """გამოთვლილი დღის ჩაწერა cache-ში; წარსული სლოტები აქ არ იფილტრება"""
+    entry = (day_availability, slot_minutes(day_availability, duration, interval))
+    availability_cache.set((user_id, day, duration, interval), entry,
+                           tags=cache_tags(user_id, barber_id, day), token=token)
+    return entry
+
+
+def get_day_slots(user_id, day, duration, interval):
+    """(DayAvailability, სლოტების წუთები) cache-დან ან ძრავიდან; None - ბარბერი არ არსებობს"""
+    entry = availability_cache.get((user_id, day, duration, interval))
+    if entry is not None:
+        return entry
+
+    token = availability_cache.token()
+    user_barber = load_barber(user_id)
+    if not user_barber:
+        return None
+    barber = user_barber[1]
+    day_availability = get_day_availability(user_id, day, user_barber)
+    return cache_day_slots(user_id, day, duration, interval, day_availability,
+                           barber.id if barber else None, token)
+
+
+def get_range_slots(user_id, first_day, last_day, duration, interval, user_barber):
+    """[(DayAvailability, სლოტები)] - თუ ყველა დღე cache-შია, DB-ს არ მივმართავთ"""
+    days = []
+    day = first_day
+    while day <= last_day:
+        entry = availability_cache.get((user_id, day, duration, interval))
+        if entry is None:
+            break
+        days.append(entry)
+        day += timedelta(days=1)
+    else:
+        return days
+
+    token = availability_cache.token()
+    barber = user_barber[1]
+    return [
+        cache_day_slots(user_id, day_availability.day, duration, interval, day_availability,
+                        barber.id if barber else None, token)
+        for day_availability in get_range_availability(user_id, first_day, last_day, user_barber)
+    ]
+
+
+def _booking_days(state):
+    day = state.start_time.date()
+    last = (state.end_time or state.start_time).date()
+    while day <= last:
+        yield day
+        day += timedelta(days=1)
+
+
+@on_commit
+def invalidate_availability(changes):
+    """ზუსტი ინვალიდაცია: მხოლოდ შეცვლილი (ბარბერი, დღე) ან ბარბერის გრაფიკი"""
+    tags = set()
+    for change in changes.bookings:
+        for state in (change.before, change.after):
+            if state and state.barber_id is not None and state.start_time:
+                tags.update(('barber_day', state.barber_id, day) for day in _booking_days(state))
+    tags.update(('user', user_id) for user_id in changes.schedule_users)
+    tags.update(('user', user_id) for user_id in changes.deleted_users)
+    for barber_id, user_id in changes.barbers.items():
+        tags.add(('barber', barber_id))
+        if user_id is not None:
+            tags.add(('user', user_id))
+    if tags:
+        availability_cache.invalidate(*tags)
@@ -0,0 +1,282 @@
+"""ჯავშნების ცვლილებების live არხი (SSE) ღია ადმინ კალენდრებისთვის
+
+ცვლილებები before_commit-ში გროვდება (app/changes.py) და commit-ის შემდეგ
+ეგზავნება ყველა ღია /api/admin/booking-events კავშირს.
+
+Backend (BOOKING_EVENTS_BACKEND):
+    local    - ერთი პროცესი: შეტყობინება პირდაპირ გამომწერების რიგებში
+    postgres - რამდენიმე worker: pg_notify იმავე ტრანზაქციაში (rollback-ისას
+               არ იგზავნება), თითო პროცესში ერთი LISTEN thread ანაწილებს
+ახალი backend BACKENDS-ში ემატება (stage / commit / start / remote).
+"""
+import json
+import logging
+import queue
+import select
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app import calendar_feed, db
+from app.changes import before_commit, on_commit
+from app.models import Barber
+
+CHANNEL = 'booking_events'
+QUEUE_SIZE = 256  # ნელი კლიენტის რიგი; გადავსებისას - resync
+HEARTBEAT_SECONDS = 15
+RETRY_MS = 5000
+RECONNECT_SECONDS = 5
+NOTIFY_LIMIT = 7900  # PostgreSQL NOTIFY payload < 8000 ბაიტი
+
+# კლიენტმა შეიძლება შეტყობინებები გამოტოვა - delta sync-ით უნდა აღადგინოს
+RESYNC = {'type': 'resync'}
+
+
+class Subscription:
+    """ერთი SSE კავშირის რიგი"""
+
+    def __init__(self, hub, maxsize=QUEUE_SIZE):
+        self._hub = hub
+        self._queue = queue.Queue(maxsize)
+
+    def push(self, message):
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            # კლიენტი ვერ ასწრებს - რიგი იწმინდება, ნაცვლად ერთი resync
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._queue.put_nowait(RESYNC)
+
+    def get(self, timeout=HEARTBEAT_SECONDS):
+        """შემდეგი შეტყობინება ან None (timeout - heartbeat-ის დროა)"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._hub.unsubscribe(self)
+
+
+class LocalBackend:
+    """ერთი პროცესი - commit-ის შემდეგ პირდაპირ hub-ში"""
+    remote = False
+
+    def __init__(self, hub, app=None):
+        self.hub = hub
+
+    def start(self):
+        pass
+
+    def stage(self, session, messages):
+        pass
+
+    def commit(self, messages):
+        for message in messages:
+            self.hub.deliver(message)
+
+
+class PostgresBackend:
+    """რამდენიმე worker - pg_notify / LISTEN (საკუთარი პროცესის ჩათვლით)"""
+    remote = True
+
+    def __init__(self, hub, app=None):
+        self.hub = hub
+        url = make_url(app.config['SQLALCHEMY_DATABASE_URI']).set(drivername='postgresql')
+        self.dsn = url.render_as_string(hide_password=False)
+        self._thread = None
+        self._thread_guard = threading.Lock()
+
+    def start(self):
+        """LISTEN thread პირველ გამომწერზე (fork-ის შემდეგ, worker-ში)"""
+        with self._thread_guard:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._listen, name='booking-events', daemon=True)
+                self._thread.start()
+
+    def stage(self, session, messages):
+        for message in messages:
+            payload = json.dumps(message, ensure_ascii=False, separators=(',', ':'), default=str)
+            if len(payload.encode('utf-8')) > NOTIFY_LIMIT:
+                # დიდი შენიშვნები - კლიენტი ჯავშანს delta sync-ით წამოიღებს
+                payload = json.dumps({**message, 'event': None}, separators=(',', ':'))
+            session.execute(text('SELECT pg_notify(:channel, :payload)'),
+                            {'channel': CHANNEL, 'payload': payload})
+
+    def commit(self, messages):
+        pass
+
+    def _listen(self):
+        import psycopg2
+
+        connected_before = False
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.autocommit = True
+                conn.cursor().execute(f'LISTEN {CHANNEL}')
+                if connected_before:
+                    # კავშირის გაწყვეტისას შეტყობინებები შეიძლება დაიკარგა
+                    self.hub.deliver(RESYNC)
+                connected_before = True
+                while True:
+                    if not select.select([conn], [], [], HEARTBEAT_SECONDS)[0]:
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self.hub.deliver(json.loads(notify.payload))
+            except Exception as e:
+                logging.error(f"Booking events LISTEN failed: {str(e)}")
+                time.sleep(RECONNECT_SECONDS)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+BACKENDS = {
+    'local': LocalBackend,
+    'postgres': PostgresBackend
+}
+
+
+class BookingEventHub:
+    """პროცესის გამომწერები + backend"""
+
+    def __init__(self):
+        self.backend = LocalBackend(self)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        name = app.config.get('BOOKING_EVENTS_BACKEND', 'local')
+        if name not in BACKENDS:
+            raise ValueError(f'უცნობი BOOKING_EVENTS_BACKEND: {name}')
+        self.backend = BACKENDS[name](self, app)
+
+    def subscribe(self):
+        subscription = Subscription(self)
+        with self._lock:
+            self._subscribers.add(subscription)
+        self.backend.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def has_listeners(self):
+        """სხვა worker-ის გამომწერები remote backend-ზე არ ჩანს - ყოველთვის იგზავნება"""
+        return self.backend.remote or bool(self._subscribers)
+
+    def deliver(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.push(message)
+
+
+hub = BookingEventHub()
+
+
+def _event_type(before, after):
+    if before is None:
+        return 'created'
+    if after is None:
+        return 'deleted'
+    if after.status == 'cancelled' and before.status != 'cancelled':
+        return 'cancelled'
+    if (before.barber_id, before.start_time, before.end_time) != \
+            (after.barber_id, after.start_time, after.end_time):
+        return 'moved'
+    return 'updated'
+
+
+@before_commit
+def prepare_messages(session, changes):
+    """ტრანზაქციის ჯავშნების ცვლილებები -> შეტყობინებები (თითო ჯავშანზე ერთი)"""
+    if not (changes.bookings or changes.booking_details) or not hub.has_listeners():
+        return
+
+    states = {}  # booking_id -> [პირველი before, ბოლო after]
+    for change in changes.bookings:
+        if change.booking_id in states:
+            states[change.booking_id][1] = change.after
+        else:
+            states[change.booking_id] = [change.before, change.after]
+    # იმავე ტრანზაქციაში შექმნილი და წაშლილი
+    states = {booking_id: pair for booking_id, pair in states.items() if pair != [None, None]}
+    # მხოლოდ სახელი / შენიშვნა და ა.შ. - დრო, ბარბერი და სტატუსი იგივეა
+    details = changes.booking_details - states.keys()
+    if not states and not details:
+        return
+
+    events = calendar_feed.load_events(
+        [booking_id for booking_id, (_, after) in states.items() if after] + list(details))
+    barber_ids = {state.barber_id for pair in states.values() for state in pair if state is not None}
+    user_ids = dict(session.execute(
+        db.select(Barber.id, Barber.user_id).where(Barber.id.in_(barber_ids))
+    ).all()) if barber_ids else {}
+
+    messages = []
+    for booking_id, (before, after) in states.items():
+        event = events.get(booking_id)
+        barbers = {user_ids.get(state.barber_id) for state in (before, after) if state is not None}
+        messages.append({
+            'type': _event_type(before, after),
+            'id': booking_id,
+            'barber_ids': sorted(user_id for user_id in barbers if user_id is not None),
+            'event': event.to_dict() if event else None
+        })
+    for booking_id in details:
+        event = events.get(booking_id)
+        if event is None:
+            continue
+        messages.append({
+            'type': 'updated',
+            'id': booking_id,
+            'barber_ids': [event.barber_user_id] if event.barber_user_id else [],
+            'event': event.to_dict()
+        })
+
+    changes.outbox[CHANNEL] = messages
+    hub.backend.stage(session, messages)
+
+
+@on_commit
+def publish_messages(changes):
+    messages = changes.outbox.get(CHANNEL)
+    if messages:
+        hub.backend.commit(messages)
+
+
+def stream(subscription, user_id=None):
+    """SSE ნაკადი; user_id - ბარბერი ხედავს მხოლოდ საკუთარ ჯავშნებს"""
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        while True:
+            message = subscription.get()
+            if message is None:
+                yield ': ping\n\n'
+                continue
+            if message is RESYNC or message.get('type') == 'resync':
+                yield 'event: resync\ndata: {}\n\n'
+                continue
+            if user_id is not None:
+                if user_id not in message['barber_ids']:
+                    continue
+                event = message['event']
+                if event and event['barber_id'] != user_id:
+                    # სხვა ბარბერთან გადავიდა - კალენდრიდან უნდა გაქრეს
+                    message = {**message, 'event': None}
+            data = json.dumps(message, ensure_ascii=False, separators=(',', ':'), default=str)
+            yield f'event: booking\ndata: {data}\n\n'
+    finally:
+        subscription.close()
@@ -0,0 +1,113 @@
+"""ჯავშნების ჩაწერის სერიალიზაცია ბარბერის მიხედვით
+
+PostgreSQL-ზე pg_advisory_xact_lock (ტრანზაქციის ბოლომდე), სხვა ბაზებზე
+(SQLite ტესტებისთვის) - პროცესის შიდა lock თითო ბარბერზე. გლობალური
+lock არ არის, ამიტომ სხვადასხვა ბარბერის ჯავშნები ერთმანეთს არ ელოდება.
+ბოლო დაცვა ბაზის დონეზეა (bookings_no_overlap, იხ. models.py).
+"""
+import threading
+from collections import defaultdict
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import Booking
+
+# pg_advisory_xact_lock(namespace, barber_id) - რომ სხვა advisory lock-ებს არ დაემთხვეს
+ADVISORY_NAMESPACE = 0x4D41
+
+_local_locks = defaultdict(threading.Lock)
+_local_locks_guard = threading.Lock()
+
+
+class SlotTaken(Exception):
+    """დრო უკვე დაკავებულია"""
+
+
+def lock_barber(*barber_ids):
+    """ბარბერ(ებ)ის ჩაწერის lock მიმდინარე ტრანზაქციის ბოლომდე.
+    რამდენიმე ბარბერი ყოველთვის ზრდადი ID-ით იკეტება (deadlock-ის თავიდან ასაცილებლად)."""
+    session = db.session()
+    # ტრანზაქცია უნდა არსებობდეს, რომ after_transaction_end-მა lock აუცილებლად გაათავისუფლოს
+    session.connection()
+    held = session.info.setdefault('barber_locks', {})
+    is_postgres = db.engine.dialect.name == 'postgresql'
+
+    for barber_id in sorted({b for b in barber_ids if b is not None}):
+        if barber_id in held:
+            continue
+        if is_postgres:
+            session.execute(text('SELECT pg_advisory_xact_lock(:ns, :barber_id)'),
+                            {'ns': ADVISORY_NAMESPACE, 'barber_id': barber_id})
+            held[barber_id] = None
+        else:
+            with _local_locks_guard:
+                lock = _local_locks[barber_id]
+            lock.acquire()
+            held[barber_id] = lock
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _release_local_locks(session, transaction):
+    if transaction.parent is not None:
+        return
+    for lock in session.info.pop('barber_locks', {}).values():
+        if lock is not None:
+            lock.release()
+
+
+def is_overlap_error(error):
+    """IntegrityError ბაზის bookings_no_overlap დაცვიდანაა?"""
+    return 'bookings_no_overlap' in str(getattr(error, 'orig', error))
+
+
+def find_overlap(barber_id, start, end, exclude_id=None):
+    """პირველი არა-გაუქმებული ჯავშანი, რომელიც [start, end)-ს კვეთს"""
+    query = Booking.query.filter(
+        Booking.barber_id == barber_id,
+        Booking.status != 'cancelled',
+        Booking.start_time < end,
+        Booking.end_time > start
+    )
+    if exclude_id is not None:
+        query = query.filter(Booking.id != exclude_id)
+    return query.first()
+
+
+def reserve(barber_id, start, end, exclude_id=None):
+    """lock + გადაფარვის შემოწმება; დაკავებულის შემთხვევაში SlotTaken"""
+    lock_barber(barber_id)
+    if find_overlap(barber_id, start, end, exclude_id) is not None:
+        raise SlotTaken()
+
+
+class BarberIntervals:
+    """ბარბერების არა-გაუქმებული ჯავშნები შუალედში - ერთი query, შემდეგ მეხსიერებაში.
+    bulk ოპერაციები ერთმანეთის შედეგსაც ითვალისწინებენ (add / discard)."""
+
+    def __init__(self, barber_ids, window_start=None, window_end=None):
+        self._intervals = {barber_id: {} for barber_id in barber_ids}
+        if not self._intervals or window_start is None or window_start >= window_end:
+            return
+        rows = db.session.query(Booking.id, Booking.barber_id, Booking.start_time, Booking.end_time).filter(
+            Booking.barber_id.in_(self._intervals),
+            Booking.status != 'cancelled',
+            Booking.start_time < window_end,
+            Booking.end_time > window_start
+        )
+        for booking_id, barber_id, start, end in rows:
+            self._intervals[barber_id][booking_id] = (start, end)
+
+    def conflicts(self, barber_id, start, end, exclude_id=None):
+        return any(
+            other_start < end and other_end > start
+            for booking_id, (other_start, other_end) in self._intervals.get(barber_id, {}).items()
+            if booking_id != exclude_id
+        )
+
+    def add(self, barber_id, booking_id, start, end):
+        self._intervals.setdefault(barber_id, {})[booking_id] = (start, end)
+
+    def discard(self, barber_id, booking_id):
+        self._intervals.get(barber_id, {}).pop(booking_id, None)
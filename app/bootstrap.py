@@ -0,0 +1,75 @@
+"""საჯარო ჯავშნის გვერდის bootstrap
+
+booking.js პირველ სასარგებლო ეკრანამდე სამ თანმიმდევრულ მოთხოვნას აკეთებდა
+(/api/services, /api/barbers, /api/available-slots). აქ ყველაფერი ერთ
+payload-შია: სერვისები (კატალოგის snapshot), ბარბერების ცნობარი და თითო
+ბარბერის უახლოესი BOOTSTRAP_DAYS ღია დღის სლოტები.
+
+სლოტები ყველა ბარბერისთვის საერთო 3 query-ით იგება (ბარბერები, გრაფიკები,
+ჯავშნები) და დამოკიდებულია მხოლოდ ხანგრძლივობაზე, ამიტომ ითვლება თითო
+განსხვავებულ ხანგრძლივობაზე და არა სერვისზე. გამოთვლილი დღეები availability
+cache-შიც იწერება - იმავე დღის /api/available-slots DB-ს აღარ მიმართავს.
+"""
+from datetime import datetime, time, timedelta
+
+from app import availability
+from app.catalog import barber_directory, service_catalog
+
+BOOTSTRAP_DAYS = 3  # ღია დღეები თითო ბარბერზე
+SEARCH_DAYS = 14  # რამდენ დღეში ვეძებთ
+
+
+def _open_days(user, barber, week, busy, durations, now, token):
+    """{duration: [{'date', 'slots'}]} - პირველი BOOTSTRAP_DAYS დღე თავისუფალი სლოტით"""
+    today = now.date()
+    found = {duration: [] for duration in durations}
+    days = availability.iter_days(barber, week, busy, today, today + timedelta(days=SEARCH_DAYS - 1))
+    for day in days:
+        if not day.is_working:
+            continue
+        for duration in durations:
+            if len(found[duration]) >= BOOTSTRAP_DAYS:
+                continue
+            _, slots = availability.cache_day_slots(user.id, day.day, duration, availability.DEFAULT_INTERVAL,
+                                                    day, barber.id, token)
+            slots = availability.upcoming_slots(slots, day.day, now)
+            if slots:
+                found[duration].append({'date': day.day.isoformat(), 'slots': availability.day_parts(slots)})
+        if all(len(open_days) >= BOOTSTRAP_DAYS for open_days in found.values()):
+            break
+    return found
+
+
+def build_bootstrap(now=None):
+    """{'services', 'services_version', 'barbers', 'interval', 'slots'};
+    slots: {ხანგრძლივობა: {ბარბერის User.id: [{'date', 'slots': {morning, afternoon, evening}}]}}"""
+    now = now or datetime.now()
+    snapshot = service_catalog.current()
+    durations = sorted({service.duration for service in snapshot.services if service.duration})
+
+    token = availability.availability_cache.token()
+    user_barbers = availability.load_active_barbers()
+    schedules = availability.load_schedules_by_user([user.id for user, _ in user_barbers])
+    window_start = datetime.combine(now.date(), time.min)
+    busy = availability.load_busy_by_barber(
+        [barber.id for _, barber in user_barbers],
+        window_start,
+        window_start + timedelta(days=SEARCH_DAYS)
+    ) if durations else {}
+
+    slots = {str(duration): {} for duration in durations}
+    for user, barber in user_barbers:
+        if not durations or not schedules.get(user.id):
+            continue
+        found = _open_days(user, barber, schedules[user.id], busy.get(barber.id, []), durations, now, token)
+        for duration, open_days in found.items():
+            slots[str(duration)][str(user.id)] = open_days
+
+    return {
+        'services_version': snapshot.version,
+        'services': [service._asdict() for service in snapshot.services],
+        'barbers': barber_directory(),
+        'interval': availability.DEFAULT_INTERVAL,
+        'generated_at': now.isoformat(timespec='seconds'),
+        'slots': slots
+    }
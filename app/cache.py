@@ -0,0 +1,102 @@
+"""პროცესის შიდა LRU cache (TTL, tag-ებით ინვალიდაცია, hit/miss მრიცხველები)"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """შეზღუდული ზომის LRU cache.
+
+    ყოველ ჩანაწერს აქვს tag-ები (მაგ. ('barber_day', 3, date)), რომლითაც
+    ჩაწერის ოპერაციები ზუსტად აუქმებენ მხოლოდ შეცვლილ ჩანაწერებს.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60, config_prefix=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.config_prefix = config_prefix
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, expires_at, tags)
+        self._tags = {}  # tag -> set(keys)
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        if self.config_prefix:
+            self.max_entries = app.config.get(f'{self.config_prefix}_SIZE', self.max_entries)
+            self.ttl = app.config.get(f'{self.config_prefix}_TTL', self.ttl)
+
+    def token(self):
+        """გამოთვლამდე აღებული token - set() არ ჩაწერს, თუ შუაში ინვალიდაცია მოხდა"""
+        return self._generation
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, tags=(), token=None):
+        with self._lock:
+            if token is not None and token != self._generation:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, *tags):
+        """ყველა ჩანაწერის წაშლა, რომელსაც რომელიმე მოცემული tag აქვს"""
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
@@ -0,0 +1,197 @@
+"""ადმინის კალენდრის feed (/api/admin/all-bookings)
+
+ერთი projected Core query (bookings + services + barbers), ORM ობიექტების
+და lazy load-ების გარეშე. სტრიქონები yield_per-ით იკითხება და JSON
+ნაწილ-ნაწილ იგზავნება, ამიტომ მეხსიერება შუალედის ზომაზე არ არის დამოკიდებული.
+
+Delta sync (?since=cursor): მხოლოდ cursor-ის შემდეგ შექმნილი/შეცვლილი
+ჯავშნები (updated_at) და ძველი ადგილების კვალი (booking_tombstones) - წაშლილი
+ან სხვა ბარბერზე / დროზე გადატანილი ჯავშანი. ორივე იფილტრება ბარბერით და
+შუალედით, ამიტომ removed-ში მხოლოდ ამ ხედში ადრე ნაჩვენები ჯავშნები ხვდება.
+"""
+import json
+from datetime import datetime, timedelta
+
+from app import db
+from app.changes import before_commit
+from app.models import Barber, Booking, BookingTombstone, Service
+
+MAX_FEED_DAYS = 62
+FETCH_SIZE = 500
+
+# cursor = მოთხოვნის დრო - CURSOR_LAG: updated_at flush-ისას იწერება, commit კი
+# შეიძლება ცოტა მოგვიანებით მოხდეს - ასეთი ჩანაწერი შემდეგ delta-ში მაინც მოხვდება
+CURSOR_LAG = timedelta(seconds=10)
+# უფრო ძველი cursor-ით delta აღარ გაიცემა (კვალი იშლება) - კლიენტი თავიდან ტვირთავს
+TOMBSTONE_RETENTION = timedelta(days=7)
+
+STATUS_COLORS = {
+    'pending': '#f59e0b',
+    'confirmed': '#10b981',
+    'cancelled': '#ef4444',
+    'completed': '#3b82f6',
+    'no-show': '#6b7280'
+}
+DEFAULT_COLOR = STATUS_COLORS['pending']
+
+
+class CalendarEvent:
+    """ერთი ჯავშანი კალენდრისთვის - მხოლოდ საჭირო ველები"""
+    __slots__ = ('id', 'customer_name', 'customer_phone', 'start_time', 'end_time', 'status',
+                 'notes', 'price', 'service_name', 'service_duration', 'barber_id', 'barber_name',
+                 'barber_user_id')
+
+    def __init__(self, row):
+        for field in self.__slots__:
+            setattr(self, field, getattr(row, field))
+
+    def to_dict(self):
+        color = STATUS_COLORS.get(self.status, DEFAULT_COLOR)
+        return {
+            'id': self.id,
+            'title': self.customer_name,
+            'start': self.start_time.isoformat(),
+            'end': self.end_time.isoformat() if self.end_time else None,
+            'backgroundColor': color,
+            'borderColor': color,
+            'barber_id': self.barber_user_id,  # resource ID = User ID (როგორც /api/barbers-ში)
+            'extendedProps': {
+                'customerName': self.customer_name,
+                'customerPhone': self.customer_phone,
+                'serviceName': self.service_name,
+                'servicePrice': self.price,
+                'serviceDuration': self.service_duration,
+                'barberName': self.barber_name or 'Unknown',
+                'status': self.status,
+                'notes': self.notes
+            }
+        }
+
+
+def _projection():
+    return db.select(
+        Booking.id,
+        Booking.customer_name,
+        Booking.customer_phone,
+        Booking.start_time,
+        Booking.end_time,
+        Booking.status,
+        Booking.notes,
+        Booking.price,
+        Service.name.label('service_name'),
+        Service.duration.label('service_duration'),
+        Booking.barber_id,
+        Barber.name.label('barber_name'),
+        Barber.user_id.label('barber_user_id')
+    ).outerjoin(Service, Service.id == Booking.service_id)\
+     .outerjoin(Barber, Barber.id == Booking.barber_id)
+
+
+def feed_query(window_start, window_end, barber_id=None):
+    """[window_start, window_end) შუალედის ჯავშნები ერთი query-ით"""
+    query = _projection()\
+        .where(Booking.start_time >= window_start, Booking.start_time < window_end)\
+        .order_by(Booking.start_time)
+    if barber_id is not None:
+        query = query.where(Booking.barber_id == barber_id)
+    return query
+
+
+def load_events(booking_ids):
+    """{booking_id: CalendarEvent} კონკრეტული ჯავშნებისთვის (ერთი query)"""
+    if not booking_ids:
+        return {}
+    rows = db.session.execute(_projection().where(Booking.id.in_(booking_ids)))
+    return {row.id: CalendarEvent(row) for row in rows}
+
+
+def iter_events(window_start, window_end, barber_id=None):
+    result = db.session.execute(
+        feed_query(window_start, window_end, barber_id).execution_options(yield_per=FETCH_SIZE)
+    )
+    for row in result:
+        yield CalendarEvent(row)
+
+
+def stream_json(events):
+    """JSON მასივი ნაწილ-ნაწილ: '[' + event-ები + ']' (ერთი chunk ~FETCH_SIZE event-ზე)"""
+    yield '['
+    chunk = []
+    first = True
+    for event in events:
+        encoded = json.dumps(event.to_dict(), ensure_ascii=False, separators=(',', ':'))
+        chunk.append(encoded if first else ',' + encoded)
+        first = False
+        if len(chunk) >= FETCH_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+    yield ']'
+
+
+# ========================
+# DELTA SYNC
+# ========================
+
+def new_cursor():
+    """cursor მომდევნო ?since=-სთვის - აიღება query-მდე"""
+    return (datetime.utcnow() - CURSOR_LAG).isoformat()
+
+
+def parse_cursor(value):
+    """ValueError - არასწორი cursor"""
+    return datetime.fromisoformat(value)
+
+
+def cursor_expired(since):
+    return since < datetime.utcnow() - TOMBSTONE_RETENTION
+
+
+def delta(since, window_start, window_end, barber_id=None):
+    """(events, removed_ids): since-ის შემდეგ შეცვლილი ჯავშნები ამ ხედში (ბარბერი + შუალედი).
+    removed - ჯავშნები, რომლებიც ამ ხედში იყო და წაიშალა ან გავიდა მისგან."""
+    rows = db.session.execute(
+        feed_query(window_start, window_end, barber_id).where(Booking.updated_at > since)
+    )
+    events = [CalendarEvent(row) for row in rows]
+
+    current = {event.id for event in events}
+    tombstones = db.session.query(BookingTombstone.booking_id).filter(
+        BookingTombstone.deleted_at > since,
+        BookingTombstone.start_time >= window_start,
+        BookingTombstone.start_time < window_end
+    )
+    if barber_id is not None:
+        tombstones = tombstones.filter(BookingTombstone.barber_id == barber_id)
+    # ხედის შიგნით გადატანილი ჯავშანი events-შია - ამოღება არ სჭირდება
+    removed = sorted({booking_id for booking_id, in tombstones} - current)
+    return events, removed
+
+
+def _left_position(change):
+    """ჯავშანმა ძველი ადგილი (ბარბერი / დრო) დატოვა - წაიშალა ან გადაიტანეს"""
+    if change.op == 'delete':
+        return True
+    return change.op == 'update' and change.before.start_time is not None and (
+        change.before.barber_id != change.after.barber_id
+        or change.before.start_time != change.after.start_time
+    )
+
+
+@before_commit
+def record_tombstones(session, changes):
+    """დატოვებული ადგილების კვალი იმავე ტრანზაქციაში; ვადაგასული კვალი იშლება"""
+    left = [change for change in changes.bookings if _left_position(change)]
+    if not left:
+        return
+    now = datetime.utcnow()
+    for change in left:
+        session.add(BookingTombstone(
+            booking_id=change.booking_id,
+            barber_id=change.before.barber_id,
+            start_time=change.before.start_time,
+            deleted_at=now
+        ))
+    BookingTombstone.query.filter(BookingTombstone.deleted_at < now - TOMBSTONE_RETENTION)\
+        .delete(synchronize_session=False)
@@ -0,0 +1,163 @@
+"""საჯარო კატალოგი: ბარბერების ცნობარი და სერვისების snapshot
+
+/api/barbers-ის სია (id, სახელი, სპეციალობა, ფოტოს URL) ერთხელ იგება ერთი
+join query-ით და პროცესის cache-ში ინახება. გასაღებში შედის 'barbers'
+რესურსის ვერსია (app/http_cache.py), ამიტომ სხვა worker-ში შესრულებული
+ადმინის ცვლილება აქაც მაშინვე ჩანს; საკუთარ პროცესში users / barbers-ის
+ჩაწერა cache-ს commit-ისთანავე ასუფთავებს.
+
+აქტიური სერვისები ინახება უცვლელ snapshot-ად 'services' რესურსის ვერსიით
+(services ცხრილის ნებისმიერი ჩაწერა ვერსიას ზრდის). /api/services?v=<ვერსია>
+snapshot-იდან query-ს გარეშე ბრუნდება immutable header-ებით; ვერსია ბაზაში
+მოწმდება არაუმეტეს SERVICE_CATALOG_TTL წამში ერთხელ.
+
+წაკითხვა ბაზაში არაფერს წერს - Barber.name ადმინის რედაქტირებისას სინქრონდება.
+"""
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+from flask import Response, current_app, url_for
+
+from app import db
+from app.cache import LRUCache
+from app.changes import on_commit
+from app.http_cache import resource_state
+from app.models import Barber, ResourceVersion, Service, User
+
+directory_cache = LRUCache(max_entries=8, ttl=300, config_prefix='CATALOG_CACHE')
+
+DEFAULT_SPECIALIZATION = 'ბარბერი'
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+ServiceEntry = namedtuple('ServiceEntry', ['id', 'name', 'description', 'price', 'duration'])
+# services - ServiceEntry-ების tuple, body - მზა /api/services JSON (bytes)
+ServiceSnapshot = namedtuple('ServiceSnapshot', ['version', 'services', 'body'])
+
+
+def _image_src(image_url):
+    """ფოტოს URL, თუ ფაილი არსებობს (შემოწმება მხოლოდ ცნობარის აგებისას)"""
+    if not image_url:
+        return None
+    if not os.path.exists(os.path.join(current_app.root_path, 'static', image_url)):
+        return None
+    return url_for('static', filename=image_url)
+
+
+def _build_directory():
+    rows = db.session.query(User, Barber)\
+        .outerjoin(Barber, Barber.user_id == User.id)\
+        .filter(User.role == 'barber', User.is_active == True)\
+        .order_by(User.id).all()
+    directory = []
+    for user, barber in rows:
+        directory.append({
+            'id': user.id,  # Frontend-ს ვაძლევთ User ID-ს
+            'name': user.get_full_name(),
+            'specialization': (barber.specialties if barber else None) or user.specialization
+                              or DEFAULT_SPECIALIZATION,
+            'image': _image_src(barber.image_url) if barber else None
+        })
+    return directory
+
+
+def barber_directory():
+    """აქტიური ბარბერები [{'id', 'name', 'specialization', 'image'}] (User.id-ით დალაგებული)"""
+    version, _ = resource_state(('barbers',))
+    key = ('barbers', version)
+    directory = directory_cache.get(key)
+    if directory is None:
+        token = directory_cache.token()
+        directory = _build_directory()
+        directory_cache.set(key, directory, token=token)
+    return directory
+
+
+class ServiceCatalog:
+    """აქტიური სერვისების უცვლელი snapshot + ვერსია (ერთი პროცესისთვის)"""
+
+    def __init__(self, ttl=5):
+        self.ttl = ttl
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('SERVICE_CATALOG_TTL', self.ttl)
+
+    def peek(self):
+        """ბოლო snapshot ბაზის გარეშე (ან None)"""
+        return self._snapshot
+
+    def current(self, refresh=False):
+        """მიმდინარე snapshot; ttl-ის განმავლობაში (და refresh-ის გარეშე) - 0 query"""
+        snapshot = self._snapshot
+        if snapshot is not None and not refresh and time.monotonic() - self._checked_at < self.ttl:
+            return snapshot
+
+        generation = self._generation
+        if snapshot is not None and _services_version() == snapshot.version:
+            self._checked_at = time.monotonic()
+            return snapshot
+
+        snapshot = _build_services()
+        with self._lock:
+            # შუაში commit-მა გააუქმა - ეს snapshot შეიძლება უკვე ძველია, არ ვინახავთ
+            if generation == self._generation:
+                self._snapshot = snapshot
+                self._checked_at = time.monotonic()
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+
+service_catalog = ServiceCatalog()
+
+
+def _services_version():
+    return db.session.query(ResourceVersion.version)\
+        .filter(ResourceVersion.name == 'services').scalar() or 0
+
+
+def _build_services():
+    """სერვისები და ვერსია ერთი query-ით - ვერსია ზუსტად ამ სიას შეესაბამება"""
+    version = db.select(ResourceVersion.version)\
+        .where(ResourceVersion.name == 'services').scalar_subquery()
+    rows = db.session.query(
+        Service.id, Service.name, Service.description, Service.price, Service.duration, version
+    ).filter(Service.is_active == True).order_by(Service.id).all()
+    current_version = (rows[0][-1] if rows else _services_version()) or 0
+
+    services = tuple(ServiceEntry(*row[:-1]) for row in rows)
+    body = json.dumps({
+        'success': True,
+        'version': current_version,
+        'services': [entry._asdict() for entry in services]
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return ServiceSnapshot(current_version, services, body)
+
+
+def services_response(snapshot):
+    return Response(snapshot.body, mimetype='application/json')
+
+
+def immutable_services_response(snapshot):
+    """ვერსიიანი URL-ის შიგთავსი არასდროს იცვლება - ბრაუზერი / CDN აღარ ამოწმებს"""
+    response = services_response(snapshot)
+    response.set_etag(f'services-{snapshot.version}')
+    response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return response
+
+
+@on_commit
+def invalidate_catalog(changes):
+    if changes.tables & {'users', 'barbers'}:
+        directory_cache.clear()
+    if 'services' in changes.tables:
+        service_catalog.invalidate()
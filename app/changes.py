@@ -0,0 +1,160 @@
+"""ჯავშნების და გრაფიკების ცვლილებების თვალყური (SQLAlchemy session events)
+
+ყველა ჩაწერის გზა (API, ადმინ პანელი) db.session-ით მუშაობს, ამიტომ
+ცვლილებები ერთ ადგილას გროვდება flush-ისას. before_commit გამომწერები
+იმავე ტრანზაქციაში ასწორებენ დამოკიდებულ ცხრილებს, on_commit გამომწერები
+კი commit-ის შემდეგ იძახებიან (cache ინვალიდაცია და ა.შ.). Rollback-ისას იშლება.
+"""
+import logging
+from collections import namedtuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models import Barber, BarberSchedule, Booking, User
+
+BOOKING_FIELDS = ('barber_id', 'service_id', 'client_id', 'start_time', 'end_time', 'status', 'price')
+
+BookingState = namedtuple('BookingState', BOOKING_FIELDS)
+
+# op: 'insert' / 'update' / 'delete'; before/after - BookingState ან None
+BookingChange = namedtuple('BookingChange', ['op', 'booking_id', 'before', 'after'])
+
+_before_commit_listeners = []
+_commit_listeners = []
+
+
+class ChangeSet:
+    """ერთი ტრანზაქციის ცვლილებები"""
+
+    def __init__(self):
+        self.bookings = []
+        self.booking_details = set()  # ჯავშნის ID-ები, სადაც მხოლოდ სხვა ველები შეიცვალა (სახელი, შენიშვნა...)
+        self.schedule_users = set()  # User ID-ები, ვისი გრაფიკიც შეიცვალა
+        self.barbers = {}  # Barber ID -> User ID (პროფილი/შვებულება შეიცვალა ან წაიშალა)
+        self.deleted_users = set()
+        self.tables = set()  # ყველა შეცვლილი ცხრილის სახელი
+        self.outbox = {}  # before_commit-ში მომზადებული შეტყობინებები on_commit გამომწერებისთვის (გასაღები - გამომწერი)
+
+    def __bool__(self):
+        return bool(self.bookings or self.booking_details or self.schedule_users or self.barbers
+                    or self.deleted_users or self.tables)
+
+
+def before_commit(fn):
+    """დეკორატორი: fn(session, changes) გამოიძახება commit-მდე, იმავე ტრანზაქციაში.
+    შეცდომა commit-ს აჩერებს, რომ დამოკიდებული ცხრილები არ დაშორდეს bookings-ს."""
+    _before_commit_listeners.append(fn)
+    return fn
+
+
+def on_commit(fn):
+    """დეკორატორი: fn(changes) გამოიძახება ყოველი წარმატებული commit-ის შემდეგ"""
+    _commit_listeners.append(fn)
+    return fn
+
+
+def booking_state(booking, old=False):
+    """ჯავშნის მდგომარეობა; old=True - flush-მდე არსებული მნიშვნელობები"""
+    if not old:
+        return BookingState(*(getattr(booking, field) for field in BOOKING_FIELDS))
+    attrs = inspect(booking).attrs
+    values = []
+    for field in BOOKING_FIELDS:
+        history = attrs[field].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.unchanged:
+            values.append(history.unchanged[0])
+        else:
+            values.append(getattr(booking, field))
+    return BookingState(*values)
+
+
+def _load_old_value(target, value, oldvalue, initiator):
+    return value
+
+
+# commit-ის შემდეგ (expired) ველზე მინიჭებისას ძველი მნიშვნელობა არ იტვირთება და
+# history ცარიელია - active_history ძველ მნიშვნელობას მინიჭებამდე ტვირთავს
+for _field in BOOKING_FIELDS:
+    event.listen(getattr(Booking, _field), 'set', _load_old_value, active_history=True, retval=True)
+
+
+def _pending(session):
+    changes = session.info.get('pending_changes')
+    if changes is None:
+        changes = session.info['pending_changes'] = ChangeSet()
+    return changes
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changes(session, flush_context):
+    changes = _pending(session)
+
+    for obj in session.new:
+        changes.tables.add(obj.__tablename__)
+        if isinstance(obj, Booking):
+            changes.bookings.append(BookingChange('insert', obj.id, None, booking_state(obj)))
+        elif isinstance(obj, BarberSchedule):
+            changes.schedule_users.add(obj.barber_id)
+        elif isinstance(obj, Barber):
+            changes.barbers[obj.id] = obj.user_id
+
+    for obj in session.dirty:
+        if not session.is_modified(obj, include_collections=False):
+            continue
+        changes.tables.add(obj.__tablename__)
+        if isinstance(obj, Booking):
+            before = booking_state(obj, old=True)
+            after = booking_state(obj)
+            if before != after:
+                changes.bookings.append(BookingChange('update', obj.id, before, after))
+            else:
+                changes.booking_details.add(obj.id)
+        elif isinstance(obj, BarberSchedule):
+            changes.schedule_users.add(obj.barber_id)
+        elif isinstance(obj, Barber):
+            changes.barbers[obj.id] = obj.user_id
+
+    for obj in session.deleted:
+        changes.tables.add(obj.__tablename__)
+        if isinstance(obj, Booking):
+            changes.bookings.append(BookingChange('delete', obj.id, booking_state(obj, old=True), None))
+        elif isinstance(obj, BarberSchedule):
+            changes.schedule_users.add(obj.barber_id)
+        elif isinstance(obj, Barber):
+            changes.barbers[obj.id] = obj.user_id
+        elif isinstance(obj, User):
+            changes.deleted_users.add(obj.id)
+
+
+@event.listens_for(Session, 'before_commit')
+def _apply_changes(session):
+    # before_commit savepoint-ის (begin_nested) commit-ზეც იძახება - მხოლოდ გარე commit
+    if not _before_commit_listeners or session.in_nested_transaction():
+        return
+    session.flush()
+    changes = session.info.get('pending_changes')
+    if not changes:
+        return
+    for listener in _before_commit_listeners:
+        listener(session, changes)
+
+
+@event.listens_for(Session, 'after_commit')
+def _dispatch_changes(session):
+    changes = session.info.pop('pending_changes', None)
+    if not changes:
+        return
+    for listener in _commit_listeners:
+        try:
+            listener(changes)
+        except Exception as e:
+            # commit უკვე შესრულდა - გამომწერის შეცდომამ მოთხოვნა არ უნდა ჩააგდოს
+            logging.error(f"Change listener {listener.__name__} failed: {str(e)}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('pending_changes', None)
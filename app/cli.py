@@ -0,0 +1,93 @@
+"""Flask CLI ბრძანებები (flask <group> <command>)"""
+import click
+from flask.cli import AppGroup
+
+availability_cli = AppGroup('availability', help='მატერიალიზებული ხელმისაწვდომობა')
+
+
+@availability_cli.command('rebuild')
+@click.option('--days', default=None, type=int, help='რამდენი დღე (ნაგულისხმევი MATERIALIZE_DAYS)')
+def availability_rebuild(days):
+    """barber_day_availability-ს თავიდან აგება bookings-დან"""
+    from app.availability import rebuild_materialized, MATERIALIZE_DAYS
+    count = rebuild_materialized(days or MATERIALIZE_DAYS)
+    click.echo(f'✅ {count} ჩანაწერი აიგო')
+
+
+@availability_cli.command('check')
+def availability_check():
+    """ჩანაწერების შემოწმება ცოცხალ bookings ცხრილთან"""
+    from app.availability import check_materialized
+    mismatches = check_materialized()
+    for row, expected in mismatches:
+        click.echo(f'❌ barber={row.barber_id} day={row.day}: {row.free_intervals} != '
+                   f'{expected.free if expected else "ბარბერი აღარ არსებობს"}')
+    if mismatches:
+        raise SystemExit(1)
+    click.echo('✅ ყველა ჩანაწერი ემთხვევა')
+
+
+stats_cli = AppGroup('stats', help='ჯავშნების დღიური rollup (booking_daily_stats)')
+
+
+@stats_cli.command('rebuild')
+def stats_rebuild():
+    """booking_daily_stats-ის თავიდან აგება bookings-დან"""
+    from app.daily_stats import rebuild
+    count = rebuild()
+    click.echo(f'✅ {count} სტრიქონი აიგო')
+
+
+@stats_cli.command('check')
+def stats_check():
+    """rollup-ის შედარება bookings-დან ახლად დათვლილთან"""
+    from app.daily_stats import check
+    mismatches = check()
+    for key, stored, live in mismatches:
+        click.echo(f'❌ {key}: rollup={stored} bookings={live}')
+    if mismatches:
+        raise SystemExit(1)
+    click.echo('✅ rollup ემთხვევა')
+
+
+clients_cli = AppGroup('clients', help='კლიენტების ბაზა: ვიზიტების შეჯამება, ნომრები')
+
+
+@clients_cli.command('rebuild')
+def clients_rebuild():
+    """ვიზიტების შეჯამების თავიდან დათვლა ყველა კლიენტისთვის (backfill)"""
+    from app.client_summary import rebuild
+    count = rebuild()
+    click.echo(f'✅ {count} კლიენტი განახლდა')
+
+
+@clients_cli.command('check')
+def clients_check():
+    """შენახული შეჯამების შედარება bookings-დან ახლად დათვლილთან"""
+    from app.client_summary import check
+    mismatches = check()
+    for client_id, stored, live in mismatches:
+        click.echo(f'❌ client={client_id}: შენახული={stored} bookings={live}')
+    if mismatches:
+        raise SystemExit(1)
+    click.echo('✅ შეჯამება ემთხვევა')
+
+
+@clients_cli.command('merge-duplicates')
+@click.option('--batch-size', default=1000, type=int, help='სტრიქონები ერთ ბლოკში')
+def clients_merge_duplicates(batch_size):
+    """ნომრების ნორმალიზაცია და ერთი ნომრის კლიენტების გაერთიანება"""
+    from app import db
+    from app.clients import normalize_and_merge
+    stats = normalize_and_merge(db.session, batch_size)
+    db.session.commit()
+    click.echo(f"✅ ნომრები: {stats['clients']} კლიენტი, {stats['bookings']} ჯავშანი; "
+               f"გაერთიანდა {stats['merged']}, დაუკავშირდა {stats['linked']} ჯავშანი")
+    if stats['invalid']:
+        click.echo(f"⚠️ {stats['invalid']} ამოუცნობი ნომერი უცვლელია")
+
+
+def register_commands(app):
+    app.cli.add_command(availability_cli)
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(clients_cli)
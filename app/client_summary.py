@@ -0,0 +1,90 @@
+"""კლიენტის ვიზიტების შეჯამება (clients.last_visit_at, last_barber_name, ...)
+
+/api/clients/lookup booking.js-დან ყოველ აკრეფაზე იძახება - ბოლო ჯავშნის
+ძებნის და service / barber-ის lazy load-ის ნაცვლად შეჯამება clients-ის
+სტრიქონშივეა. bookings-ის ყოველი ჩაწერა იმავე ტრანზაქციაში თავიდან ითვლის
+მხოლოდ შეხებული კლიენტების შეჯამებას (ერთი UPDATE, ix_bookings_client_start).
+
+ვიზიტი - ჯავშანი დროით, რომელიც არც გაუქმებულია და არც 'no-show'.
+ბარბერის / სერვისის სახელი ჩაწერისას კოპირდება; გადარქმევის შემდეგ:
+flask clients rebuild (შემოწმება: flask clients check)
+"""
+from sqlalchemy import func
+
+from app import db
+from app.changes import before_commit
+from app.models import Barber, Booking, Client, Service
+
+NO_SHOW = 'no-show'
+NOT_VISITS = ('cancelled', NO_SHOW)
+SUMMARY_FIELDS = ('visit_count', 'no_show_count', 'last_visit_at', 'last_barber_name', 'last_service_name')
+
+
+def summary_columns(client_id):
+    """შეჯამების გამოსახულებები client_id-სთვის (correlated subquery-ები)"""
+    own = Booking.client_id == client_id
+    visit = own & (Booking.start_time != None) & Booking.status.notin_(NOT_VISITS)
+
+    def last_visit(column, *joins):
+        query = db.select(column).select_from(Booking)
+        for target, condition in joins:
+            query = query.join(target, condition)
+        return query.where(visit).order_by(Booking.start_time.desc(), Booking.id.desc())\
+            .limit(1).scalar_subquery()
+
+    return {
+        'visit_count': db.select(func.count(Booking.id)).where(visit).scalar_subquery(),
+        'no_show_count': db.select(func.count(Booking.id)).where(own, Booking.status == NO_SHOW).scalar_subquery(),
+        'last_visit_at': db.select(func.max(Booking.start_time)).where(visit).scalar_subquery(),
+        'last_barber_name': last_visit(Barber.name, (Barber, Barber.id == Booking.barber_id)),
+        'last_service_name': last_visit(Service.name, (Service, Service.id == Booking.service_id))
+    }
+
+
+def refresh(session, client_ids=None):
+    """შეჯამების თავიდან დათვლა ერთი UPDATE-ით (client_ids=None - ყველა კლიენტი)"""
+    table = Client.__table__
+    statement = table.update().values(
+        **summary_columns(table.c.id),
+        updated_at=table.c.updated_at  # პროფილის ცვლილება არ არის
+    )
+    if client_ids is not None:
+        statement = statement.where(table.c.id.in_(client_ids))
+    return session.execute(statement).rowcount
+
+
+@before_commit
+def update_client_summaries(session, changes):
+    """ტრანზაქციაში შეცვლილი ჯავშნების კლიენტები (ძველიც და ახალიც)"""
+    client_ids = {state.client_id
+                  for change in changes.bookings
+                  for state in (change.before, change.after)
+                  if state is not None and state.client_id is not None}
+    if client_ids:
+        refresh(session, sorted(client_ids))
+
+
+def rebuild():
+    """ყველა კლიენტის შეჯამების თავიდან აგება"""
+    count = refresh(db.session)
+    db.session.commit()
+    return count
+
+
+def check():
+    """[(client_id, შენახული, ცოცხალი)] - შეუსაბამო კლიენტები"""
+    table = Client.__table__
+    live = summary_columns(table.c.id)
+    rows = db.session.execute(db.select(
+        table.c.id,
+        *(table.c[field] for field in SUMMARY_FIELDS),
+        *(live[field].label(f'live_{field}') for field in SUMMARY_FIELDS)
+    ).order_by(table.c.id)).all()
+
+    fields = len(SUMMARY_FIELDS)
+    mismatches = []
+    for row in rows:
+        stored, expected = tuple(row[1:1 + fields]), tuple(row[1 + fields:])
+        if stored != expected:
+            mismatches.append((row[0], stored, expected))
+    return mismatches
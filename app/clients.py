@@ -0,0 +1,148 @@
+"""კლიენტების ბაზა: ნომრით მოძებნა / შექმნა და დუბლიკატების გაერთიანება
+
+ყველა ჩაწერის გზა ნომერს app/phones.py-ით ანორმალებს, ამიტომ ერთ
+ნომერს ერთი კლიენტი შეესაბამება და lookup unique ინდექსს პირველივე ცდაზე
+პოულობს. ძველი (ნორმალიზაციამდე ჩაწერილი) სტრიქონები normalize_and_merge-ით
+სწორდება: flask clients merge-duplicates (ასევე მიგრაცია d8b3e5f1a046).
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import bindparam
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.client_summary import refresh as refresh_summaries
+from app.models import Booking, Client
+from app.phones import try_normalize_phone
+
+BATCH_SIZE = 1000
+
+
+def find_or_create_client(phone, name, email=None):
+    """კლიენტი კანონიკური ნომრით; არ არსებობს - იქმნება (flush-ით, commit-ის გარეშე)"""
+    client = Client.query.filter_by(phone=phone).first()
+    if client is None:
+        client = Client(phone=phone, name=name, email=email)
+        try:
+            with db.session.begin_nested():
+                db.session.add(client)
+        except IntegrityError:
+            # პარალელურმა მოთხოვნამ იგივე ნომერი უკვე ჩაწერა
+            client = Client.query.filter_by(phone=phone).one()
+    return client
+
+
+def _batches(executor, table, columns, batch_size):
+    """ცხრილის სტრიქონები id-ის keyset ბლოკებად"""
+    last_id = 0
+    while True:
+        rows = executor.execute(
+            db.select(table.c.id, *columns).where(table.c.id > last_id)
+            .order_by(table.c.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _merge(executor, survivor_id, duplicate_ids):
+    """დუბლიკატების ჯავშნები -> survivor; email / შენიშვნები / დაბლოკვა ერთიანდება"""
+    clients = Client.__table__
+    bookings = Booking.__table__
+    rows = executor.execute(
+        db.select(clients.c.email, clients.c.notes, clients.c.is_blocked)
+        .where(clients.c.id.in_([survivor_id, *duplicate_ids])).order_by(clients.c.id)
+    ).all()
+    notes = [row.notes.strip() for row in rows if row.notes and row.notes.strip()]
+
+    executor.execute(bookings.update().where(bookings.c.client_id.in_(duplicate_ids))
+                     .values(client_id=survivor_id, updated_at=datetime.utcnow()))
+    executor.execute(clients.delete().where(clients.c.id.in_(duplicate_ids)))
+    executor.execute(clients.update().where(clients.c.id == survivor_id).values(
+        email=next((row.email for row in rows if row.email), None),
+        notes='\n'.join(dict.fromkeys(notes)) or None,
+        is_blocked=any(row.is_blocked for row in rows)
+    ))
+
+
+def normalize_and_merge(executor, batch_size=BATCH_SIZE):
+    """არსებული ნომრების ნორმალიზაცია ბლოკებად (executor - session ან connection).
+
+    1. კლიენტები ჯგუფდება კანონიკური ნომრით; ერთზე მეტი - ერთიანდება უძველესში
+    2. კლიენტების და ჯავშნების ნომრები კანონიკურ ფორმაზე
+    3. კლიენტის გარეშე ჯავშანი (ადმინის შექმნილი) უკავშირდება კლიენტს იმავე ნომრით
+    ამოუცნობი ნომრები უცვლელი რჩება. commit - გამომძახებლის საქმეა.
+    """
+    clients = Client.__table__
+    bookings = Booking.__table__
+    stats = dict.fromkeys(('clients', 'merged', 'bookings', 'linked', 'invalid'), 0)
+
+    groups = defaultdict(list)
+    renamed = {}
+    for rows in _batches(executor, clients, [clients.c.phone], batch_size):
+        for client_id, phone in rows:
+            canonical = try_normalize_phone(phone)
+            if canonical is None:
+                stats['invalid'] += 1
+                continue
+            groups[canonical].append(client_id)
+            if phone != canonical:
+                renamed[client_id] = canonical
+
+    # ერთიანდება ნომრის გადაწერამდე - unique ინდექსი არ დაირღვევა
+    touched = set()
+    for ids in groups.values():
+        if len(ids) > 1:
+            _merge(executor, ids[0], ids[1:])
+            stats['merged'] += len(ids) - 1
+            touched.add(ids[0])
+            for duplicate_id in ids[1:]:
+                renamed.pop(duplicate_id, None)
+    owners = {canonical: ids[0] for canonical, ids in groups.items()}
+
+    update_client = clients.update().where(clients.c.id == bindparam('_id'))\
+        .values(phone=bindparam('_phone'))
+    for chunk in _chunks([{'_id': client_id, '_phone': phone} for client_id, phone in renamed.items()],
+                         batch_size):
+        executor.execute(update_client, chunk)
+    stats['clients'] = len(renamed)
+
+    update_booking = bookings.update().where(bookings.c.id == bindparam('_id')).values(
+        client_id=bindparam('_client_id'),
+        customer_phone=bindparam('_customer_phone'),
+        client_phone=bindparam('_client_phone'),
+        updated_at=datetime.utcnow()  # delta sync-მა (calendar_feed) ცვლილება უნდა დაინახოს
+    )
+    columns = [bookings.c.client_id, bookings.c.customer_phone, bookings.c.client_phone]
+    for rows in _batches(executor, bookings, columns, batch_size):
+        updates = []
+        for booking_id, client_id, customer_phone, client_phone in rows:
+            canonical = try_normalize_phone(customer_phone)
+            values = {
+                '_id': booking_id,
+                '_client_id': client_id,
+                '_customer_phone': canonical or customer_phone,
+                '_client_phone': try_normalize_phone(client_phone) or client_phone
+            }
+            if client_id is None and owners.get(canonical):
+                values['_client_id'] = owners[canonical]
+                touched.add(owners[canonical])
+                stats['linked'] += 1
+            if (values['_client_id'], values['_customer_phone'], values['_client_phone']) != \
+                    (client_id, customer_phone, client_phone):
+                updates.append(values)
+        if updates:
+            executor.execute(update_booking, updates)
+            stats['bookings'] += len(updates)
+
+    # Core UPDATE-ები before_commit-ს არ იწვევს - შეჯამება აქვე
+    for chunk in _chunks(sorted(touched), batch_size):
+        refresh_summaries(executor, chunk)
+    return stats
@@ -0,0 +1,171 @@
+"""ჯავშნების დღიური rollup (booking_daily_stats)
+
+გასაღები (დღე, ბარბერი, სერვისი, სტატუსი) -> ჯავშნების რაოდენობა და შემოსავალი.
+bookings-ის ყოველი ჩაწერა იმავე ტრანზაქციაში ცვლის მხოლოდ შეხებულ
+სტრიქონებს (ძველი მდგომარეობა -1, ახალი +1), ამიტომ ანგარიშები
+დღეების რაოდენობაზეა დამოკიდებული და არა ჯავშნებისაზე.
+
+თავიდან აგება / შემოწმება: flask stats rebuild / flask stats check
+"""
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.changes import before_commit
+from app.models import Barber, Booking, BookingDailyStat, Service, User
+
+NO_BARBER = 0  # ჯავშანი ბარბერის გარეშე (barber_id NULL)
+DEFAULT_STATUS = 'pending'
+
+
+def _key(state):
+    """BookingState -> rollup-ის გასაღები; დროის გარეშე ჯავშანი არ ითვლება"""
+    if state is None or state.start_time is None:
+        return None
+    return (
+        state.start_time.date(),
+        state.barber_id if state.barber_id is not None else NO_BARBER,
+        state.service_id,
+        state.status or DEFAULT_STATUS
+    )
+
+
+def _apply(session, key, count, revenue):
+    table = BookingDailyStat.__table__
+    day, barber_id, service_id, status = key
+    match = (table.c.day == day) & (table.c.barber_id == barber_id) & \
+            (table.c.service_id == service_id) & (table.c.status == status)
+    increment = table.update().where(match).values(
+        bookings=table.c.bookings + count,
+        revenue=table.c.revenue + revenue
+    )
+    if session.execute(increment).rowcount == 0:
+        try:
+            with session.begin_nested():
+                session.execute(table.insert().values(
+                    day=day, barber_id=barber_id, service_id=service_id, status=status,
+                    bookings=count, revenue=revenue
+                ))
+        except IntegrityError:
+            # პარალელურმა ტრანზაქციამ იგივე სტრიქონი უკვე ჩაწერა
+            session.execute(increment)
+    if count < 0:
+        session.execute(table.delete().where(match & (table.c.bookings <= 0)))
+
+
+@before_commit
+def update_daily_stats(session, changes):
+    """ტრანზაქციის ჯავშნების ცვლილებები -> rollup-ის დელტები"""
+    if not changes.bookings:
+        return
+    deltas = defaultdict(lambda: [0, 0.0])
+    for change in changes.bookings:
+        before_key = _key(change.before)
+        if before_key is not None:
+            deltas[before_key][0] -= 1
+            deltas[before_key][1] -= change.before.price or 0.0
+        after_key = _key(change.after)
+        if after_key is not None:
+            deltas[after_key][0] += 1
+            deltas[after_key][1] += change.after.price or 0.0
+
+    for key in sorted(deltas):
+        count, revenue = deltas[key]
+        if count or revenue:
+            _apply(session, key, count, revenue)
+
+
+def _live_aggregate():
+    """bookings-დან იგივე დაჯგუფება (rebuild / check)"""
+    day = func.date(Booking.start_time)
+    return db.select(
+        day.label('day'),
+        func.coalesce(Booking.barber_id, NO_BARBER).label('barber_id'),
+        Booking.service_id,
+        func.coalesce(Booking.status, DEFAULT_STATUS).label('status'),
+        func.count(Booking.id).label('bookings'),
+        func.coalesce(func.sum(Booking.price), 0.0).label('revenue')
+    ).where(Booking.start_time != None).group_by(
+        day,
+        func.coalesce(Booking.barber_id, NO_BARBER),
+        Booking.service_id,
+        func.coalesce(Booking.status, DEFAULT_STATUS)
+    )
+
+
+def rebuild():
+    """rollup-ის თავიდან აგება ერთი INSERT ... SELECT-ით"""
+    table = BookingDailyStat.__table__
+    db.session.execute(table.delete())
+    db.session.execute(table.insert().from_select(
+        ['day', 'barber_id', 'service_id', 'status', 'bookings', 'revenue'], _live_aggregate()
+    ))
+    db.session.commit()
+    return db.session.query(func.count()).select_from(BookingDailyStat).scalar()
+
+
+def check():
+    """[(გასაღები, rollup, ცოცხალი)] - შეუსაბამო სტრიქონები"""
+    def normalize(rows):
+        result = {}
+        for row in rows:
+            day = row.day if isinstance(row.day, date) else date.fromisoformat(str(row.day))
+            result[(day, row.barber_id, row.service_id, row.status)] = (row.bookings, round(row.revenue, 2))
+        return result
+
+    stored = normalize(BookingDailyStat.query.all())
+    live = normalize(db.session.execute(_live_aggregate()))
+    return [(key, stored.get(key), live.get(key))
+            for key in sorted(stored.keys() | live.keys())
+            if stored.get(key) != live.get(key)]
+
+
+# ========================
+# REPORTS
+# ========================
+
+def _in_range(first_day=None, last_day=None):
+    conditions = []
+    if first_day is not None:
+        conditions.append(BookingDailyStat.day >= first_day)
+    if last_day is not None:
+        conditions.append(BookingDailyStat.day <= last_day)
+    return conditions
+
+
+def total_bookings(first_day=None, last_day=None):
+    return db.session.query(func.coalesce(func.sum(BookingDailyStat.bookings), 0))\
+        .filter(*_in_range(first_day, last_day)).scalar()
+
+
+def barber_ranking(first_day=None, last_day=None, status='completed'):
+    """[(first_name, last_name, booking_count, revenue)] ჯავშნების კლებადობით"""
+    count = func.sum(BookingDailyStat.bookings)
+    query = db.session.query(
+        User.first_name,
+        User.last_name,
+        count.label('booking_count'),
+        func.sum(BookingDailyStat.revenue).label('revenue')
+    ).select_from(BookingDailyStat)\
+     .join(Barber, Barber.id == BookingDailyStat.barber_id)\
+     .join(User, User.id == Barber.user_id)\
+     .filter(*_in_range(first_day, last_day))
+    if status is not None:
+        query = query.filter(BookingDailyStat.status == status)
+    return query.group_by(User.id, User.first_name, User.last_name).order_by(count.desc()).all()
+
+
+def popular_services(first_day=None, last_day=None, limit=5):
+    """[(name, booking_count)] ყველა სტატუსით"""
+    count = func.sum(BookingDailyStat.bookings)
+    return db.session.query(Service.name, count.label('booking_count'))\
+        .select_from(BookingDailyStat)\
+        .join(Service, Service.id == BookingDailyStat.service_id)\
+        .filter(*_in_range(first_day, last_day))\
+        .group_by(Service.id, Service.name)\
+        .order_by(count.desc())\
+        .limit(limit).all()
+
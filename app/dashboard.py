@@ -0,0 +1,81 @@
+"""დაშბორდის სტატისტიკა
+
+ყველა რიცხვი ერთი aggregate query-ით: პირობითი COUNT-ები bookings-ზე
+(დღევანდელი - start_time-ის შუალედით, რომ ინდექსი გამოიყენოს) და
+ბარბერების / სერვისების რაოდენობა scalar subquery-ებით. შედეგი რამდენიმე
+წამით ინახება თითო scope-ზე (ყველა / კონკრეტული ბარბერი) და ჯავშნის
+ჩაწერისას უქმდება.
+"""
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import case, func
+
+from app import db
+from app.cache import LRUCache
+from app.changes import on_commit
+from app.models import Booking, Service, User
+
+dashboard_cache = LRUCache(max_entries=256, ttl=10, config_prefix='DASHBOARD_CACHE')
+
+ALL_SCOPE = 'all'
+
+
+def _scope_tag(barber_id):
+    return ('dashboard', ALL_SCOPE if barber_id is None else barber_id)
+
+
+def _compute(barber_id, today):
+    day_start = datetime.combine(today, time.min)
+    day_end = day_start + timedelta(days=1)
+    today_range = (Booking.start_time >= day_start) & (Booking.start_time < day_end)
+
+    active_barbers = db.select(func.count(User.id))\
+        .where(User.role == 'barber', User.is_active == True).scalar_subquery()
+    active_services = db.select(func.count(Service.id))\
+        .where(Service.is_active == True).scalar_subquery()
+
+    query = db.select(
+        func.count(case((today_range, Booking.id))).label('today_bookings'),
+        func.count(case((Booking.status == 'pending', Booking.id))).label('pending_bookings'),
+        func.count(Booking.id).label('total_bookings'),
+        active_barbers.label('total_barbers'),
+        active_services.label('total_services')
+    ).select_from(Booking)
+    if barber_id is not None:
+        query = query.where(Booking.barber_id == barber_id)
+
+    row = db.session.execute(query).one()
+    stats = dict(row._mapping)
+    if barber_id is not None:
+        # ბარბერს სხვა ბარბერების რაოდენობა არ უჩანს
+        stats['total_barbers'] = 1
+    return stats
+
+
+def dashboard_stats(barber_id=None):
+    """{'today_bookings', 'pending_bookings', 'total_bookings', 'total_barbers', 'total_services'};
+    barber_id=None - ყველა ჯავშანი (ადმინი / რეცეფცია)"""
+    today = datetime.now().date()  # ჯავშნების დრო ლოკალურია
+    key = (ALL_SCOPE if barber_id is None else barber_id, today)
+    stats = dashboard_cache.get(key)
+    if stats is None:
+        token = dashboard_cache.token()
+        stats = _compute(barber_id, today)
+        dashboard_cache.set(key, stats, tags=[_scope_tag(barber_id)], token=token)
+    return dict(stats)
+
+
+@on_commit
+def invalidate_dashboard(changes):
+    """ჯავშნის ცვლილება - "ყველა" და შესაბამისი ბარბერ(ებ)ი; სერვისები/მომხმარებლები - ყველაფერი"""
+    if changes.tables & {'services', 'users'}:
+        dashboard_cache.clear()
+        return
+    if not changes.bookings:
+        return
+    tags = {_scope_tag(None)}
+    for change in changes.bookings:
+        for state in (change.before, change.after):
+            if state is not None and state.barber_id is not None:
+                tags.add(_scope_tag(state.barber_id))
+    dashboard_cache.invalidate(*tags)
@@ -1,6 +1,7 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, SelectField, DateField, TimeField, TextAreaField
-from wtforms.validators import DataRequired, Email, Optional, Length
+from wtforms.validators import DataRequired, Email, Optional, Length, ValidationError
+from app.phones import normalize_phone, InvalidPhone
 
 class BookingForm(FlaskForm):
     """ჯავშნის შექმნის/რედაქტირების ფორმა"""
@@ -67,6 +68,7 @@ class BookingForm(FlaskForm):
             ('pending', 'მოლოდინში'),
             ('confirmed', 'დადასტურებული'),
             ('completed', 'დასრულებული'),
+            ('no-show', 'არ გამოცხადდა'),
             ('cancelled', 'გაუქმებული')
         ],
         default='pending'
@@ -76,10 +78,11 @@ class BookingForm(FlaskForm):
         super(BookingForm, self).__init__(*args, **kwargs)
         
         # საჭირო მოდელების იმპორტი
-        from app.models import Service, Barber
+        from app.models import Barber
+        from app.catalog import service_catalog
         
-        # 1. სერვისების ჩატვირთვა
-        services = Service.query.filter_by(is_active=True).all()
+        # 1. სერვისები კატალოგის snapshot-იდან (მოდალის ყოველ გახსნაზე query არ სჭირდება)
+        services = service_catalog.current().services
         self.service_id.choices = [(0, 'აირჩიეთ სერვისი...')] + [
             (s.id, f'{s.name} - {s.price}₾ ({s.duration}წთ)') 
             for s in services
@@ -91,4 +94,11 @@ class BookingForm(FlaskForm):
         self.barber_id.choices = [(0, 'აირჩიეთ ბარბერი...')] + [
             (b.id, b.name) 
             for b in barbers
-        ]
\ No newline at end of file
+        ]
+
+    def validate_client_phone(self, field):
+        # კანონიკური ფორმა (+995...) - ჯავშანი და კლიენტი ერთ ნომერზე
+        try:
+            field.data = normalize_phone(field.data)
+        except InvalidPhone:
+            raise ValidationError('შეიყვანეთ სწორი ტელეფონის ნომერი')
@@ -0,0 +1,126 @@
+"""HTTP cache (ETag / Last-Modified) საჯარო კატალოგისთვის
+
+/api/services, /api/barbers, /services, /barbers ყველა ვიზიტორს ერთსა და
+იმავეს უბრუნებს, სანამ ადმინი რამეს არ შეცვლის. თითო რესურსს აქვს ვერსია
+resource_versions ცხრილში, რომელიც before_commit-ში იზრდება, როცა მისი
+რომელიმე ცხრილი შეიცვლება - ყველა worker ერთსა და იმავე ETag-ს ხედავს.
+
+If-None-Match / If-Modified-Since დამთხვევისას 304 ბრუნდება view-ს
+გამოძახების (query, render, JSON) გარეშე.
+"""
+import hashlib
+import logging
+import os
+from datetime import datetime
+from functools import lru_cache, wraps
+
+from flask import Response, current_app, request
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.changes import before_commit
+from app.models import ResourceVersion
+
+# რესურსი -> ცხრილები, რომელთა ცვლილებაც მის პასუხს ცვლის
+RESOURCES = {
+    'services': {'services'},
+    'barbers': {'barbers', 'users'}
+}
+
+DEFAULT_MAX_AGE = 0  # ყოველთვის revalidate (304 იაფია); CDN-ისთვის HTTP_CACHE_MAX_AGE
+
+
+@before_commit
+def bump_versions(session, changes):
+    """შეცვლილი რესურსების ვერსია +1 იმავე ტრანზაქციაში"""
+    now = datetime.utcnow()
+    table = ResourceVersion.__table__
+    for name, tables in RESOURCES.items():
+        if not tables & changes.tables:
+            continue
+        updated = session.execute(
+            table.update().where(table.c.name == name)
+            .values(version=table.c.version + 1, updated_at=now)
+        )
+        if updated.rowcount:
+            continue
+        try:
+            with session.begin_nested():
+                session.execute(table.insert().values(name=name, version=1, updated_at=now))
+        except IntegrityError:
+            # პარალელურმა ტრანზაქციამ უკვე ჩაწერა
+            session.execute(
+                table.update().where(table.c.name == name)
+                .values(version=table.c.version + 1, updated_at=now)
+            )
+
+
+@lru_cache(maxsize=1)
+def code_version():
+    """კოდისა და შაბლონების ვერსია (უახლესი mtime) - deploy ცვლის ETag-ს.
+    static/uploads არ ითვლება (ატვირთული სურათები მონაცემებია)."""
+    root = current_app.root_path
+    uploads = os.path.join(root, 'static', 'uploads')
+    newest = 0
+    for directory, subdirs, files in os.walk(root):
+        if directory.startswith(uploads):
+            subdirs[:] = []
+            continue
+        for filename in files:
+            if filename.endswith(('.py', '.html', '.js', '.css')):
+                newest = max(newest, os.path.getmtime(os.path.join(directory, filename)))
+    return int(newest)
+
+
+def resource_state(names):
+    """(ვერსიების სტრიქონი, ბოლო ცვლილების დრო) ერთი query-ით"""
+    rows = {row.name: row for row in ResourceVersion.query.filter(ResourceVersion.name.in_(names))}
+    versions = ','.join(f'{name}:{rows[name].version if name in rows else 0}' for name in names)
+    stamps = [rows[name].updated_at for name in names if name in rows]
+    return versions, max(stamps) if stamps else None
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def _cache_headers(response, etag, last_modified):
+    max_age = current_app.config.get('HTTP_CACHE_MAX_AGE', DEFAULT_MAX_AGE)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = f'public, max-age={max_age}, must-revalidate'
+    return response
+
+
+def conditional(*names, extra=None):
+    """ETag / 304 დეკორატორი. extra() - დამატებითი token (მაგ. მონაცემი, რომელიც
+    resource_versions-ით არ ითვლება); ასეთ შემთხვევაში Last-Modified არ იგზავნება."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                versions, last_modified = resource_state(names)
+                token = f'{code_version()}|{request.path}|{versions}'
+                if extra is not None:
+                    token += f'|{extra()}'
+                    last_modified = None
+            except Exception as e:
+                # ვერსია ვერ დადგინდა - ჩვეულებრივი პასუხი, cache-ის გარეშე
+                logging.error(f"HTTP cache version failed: {str(e)}")
+                return view(*args, **kwargs)
+
+            etag = hashlib.sha1(token.encode('utf-8')).hexdigest()[:20]
+            if _not_modified(etag, last_modified):
+                return _cache_headers(Response(status=304), etag, last_modified)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            return _cache_headers(response, etag, last_modified)
+        return wrapper
+    return decorator
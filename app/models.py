@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import DDL, event
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 
@@ -63,6 +64,13 @@ class Client(db.Model):
     # ადმინისთვის: შენიშვნები და დაბლოკვა
     notes = db.Column(db.Text) 
     is_blocked = db.Column(db.Boolean, default=False)
+
+    # ვიზიტების შეჯამება - bookings-დან ნახლდება (app/client_summary.py)
+    visit_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    no_show_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_visit_at = db.Column(db.DateTime)
+    last_barber_name = db.Column(db.String(100))
+    last_service_name = db.Column(db.String(100))
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -99,7 +107,7 @@ class Booking(db.Model):
     
     confirmation_code = db.Column(db.String(20), unique=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # delta sync cursor
     
     # ✅ Backward Compatibility: რომ კოდის სხვა ნაწილები არ გატყდეს
     @property
@@ -121,6 +129,61 @@ class Booking(db.Model):
         return code
 
 
+# ✅ ბაზის დონის დაცვა ორმაგი ჯავშნისგან (PostgreSQL - exclusion constraint, SQLite - trigger-ები)
+# იგივე SQL არის მიგრაციებში (3c9f1d7a2b64, SQLite trigger-ები - 7d2e4b1c9a08), აქ - db.create_all()-ისთვის
+BOOKING_OVERLAP_PG = DDL("""
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+ALTER TABLE bookings ADD CONSTRAINT bookings_no_overlap
+    EXCLUDE USING gist (barber_id WITH =, tsrange(start_time, end_time) WITH &&)
+    WHERE (status <> 'cancelled')
+""")
+
+BOOKING_OVERLAP_SQLITE_INSERT = DDL("""
+CREATE TRIGGER bookings_no_overlap_insert BEFORE INSERT ON bookings
+WHEN NEW.status IS NOT 'cancelled' AND NEW.start_time IS NOT NULL
+BEGIN
+    SELECT RAISE(ABORT, 'bookings_no_overlap') WHERE EXISTS (
+        SELECT 1 FROM bookings
+        WHERE barber_id = NEW.barber_id AND status <> 'cancelled'
+          AND start_time < NEW.end_time AND end_time > NEW.start_time
+    );
+END
+""")
+
+BOOKING_OVERLAP_SQLITE_UPDATE = DDL("""
+CREATE TRIGGER bookings_no_overlap_update BEFORE UPDATE OF barber_id, start_time, end_time, status ON bookings
+WHEN NEW.status IS NOT 'cancelled' AND NEW.start_time IS NOT NULL
+BEGIN
+    SELECT RAISE(ABORT, 'bookings_no_overlap') WHERE EXISTS (
+        SELECT 1 FROM bookings
+        WHERE barber_id = NEW.barber_id AND id != NEW.id AND status <> 'cancelled'
+          AND start_time < NEW.end_time AND end_time > NEW.start_time
+    );
+END
+""")
+
+event.listen(Booking.__table__, 'after_create', BOOKING_OVERLAP_PG.execute_if(dialect='postgresql'))
+event.listen(Booking.__table__, 'after_create', BOOKING_OVERLAP_SQLITE_INSERT.execute_if(dialect='sqlite'))
+event.listen(Booking.__table__, 'after_create', BOOKING_OVERLAP_SQLITE_UPDATE.execute_if(dialect='sqlite'))
+
+# ✅ ინდექსები ცხელი query-ებისთვის (მიგრაცია 7d2e4b1c9a08, შემოწმება - scripts/check_query_plans.py)
+ACTIVE_BOOKING = db.text("status <> 'cancelled'")
+PENDING_BOOKING = db.text("status = 'pending'")
+
+# გადაფარვის შემოწმება და ბარბერის დაკავებული ინტერვალები
+db.Index('ix_bookings_barber_active', Booking.barber_id, Booking.start_time, Booking.end_time,
+         postgresql_where=ACTIVE_BOOKING, sqlite_where=ACTIVE_BOOKING)
+# დაშბორდის "მოლოდინში" რაოდენობები
+db.Index('ix_bookings_pending', Booking.barber_id,
+         postgresql_where=PENDING_BOOKING, sqlite_where=PENDING_BOOKING)
+# კლიენტის ბოლო ვიზიტი (lookup_client)
+db.Index('ix_bookings_client_start', Booking.client_id, Booking.start_time.desc())
+# ბოლო ჯავშნები (დაშბორდი) და სიის keyset pagination (start_time, id) - მიგრაცია 5e7b2c9d1f40
+db.Index('ix_bookings_start_id', Booking.start_time, Booking.id)
+db.Index('ix_bookings_status_start_id', Booking.status, Booking.start_time, Booking.id)
+db.Index('ix_bookings_barber_start_id', Booking.barber_id, Booking.start_time, Booking.id)
+
+
 class User(UserMixin, db.Model):
     """ადმინ/ბარბერ/რეცეფციის მოდელი"""
     __tablename__ = 'users'
@@ -174,6 +237,9 @@ class User(UserMixin, db.Model):
 class BarberSchedule(db.Model):
     """ბარბერის სტანდარტული სამუშაო გრაფიკი (კვირის მიხედვით)"""
     __tablename__ = 'barber_schedules'
+    __table_args__ = (
+        db.Index('ix_barber_schedules_barber_day', 'barber_id', 'day_of_week'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     barber_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -204,6 +270,69 @@ class BarberSchedule(db.Model):
         return days.get(day_num, 'უცნობი')
 
 
+class BookingTombstone(db.Model):
+    """წაშლილი / გადატანილი ჯავშნის ძველი ადგილის კვალი - კალენდრის delta sync-ისთვის (?since=)"""
+    __tablename__ = 'booking_tombstones'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    booking_id = db.Column(db.Integer, nullable=False)
+    barber_id = db.Column(db.Integer)  # bookings.barber_id (Barber ID) წაშლამდე / გადატანამდე
+    start_time = db.Column(db.DateTime)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f'<BookingTombstone {self.booking_id} @ {self.deleted_at}>'
+
+
+class BookingDailyStat(db.Model):
+    """დღიური rollup (დღე, ბარბერი, სერვისი, სტატუსი) - სტატისტიკის გვერდი მხოლოდ აქედან კითხულობს.
+    bookings-ის ჩაწერისას იზრდება/მცირდება (app/daily_stats.py); barber_id=0 - ბარბერის გარეშე"""
+    __tablename__ = 'booking_daily_stats'
+    
+    day = db.Column(db.Date, primary_key=True)
+    barber_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    service_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    status = db.Column(db.String(20), primary_key=True)
+    bookings = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)
+    
+    def __repr__(self):
+        return f'<BookingDailyStat {self.day} b{self.barber_id} s{self.service_id} {self.status}: {self.bookings}>'
+
+
+class ResourceVersion(db.Model):
+    """საჯარო რესურსის ვერსია (ETag) - იზრდება ადმინის ცვლილებისას (იხ. app/http_cache.py)"""
+    __tablename__ = 'resource_versions'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ResourceVersion {self.name} v{self.version}>'
+
+
+class BarberDayAvailability(db.Model):
+    """ბარბერის დღის თავისუფალი ინტერვალები (მატერიალიზებული ხელმისაწვდომობა)"""
+    __tablename__ = 'barber_day_availability'
+    __table_args__ = (
+        db.UniqueConstraint('barber_id', 'day', name='uq_barber_day_availability'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    barber_id = db.Column(db.Integer, db.ForeignKey('barbers.id', ondelete='CASCADE'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    is_working = db.Column(db.Boolean, nullable=False, default=False)
+    reason = db.Column(db.String(20))  # 'vacation' / 'day_off'
+    open_minute = db.Column(db.Integer)  # შუაღამიდან წუთები
+    close_minute = db.Column(db.Integer)
+    free_intervals = db.Column(db.JSON, nullable=False, default=list)  # [[start_min, end_min], ...]
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<BarberDayAvailability {self.barber_id} - {self.day}: {self.free_intervals}>'
+
+
 # BarberAvailability - ძველი მოდელი (deprecated, ახლა BarberSchedule გამოიყენება)
 class BarberAvailability(db.Model):
     """ბარბერის ხელმისაწვდომობის განრიგი (deprecated)"""
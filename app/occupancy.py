@@ -0,0 +1,154 @@
+"""დატვირთვის ბადე (Occupancy Grid) ადმინის კალენდრისთვის
+
+ბარბერები, გრაფიკები და ჯავშნები იტვირთება 3 query-ით მთელი შუალედისთვის.
+თითო ბარბერზე იგება NumPy მატრიცა (დღე × resolution-წუთიანი უჯრა), საიდანაც
+დაკავებული / თავისუფალი / დაკეტილი წილები დღეებზე და საათებზე ვექტორულად ითვლება.
+"""
+from datetime import datetime, time, timedelta
+
+import numpy as np
+
+from app.availability import load_active_barbers, load_busy_by_barber, load_schedules_by_user, minute_of_day
+
+RESOLUTION = 5  # წუთი; 60-ის გამყოფი უნდა იყოს
+ALLOWED_RESOLUTIONS = (1, 5, 10, 15, 30, 60)
+MAX_OCCUPANCY_DAYS = 62
+MINUTES_PER_DAY = 24 * 60
+
+
+def _hour_window(schedules):
+    """ბადის ფანჯარა: ყველაზე ადრეული გახსნიდან ყველაზე გვიან დაკეტვამდე (მთელი საათები)"""
+    rows = [row for week in schedules.values() for row in week.values()]
+    if not rows:
+        return None
+    opens = min(minute_of_day(row.start_time) for row in rows)
+    closes = max(minute_of_day(row.end_time) for row in rows)
+    if closes <= opens:
+        return None
+    return opens // 60 * 60, -(-closes // 60) * 60
+
+
+def _open_grid(week, vacation, weekdays, day_numbers, slot_minutes, resolution):
+    """(days, slots) bool: უჯრა გახსნილია, თუ მთლიანად სამუშაო საათებშია"""
+    template = np.zeros((7, len(slot_minutes)), dtype=bool)
+    for day_of_week, row in week.items():
+        template[day_of_week] = (slot_minutes >= minute_of_day(row.start_time)) & \
+                                (slot_minutes + resolution <= minute_of_day(row.end_time))
+    grid = template[weekdays]
+    if vacation is not None:
+        grid[(day_numbers >= vacation[0]) & (day_numbers <= vacation[1])] = False
+    return grid
+
+
+def _busy_grid(intervals, origin, days, window_slice, resolution):
+    """(days, slots) bool: უჯრა ნაწილობრივ მაინც დაკავებულია.
+    ინტერვალები difference array-ით იწერება, შემდეგ cumsum - ციკლი უჯრებზე არ არის."""
+    cells_per_day = MINUTES_PER_DAY // resolution
+    total = days * cells_per_day
+    if not intervals:
+        return np.zeros((days, cells_per_day), dtype=bool)[:, window_slice]
+
+    bounds = np.array(intervals, dtype='datetime64[m]') - np.datetime64(origin, 'm')
+    minutes = bounds.astype(np.int64)
+    first = np.clip(minutes[:, 0] // resolution, 0, total)
+    last = np.clip(-(-minutes[:, 1] // resolution), 0, total)
+
+    delta = np.zeros(total + 1, dtype=np.int32)
+    np.add.at(delta, first, 1)
+    np.add.at(delta, last, -1)
+    busy = np.cumsum(delta[:-1]) > 0
+    return busy.reshape(days, cells_per_day)[:, window_slice]
+
+
+def _percent(values):
+    return np.rint(values * 100).astype(int).tolist()
+
+
+def build_occupancy(first_day, last_day, user_ids=None, resolution=RESOLUTION):
+    """[first_day, last_day] შუალედის დატვირთვა პროცენტებში.
+
+    day - თითო დღეზე booked/free/closed (სამი სია ერთნაირი სიგრძით),
+    hour - თითო დღე × საათზე booked/closed (free = 100 - booked - closed),
+    total - ყველა ბარბერის ჯამი დღეების მიხედვით.
+    """
+    days = (last_day - first_day).days + 1
+    day_list = [(first_day + timedelta(days=n)).isoformat() for n in range(days)]
+    result = {
+        'start': first_day.isoformat(),
+        'end': last_day.isoformat(),
+        'resolution': resolution,
+        'days': day_list,
+        'hours': [],
+        'barbers': [],
+        'total': None
+    }
+
+    user_barbers = load_active_barbers(user_ids)
+    schedules = load_schedules_by_user([user.id for user, _ in user_barbers])
+    window = _hour_window(schedules)
+    if not user_barbers or window is None:
+        return result
+
+    window_start, window_end = window
+    slots_per_hour = 60 // resolution
+    window_slice = slice(window_start // resolution, window_end // resolution)
+    slot_minutes = np.arange(window_start, window_end, resolution)
+    hours = (window_end - window_start) // 60
+
+    origin = datetime.combine(first_day, time.min)
+    busy = load_busy_by_barber(
+        [barber.id for _, barber in user_barbers],
+        origin,
+        origin + timedelta(days=days)
+    )
+
+    day_numbers = np.arange(days)
+    weekdays = (first_day.weekday() + day_numbers) % 7
+
+    open_grids = []
+    busy_grids = []
+    for user, barber in user_barbers:
+        vacation = None
+        if barber.vacation_start and barber.vacation_end:
+            vacation = ((barber.vacation_start - first_day).days, (barber.vacation_end - first_day).days)
+        open_grids.append(_open_grid(schedules.get(user.id, {}), vacation, weekdays, day_numbers,
+                                     slot_minutes, resolution))
+        busy_grids.append(_busy_grid(busy.get(barber.id, []), origin, days, window_slice, resolution))
+
+    # (barbers, days, slots)
+    is_open = np.stack(open_grids)
+    booked = is_open & np.stack(busy_grids)
+    free = is_open & ~booked
+    closed = ~is_open
+
+    # (barbers, days, hours, slots_per_hour) -> საათის საშუალო
+    hourly_shape = booked.shape[:2] + (hours, slots_per_hour)
+    booked_hourly = booked.reshape(hourly_shape).mean(axis=3)
+    closed_hourly = closed.reshape(hourly_shape).mean(axis=3)
+
+    booked_daily = booked.mean(axis=2)
+    free_daily = free.mean(axis=2)
+    closed_daily = closed.mean(axis=2)
+
+    result['hours'] = list(range(window_start // 60, window_end // 60))
+    for index, (user, barber) in enumerate(user_barbers):
+        result['barbers'].append({
+            'id': user.id,
+            'name': barber.name or user.username,
+            'day': {
+                'booked': _percent(booked_daily[index]),
+                'free': _percent(free_daily[index]),
+                'closed': _percent(closed_daily[index])
+            },
+            'hour': {
+                'booked': _percent(booked_hourly[index]),
+                'closed': _percent(closed_hourly[index])
+            }
+        })
+
+    result['total'] = {
+        'booked': _percent(booked_daily.mean(axis=0)),
+        'free': _percent(free_daily.mean(axis=0)),
+        'closed': _percent(closed_daily.mean(axis=0))
+    }
+    return result
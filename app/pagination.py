@@ -0,0 +1,83 @@
+"""Keyset (cursor) pagination
+
+OFFSET-ის ნაცვლად გვერდი იწყება ბოლო ნანახი სტრიქონის გასაღებიდან
+(მაგ. (start_time, id)), ამიტომ 500-ე გვერდი ისეთივე სწრაფია, როგორც პირველი -
+ინდექსში პირდაპირ გადადის. სრული COUNT(*) არჩევითია; ნაგულისხმევად
+PostgreSQL-ის planner-ის შეფასება გამოიყენება.
+"""
+import json
+from datetime import datetime
+
+from app import db
+
+
+class KeysetPage:
+    """ერთი გვერდი: items, next_cursor (უფრო ძველი), prev_cursor (უფრო ახალი), total"""
+
+    def __init__(self, items, next_cursor=None, prev_cursor=None, total=None, total_is_estimate=False):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+def encode_cursor(values):
+    """(datetime, id) -> '2026-10-17T10:00:00_123'"""
+    return '_'.join(value.isoformat() if isinstance(value, datetime) else str(value) for value in values)
+
+
+def decode_cursor(cursor):
+    """ValueError - არასწორი cursor"""
+    moment, _, key = cursor.rpartition('_')
+    return datetime.fromisoformat(moment), int(key)
+
+
+def keyset_page(query, columns, after=None, before=None, per_page=20):
+    """query-ის გვერდი columns-ის კლებადი რიგით.
+    after - შემდეგი გვერდი (cursor-ზე ძველი), before - წინა გვერდი (cursor-ზე ახალი)."""
+    key = db.tuple_(*columns)
+
+    if before is not None:
+        rows = query.filter(key > decode_cursor(before))\
+            .order_by(*[column.asc() for column in columns])\
+            .limit(per_page + 1).all()
+        has_prev = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next = bool(rows)
+    else:
+        if after is not None:
+            query = query.filter(key < decode_cursor(after))
+        rows = query.order_by(*[column.desc() for column in columns]).limit(per_page + 1).all()
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_prev = after is not None and bool(rows)
+
+    def cursor_of(row):
+        return encode_cursor([getattr(row, column.key) for column in columns])
+
+    return KeysetPage(
+        rows,
+        next_cursor=cursor_of(rows[-1]) if has_next else None,
+        prev_cursor=cursor_of(rows[0]) if has_prev else None
+    )
+
+
+def estimate_count(query):
+    """planner-ის შეფასება (PostgreSQL) COUNT(*)-ის გარეშე; სხვა ბაზებზე None"""
+    connection = db.session.connection()
+    if connection.dialect.name != 'postgresql':
+        return None
+    compiled = query.order_by(None).statement.compile(dialect=connection.dialect)
+    plan = connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
@@ -0,0 +1,60 @@
+"""ტელეფონის ნომრის კანონიკური ფორმა (E.164, მაგ. +995555123456)
+
+clients.phone უნიკალურია - ერთ ნომერს ყველა ჩაწერის გზამ (საჯარო ჯავშანი,
+lookup, ადმინ პანელი) ერთნაირი სტრიქონი უნდა მისცეს, თორემ "+995 555..." და
+"555..." სხვადასხვა კლიენტი ხდება და lookup ვერ პოულობს.
+
+    555 12 34 56       -> +995555123456  (ეროვნული ნომერი)
+    0 322 12 34 56     -> +995322123456  (ეროვნული, trunk 0-ით)
+    995555123456       -> +995555123456  (ქვეყნის კოდით, + გარეშე)
+    +995 555 12-34-56  -> +995555123456
+    00 44 20 7946 0958 -> +442079460958  (სხვა ქვეყანა: + ან 00 აუცილებელია)
+"""
+import re
+
+DEFAULT_COUNTRY_CODE = '995'
+NATIONAL_NUMBER_LENGTH = 9  # საქართველო: 5XXXXXXXX, 32XXXXXXX...
+TRUNK_PREFIX = '0'
+INTERNATIONAL_PREFIX = '00'
+MIN_E164_DIGITS = 8
+MAX_E164_DIGITS = 15
+
+_SEPARATORS = re.compile(r'[\s\-().]')
+_DIGITS = re.compile(r'[0-9]+')
+
+
+class InvalidPhone(ValueError):
+    """ნომრის ამოცნობა ვერ მოხერხდა"""
+
+
+def normalize_phone(raw, country_code=DEFAULT_COUNTRY_CODE):
+    """raw -> '+<ქვეყნის კოდი><ნომერი>'; ამოუცნობი ნომერი - InvalidPhone"""
+    phone = _SEPARATORS.sub('', raw or '')
+    if phone.startswith('+'):
+        digits = phone[1:]
+    elif phone.startswith(INTERNATIONAL_PREFIX):
+        digits = phone[len(INTERNATIONAL_PREFIX):]
+    elif len(phone) == len(country_code) + NATIONAL_NUMBER_LENGTH and phone.startswith(country_code):
+        digits = phone
+    elif len(phone) == NATIONAL_NUMBER_LENGTH + len(TRUNK_PREFIX) and phone.startswith(TRUNK_PREFIX):
+        digits = country_code + phone[len(TRUNK_PREFIX):]
+    elif len(phone) == NATIONAL_NUMBER_LENGTH:
+        digits = country_code + phone
+    else:
+        raise InvalidPhone(raw)
+
+    if not _DIGITS.fullmatch(digits) or digits.startswith('0') or \
+            not MIN_E164_DIGITS <= len(digits) <= MAX_E164_DIGITS:
+        raise InvalidPhone(raw)
+    # ჩვენი ქვეყნის ნომერი ზუსტი სიგრძით (995 + 9 ციფრი)
+    if digits.startswith(country_code) and len(digits) != len(country_code) + NATIONAL_NUMBER_LENGTH:
+        raise InvalidPhone(raw)
+    return '+' + digits
+
+
+def try_normalize_phone(raw, country_code=DEFAULT_COUNTRY_CODE):
+    """normalize_phone ან None"""
+    try:
+        return normalize_phone(raw, country_code)
+    except InvalidPhone:
+        return None
@@ -3,8 +3,14 @@ from flask_login import login_user, logout_user, login_required, current_user
 from functools import wraps
 from app.models import db, User, Service, Booking, BarberSchedule, Client
 from datetime import datetime, timedelta, time
-from app import limiter
-from sqlalchemy import func
+from app import daily_stats, limiter, utilization
+from app.clients import find_or_create_client
+from app.booking_guard import lock_barber, reserve, is_overlap_error, SlotTaken
+from app.dashboard import dashboard_stats
+from app.pagination import estimate_count, keyset_page
+from sqlalchemy import false, func
+from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import IntegrityError
 import logging
 import os
 from werkzeug.utils import secure_filename
@@ -161,10 +167,11 @@ def logout():
 @admin_bp.route('/dashboard')
 @login_required
 def dashboard():
-    """მთავარი დაფა (Dashboard)"""
-    today = datetime.utcnow().date()
+    """მთავარი დაფა (Dashboard) - სტატისტიკა ერთი query-ით, რამდენიმე წამიანი cache-ით"""
+    recent_bookings = Booking.query.options(joinedload(Booking.service), joinedload(Booking.barber))\
+        .filter(Booking.start_time != None)\
+        .order_by(Booking.start_time.desc(), Booking.id.desc())
     
-    # სტატისტიკა
     if current_user.is_barber():
         # ✅ ბარბერი ხედავს მხოლოდ თავის სტატისტიკას
         if not current_user.barber:
@@ -181,100 +188,15 @@ def dashboard():
                                  recent_bookings=[])
         
         barber_id = current_user.barber.id  # ✅ სწორი Barber ID
-        
-        today_bookings = Booking.query.filter(
-            Booking.barber_id == barber_id,
-            func.date(Booking.start_time) == today
-        ).count()
-        
-        pending_bookings = Booking.query.filter(
-            Booking.barber_id == barber_id,
-            Booking.status == 'pending'
-        ).count()
-        
-        total_bookings = Booking.query.filter_by(barber_id=barber_id).count()
-        
-        recent_bookings = Booking.query.filter_by(barber_id=barber_id)\
-            .order_by(Booking.start_time.desc()).limit(5).all()
-        
-        # ✅ ბარბერს არ უჩვენოს სხვა ბარბერების რაოდენობა
-        total_barbers = 1
-        total_services = Service.query.filter_by(is_active=True).count()
-        
+        stats = dashboard_stats(barber_id)
+        recent_bookings = recent_bookings.filter(Booking.barber_id == barber_id)
     else:
         # ადმინი და რეცეფცია ხედავენ ყველა სტატისტიკას
-        today_bookings = Booking.query.filter(
-            func.date(Booking.start_time) == today
-        ).count()
-        
-        pending_bookings = Booking.query.filter_by(status='pending').count()
-        total_bookings = Booking.query.count()
-        
-        recent_bookings = Booking.query.order_by(Booking.start_time.desc()).limit(5).all()
-        
-        total_barbers = User.query.filter_by(role='barber', is_active=True).count()
-        total_services = Service.query.filter_by(is_active=True).count()
-    
-    stats = {
-        'today_bookings': today_bookings,
-        'pending_bookings': pending_bookings,
-        'total_bookings': total_bookings,
-        'total_barbers': total_barbers,
-        'total_services': total_services
-    }
+        stats = dashboard_stats()
     
     return render_template('admin/dashboard.html', 
                          stats=stats, 
-                         recent_bookings=recent_bookings)
-
-
-@login_required
-def dashboard():
-    """მთავარი დაფა (Dashboard)"""
-    today = datetime.utcnow().date()
-    
-    # სტატისტიკა
-    if current_user.is_barber():
-        # ბარბერი ხედავს მხოლოდ თავის სტატისტიკას
-        today_bookings = Booking.query.filter(
-            Booking.barber_id == current_user.id,
-            func.date(Booking.start_time) == today
-        ).count()
-        
-        pending_bookings = Booking.query.filter(
-            Booking.barber_id == current_user.id,
-            Booking.status == 'pending'
-        ).count()
-        
-        total_bookings = Booking.query.filter_by(barber_id=current_user.id).count()
-        
-        recent_bookings = Booking.query.filter_by(barber_id=current_user.id)\
-            .order_by(Booking.start_time.desc()).limit(5).all()
-    else:
-        # ადმინი და რეცეფცია ხედავენ ყველა სტატისტიკას
-        today_bookings = Booking.query.filter(
-            func.date(Booking.start_time) == today
-        ).count()
-        
-        pending_bookings = Booking.query.filter_by(status='pending').count()
-        total_bookings = Booking.query.count()
-        
-        recent_bookings = Booking.query.order_by(Booking.start_time.desc()).limit(5).all()
-    
-    total_barbers = User.query.filter_by(role='barber', is_active=True).count()
-    total_services = Service.query.filter_by(is_active=True).count()
-    
-    stats = {
-        'today_bookings': today_bookings,
-        'pending_bookings': pending_bookings,
-        'total_bookings': total_bookings,
-        'total_barbers': total_barbers,
-        'total_services': total_services
-    }
-    
-    return render_template('admin/dashboard.html', 
-                         stats=stats, 
-                         recent_bookings=recent_bookings)
+                         recent_bookings=recent_bookings.limit(5).all())
 
 
 # ========================
@@ -295,13 +217,18 @@ def bookings():
 @admin_bp.route('/bookings/list')
 @login_required
 def bookings_list():
-    """ჯავშნების სია (ცხრილის ხედი)"""
-    page = request.args.get('page', 1, type=int)
+    """ჯავშნების სია (ცხრილის ხედი) - keyset pagination (start_time, id)-ზე.
+    ?after= / ?before= - cursor-ები, ?count=1 - ზუსტი რაოდენობა (ნაგულისხმევად შეფასება)"""
     status_filter = request.args.get('status', 'all')
+    exact_count = request.args.get('count') == '1'
     
     if current_user.is_barber():
-        # ბარბერი ხედავს მხოლოდ საკუთარ ჯავშნებს
-        query = Booking.query.filter_by(barber_id=current_user.id)
+        # ბარბერი ხედავს მხოლოდ საკუთარ ჯავშნებს (bookings.barber_id = Barber ID);
+        # პროფილის გარეშე - ცარიელი სია (barber_id == None ყველა მიუმაგრებელ ჯავშანს დააბრუნებდა)
+        if current_user.barber:
+            query = Booking.query.filter(Booking.barber_id == current_user.barber.id)
+        else:
+            query = Booking.query.filter(false())
     else:
         # ადმინი და რეცეფცია ხედავენ ყველაფერს
         query = Booking.query
@@ -309,10 +236,24 @@ def bookings_list():
     # სტატუსის ფილტრი
     if status_filter != 'all':
         query = query.filter_by(status=status_filter)
+    query = query.filter(Booking.start_time != None)
     
-    bookings = query.order_by(Booking.start_time.desc()).paginate(
-        page=page, per_page=20, error_out=False
-    )
+    try:
+        bookings = keyset_page(
+            query.options(joinedload(Booking.service), joinedload(Booking.barber)),
+            [Booking.start_time, Booking.id],
+            after=request.args.get('after'),
+            before=request.args.get('before'),
+            per_page=20
+        )
+    except ValueError:
+        return redirect(url_for('admin.bookings_list', status=status_filter))
+    
+    if exact_count:
+        bookings.total = query.count()
+    else:
+        bookings.total = estimate_count(query)
+        bookings.total_is_estimate = True
     
     return render_template('admin/bookings_list.html', 
                          bookings=bookings, 
@@ -348,10 +289,19 @@ def booking_new():
                 )
                 end_datetime = booking_datetime + timedelta(minutes=service.duration)
                 
+                # ✅ ბარბერის lock + გადაფარვის შემოწმება
+                if form.status.data != 'cancelled':
+                    reserve(form.barber_id.data, booking_datetime, end_datetime)
+                
+                # კლიენტი ნომრით (ფორმამ ნომერი უკვე ანორმალა)
+                client = find_or_create_client(form.client_phone.data, form.client_name.data,
+                                               form.client_email.data or None)
+                
                 # Create booking
                 new_booking = Booking(
                     service_id=form.service_id.data,
                     barber_id=form.barber_id.data,
+                    client_id=client.id,
                     start_time=booking_datetime,
                     end_time=end_datetime,
                     client_name=form.client_name.data,
@@ -391,6 +341,16 @@ def booking_new():
                 flash('ჯავშანი წარმატებით შეიქმნა!', 'success')
                 return redirect(url_for('admin.bookings'))
                 
+            except (SlotTaken, IntegrityError) as e:
+                db.session.rollback()
+                if isinstance(e, IntegrityError) and not is_overlap_error(e):
+                    raise
+                if request.is_json or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                    return jsonify({
+                        'success': False,
+                        'error': 'ეს დრო უკვე დაკავებულია'
+                    }), 409
+                flash('ეს დრო უკვე დაკავებულია', 'danger')
             except Exception as e:
                 db.session.rollback()
                 logging.error(f'Error creating booking: {str(e)}')
@@ -471,6 +431,22 @@ def booking_edit(id):
                     flash('სერვისი ვერ მოიძებნა', 'danger')
                     return redirect(url_for('admin.booking_edit', id=id))
                 
+                booking_datetime = datetime.combine(
+                    form.booking_date.data,
+                    form.booking_time.data
+                )
+                end_datetime = booking_datetime + timedelta(minutes=service.duration)
+                
+                # ✅ ბარბერის lock + გადაფარვის შემოწმება (ძველი და ახალი ბარბერი, ზრდადი ID-ით)
+                lock_barber(booking.barber_id, form.barber_id.data)
+                if form.status.data != 'cancelled':
+                    reserve(form.barber_id.data, booking_datetime, end_datetime, exclude_id=booking.id)
+                
+                # ნომერი შეიცვალა (ან კლიენტი არ ჰქონდა) - სხვა კლიენტს ეკუთვნის
+                if booking.client_id is None or form.client_phone.data != booking.customer_phone:
+                    booking.client_id = find_or_create_client(form.client_phone.data, form.client_name.data,
+                                                              form.client_email.data or None).id
+                
                 # Update booking fields
                 booking.service_id = form.service_id.data
                 booking.barber_id = form.barber_id.data
@@ -485,12 +461,8 @@ def booking_edit(id):
                 booking.status = form.status.data
                 
                 # Update datetime
-                booking_datetime = datetime.combine(
-                    form.booking_date.data,
-                    form.booking_time.data
-                )
                 booking.start_time = booking_datetime
-                booking.end_time = booking_datetime + timedelta(minutes=service.duration)
+                booking.end_time = end_datetime
                 
                 db.session.commit()
                 
@@ -505,6 +477,16 @@ def booking_edit(id):
                 flash('ჯავშანი წარმატებით განახლდა!', 'success')
                 return redirect(url_for('admin.bookings'))
                 
+            except (SlotTaken, IntegrityError) as e:
+                db.session.rollback()
+                if isinstance(e, IntegrityError) and not is_overlap_error(e):
+                    raise
+                if request.is_json or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                    return jsonify({
+                        'success': False,
+                        'error': 'ეს დრო უკვე დაკავებულია'
+                    }), 409
+                flash('ეს დრო უკვე დაკავებულია', 'danger')
             except Exception as e:
                 db.session.rollback()
                 logging.error(f'Error updating booking: {str(e)}')
@@ -808,7 +790,7 @@ def user_create():
                 # ა) Barber პროფილის შექმნა (სურათი აქ ინახება)
                 new_barber = Barber(
                     user_id=new_user.id,
-                    name=f"{first_name} {last_name}",
+                    name=new_user.get_full_name(),
                     position="Barber",
                     specialties=specialization,
                     phone=phone,
@@ -861,7 +843,8 @@ def user_edit(id):
             user.is_active = request.form.get('is_active') == 'on'
 
             if user.barber:
-                user.barber.name = f"{user.first_name} {user.last_name}"
+                # სახელი აქ სინქრონდება - /api/barbers წაკითხვისას აღარ წერს
+                user.barber.name = user.get_full_name()
                 # ასევე განვაახლოთ სპეციალობაც თუ შეიცვალა
                 user.barber.specialties = request.form.get('specialization')
             
@@ -1009,41 +992,23 @@ def service_delete(id):
 @admin_bp.route('/statistics')
 @admin_required
 def statistics():
-    """სტატისტიკა"""
-    # დღევანდელი სტატისტიკა
-    today = datetime.utcnow().date()
-    today_bookings = Booking.query.filter(func.date(Booking.start_time) == today).count()
-    
-    # წლიური სტატისტიკა
-    year_start = datetime(datetime.utcnow().year, 1, 1)
-    yearly_bookings = Booking.query.filter(Booking.created_at >= year_start).count()
-    
-    # ბარბერების რეიტინგი
-    barber_stats = db.session.query(
-        User.first_name,
-        User.last_name,
-        func.count(Booking.id).label('booking_count')
-    ).join(Booking, User.id == Booking.barber_id)\
-     .filter(User.role == 'barber')\
-     .group_by(User.id)\
-     .order_by(func.count(Booking.id).desc())\
-     .all()
-    
-    # პოპულარული მომსახურებები
-    popular_services = db.session.query(
-        Service.name,
-        func.count(Booking.id).label('booking_count')
-    ).join(Booking, Service.id == Booking.service_id)\
-     .group_by(Service.id)\
-     .order_by(func.count(Booking.id).desc())\
-     .limit(5).all()
+    """სტატისტიკა - მხოლოდ booking_daily_stats rollup-იდან (იხ. app/daily_stats.py)"""
+    today = datetime.now().date()  # ჯავშნების დრო ლოკალურია
+    year_start = today.replace(month=1, day=1)
+    year_end = today.replace(month=12, day=31)
     
     stats = {
-        'today_bookings': today_bookings,
-        'yearly_bookings': yearly_bookings,
-        'barber_stats': barber_stats,
-        'popular_services': popular_services
+        'today_bookings': daily_stats.total_bookings(today, today),
+        'yearly_bookings': daily_stats.total_bookings(year_start, year_end),
+        # ბარბერების რეიტინგი - დასრულებული ჯავშნები
+        'barber_stats': daily_stats.barber_ranking(),
+        # პოპულარული მომსახურებები
+        'popular_services': daily_stats.popular_services(limit=5)
     }
+    # მიმდინარე თვის დატვირთვა (დაჯავშნილი / სამუშაო საათები)
+    month_start = today.replace(day=1)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    stats['utilization'] = utilization.build_utilization(month_start, month_end, group='month')
     
     now = datetime.now()
     
@@ -1,14 +1,20 @@
-import os
 import logging
-from flask import Blueprint, jsonify, request, url_for, current_app
+from flask import Blueprint, Response, jsonify, redirect, request, stream_with_context, url_for
 from flask_login import login_required, current_user
 from app.models import User, BarberSchedule, Booking, Service, Barber, Client
-from app import db
+from app import db, availability, booking_events, bootstrap, calendar_feed, catalog, clients, dashboard, occupancy, utilization
+from app.http_cache import conditional
+from app.booking_guard import BarberIntervals, lock_barber, reserve, is_overlap_error, SlotTaken
+from app.phones import normalize_phone, try_normalize_phone, InvalidPhone
 from datetime import datetime, timedelta, time
-from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+BOOKING_STATUSES = ('pending', 'confirmed', 'cancelled', 'completed', 'no-show')
+MAX_BULK_OPERATIONS = 200
+BULK_LOCK_ATTEMPTS = 3  # ჯავშნები lock-ებს შორის სხვა ბარბერზე გადავიდა - თავიდან ცდა
+
 # ========================
 # HELPER FUNCTIONS
 # ========================
@@ -20,90 +26,72 @@ def get_real_barber_id(user_id):
         return user.barber.id
     return None
 
-def generate_time_slots(start_time, end_time, interval_minutes=30):
-    slots = []
-    current = datetime.combine(datetime.today(), start_time)
-    end = datetime.combine(datetime.today(), end_time)
-    while current < end:
-        slots.append(current.strftime('%H:%M'))
-        current += timedelta(minutes=interval_minutes)
-    return slots
-
-def is_slot_available(barber_id, date, time_slot, service_duration):
-    """ამოწმებს არის თუ არა სლოტი თავისუფალი"""
-    try:
-        slot_time = datetime.strptime(time_slot, '%H:%M').time()
-        slot_start = datetime.combine(date, slot_time)
-        slot_end = slot_start + timedelta(minutes=service_duration)
-        
-        overlapping_bookings = Booking.query.filter(
-            and_(
-                Booking.barber_id == barber_id,
-                Booking.status != 'cancelled',
-                Booking.start_time != None,
-                Booking.start_time < slot_end,
-                Booking.end_time > slot_start
-            )
-        ).first()
-        
-        return overlapping_bookings is None
-    except ValueError:
-        return False
+def parse_calendar_datetime(value):
+    """FullCalendar-ის ISO დრო ("Z" / "+04:00", URL-ში "+" ხშირად " " ხდება) -> ლოკალური naive
+    (ჯავშნების დრო ბაზაში სერვერის ლოკალურ დროშია)"""
+    parsed = datetime.fromisoformat(value.replace(' ', '+').replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def get_service_duration(service_id, default=30):
+    """სერვისის ხანგრძლივობა წუთებში (ნაგულისხმევი 30)"""
+    if service_id:
+        service = Service.query.get(service_id)
+        if service: return service.duration
+    return default
 
 # ========================
 # PUBLIC ENDPOINTS
 # ========================
 
 @api_bp.route('/barbers', methods=['GET'])
+@conditional('barbers')
 def get_barbers():
+    """ბარბერების ცნობარი cache-იდან (იხ. app/catalog.py) - წაკითხვისას ბაზაში არაფერი იწერება"""
     try:
-        users = User.query.filter_by(role='barber', is_active=True).all()
-        barbers_list = []
-        for user in users:
-            image_src = None
-            name = user.get_full_name()
-            specialization = user.specialization or "ბარბერი"
-            
-            if user.barber:
-                if user.barber.name != name:
-                    user.barber.name = name
-                    db.session.commit()
-
-                if user.barber.image_url:
-                    full_path = os.path.join(current_app.root_path, 'static', user.barber.image_url)
-                    if os.path.exists(full_path):
-                        image_src = url_for('static', filename=user.barber.image_url)
-                
-                if user.barber.specialties:
-                    specialization = user.barber.specialties
-
-            barbers_list.append({
-                'id': user.id, # Frontend-ს ვაძლევთ User ID-ს
-                'name': name,
-                'specialization': specialization,
-                'image': image_src
-            })
-        return jsonify({'success': True, 'barbers': barbers_list})
+        return jsonify({'success': True, 'barbers': catalog.barber_directory()})
     except Exception as e:
         logging.error(f"API ERROR (get_barbers): {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @api_bp.route('/services', methods=['GET'])
 def get_services():
+    """?v=<ვერსია> - უცვლელი snapshot query-ს გარეშე (immutable); ვერსიის გარეშე - ETag-ით"""
+    version = request.args.get('v', type=int)
+    if version is None:
+        return get_current_services()
     try:
-        services = Service.query.filter_by(is_active=True).all()
-        services_list = [{
-            'id': s.id,
-            'name': s.name,
-            'description': s.description,
-            'price': s.price,
-            'duration': s.duration
-        } for s in services]
-        return jsonify({'success': True, 'services': services_list})
+        snapshot = catalog.service_catalog.peek()
+        if snapshot is None or snapshot.version != version:
+            snapshot = catalog.service_catalog.current(refresh=True)
+        if snapshot.version != version:
+            # ძველი / უცნობი ვერსია - მიმდინარე ვერსიის URL-ზე
+            return redirect(url_for('api.get_services', v=snapshot.version))
+        return catalog.immutable_services_response(snapshot)
     except Exception as e:
         logging.error(f"API ERROR (get_services): {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@conditional('services')
+def get_current_services():
+    try:
+        # ETag უკვე მიმდინარე ვერსიაზეა - snapshot-იც ბაზასთან უნდა შემოწმდეს
+        return catalog.services_response(catalog.service_catalog.current(refresh=True))
+    except Exception as e:
+        logging.error(f"API ERROR (get_services): {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api_bp.route('/booking/bootstrap', methods=['GET'])
+def get_booking_bootstrap():
+    """ჯავშნის გვერდის პირველი ეკრანი ერთ პასუხში: სერვისები, ბარბერები, უახლოესი ღია დღეები"""
+    try:
+        return jsonify({'success': True, **bootstrap.build_bootstrap()})
+    except Exception as e:
+        logging.error(f"API ERROR (booking_bootstrap): {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @api_bp.route('/available-slots/<int:barber_id>/<string:date>', methods=['GET'])
 def get_available_slots(barber_id, date):
     try:
@@ -111,99 +99,184 @@ def get_available_slots(barber_id, date):
         if booking_date < datetime.now().date():
             return jsonify({'success': False, 'error': 'წარსული თარიღი'}), 400
         
-        barber_user = User.query.get(barber_id)
-        if not barber_user: return jsonify({'success': False, 'error': 'ბარბერი ვერ მოიძებნა'}), 404
-
-        # Vacation Check
-        if barber_user.barber and barber_user.barber.vacation_start and barber_user.barber.vacation_end:
-            v_start = barber_user.barber.vacation_start
-            v_end = barber_user.barber.vacation_end
-            if v_start <= booking_date <= v_end:
-                return_date = v_end + timedelta(days=1)
-                return jsonify({
-                    'success': True,
-                    'is_working': False,
-                    'message': f"ბარბერი შვებულებაშია. ბრუნდება: {return_date.strftime('%d.%m.%Y')}-ში",
-                    'slots': {'morning': [], 'afternoon': [], 'evening': []}
-                })
-
-        # Schedule Check
-        day_of_week = booking_date.weekday()
-        schedule = BarberSchedule.query.filter_by(
-            barber_id=barber_id, day_of_week=day_of_week, is_working=True
-        ).first()
-        
-        if not schedule:
+        service_duration = get_service_duration(request.args.get('service_id', type=int))
+        interval = availability.clamp_interval(request.args.get('interval', type=int))
+
+        entry = availability.get_day_slots(barber_id, booking_date, service_duration, interval)
+        if entry is None: return jsonify({'success': False, 'error': 'ბარბერი ვერ მოიძებნა'}), 404
+        day, cached_slots = entry
+
+        # Vacation / Schedule Check
+        if day.reason == 'vacation':
             return jsonify({
                 'success': True,
                 'is_working': False,
-                'message': f'ბარბერი არ მუშაობს {BarberSchedule.get_day_name(day_of_week)}-ს',
+                'message': f"ბარბერი შვებულებაშია. ბრუნდება: {day.return_date.strftime('%d.%m.%Y')}-ში",
+                'slots': {'morning': [], 'afternoon': [], 'evening': []}
+            })
+        if not day.is_working:
+            return jsonify({
+                'success': True,
+                'is_working': False,
+                'message': f'ბარბერი არ მუშაობს {BarberSchedule.get_day_name(booking_date.weekday())}-ს',
                 'slots': {'morning': [], 'afternoon': [], 'evening': []}
             })
         
-        service_id = request.args.get('service_id', type=int)
-        interval = request.args.get('interval', default=30, type=int)
-        service_duration = 30
-        if service_id:
-            service = Service.query.get(service_id)
-            if service: service_duration = service.duration
-        
-        all_slots = generate_time_slots(schedule.start_time, schedule.end_time, interval)
-        current_datetime = datetime.now()
-        available_slots = []
-        
-        # Real Barber ID for slot check
-        real_barber_id = get_real_barber_id(barber_id)
-        
-        for slot in all_slots:
-            try:
-                slot_time_obj = datetime.strptime(slot, '%H:%M').time()
-                slot_full_datetime = datetime.combine(booking_date, slot_time_obj)
-                if slot_full_datetime <= current_datetime: continue
-                
-                if is_slot_available(real_barber_id, booking_date, slot, service_duration):
-                    available_slots.append(slot)
-            except ValueError: continue
-        
-        morning_slots = [s for s in available_slots if int(s.split(':')[0]) < 12]
-        afternoon_slots = [s for s in available_slots if 12 <= int(s.split(':')[0]) < 17]
-        evening_slots = [s for s in available_slots if int(s.split(':')[0]) >= 17]
-        
+        slot_starts = availability.upcoming_slots(cached_slots, booking_date, datetime.now())
         return jsonify({
             'success': True,
             'is_working': True,
-            'slots': {'morning': morning_slots, 'afternoon': afternoon_slots, 'evening': evening_slots}
+            'slots': availability.day_parts(slot_starts)
         })
         
     except Exception as e:
         logging.error(f"API ERROR (get_slots): {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@api_bp.route('/availability/any', methods=['GET'])
+def get_any_barber_slots():
+    """უახლოესი თავისუფალი დრო ნებისმიერ ბარბერთან (?service_id=&from=&limit=)"""
+    try:
+        today = datetime.now().date()
+        from_str = request.args.get('from')
+        first_day = datetime.strptime(from_str, '%Y-%m-%d').date() if from_str else today
+        first_day = max(first_day, today)
+
+        limit = request.args.get('limit', default=5, type=int)
+        limit = max(1, min(limit, availability.MAX_SEARCH_RESULTS))
+        days = request.args.get('days', default=14, type=int)
+        days = max(1, min(days, availability.MAX_SEARCH_DAYS))
+
+        service_duration = get_service_duration(request.args.get('service_id', type=int))
+        interval = availability.clamp_interval(request.args.get('interval', type=int))
+
+        results = availability.find_earliest_slots(
+            first_day, service_duration, interval, limit, days=days, not_before=datetime.now()
+        )
+
+        slots_list = [{
+            'barber_id': user.id, # Frontend-ს ვაძლევთ User ID-ს
+            'barber_name': user.get_full_name(),
+            'date': day.isoformat(),
+            'time': availability.format_minute(minute)
+        } for user, barber, day, minute in results]
+
+        return jsonify({'success': True, 'slots': slots_list})
+
+    except ValueError:
+        return jsonify({'success': False, 'error': 'არასწორი თარიღი'}), 400
+    except Exception as e:
+        logging.error(f"API ERROR (availability_any): {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api_bp.route('/availability/<int:barber_id>', methods=['GET'])
+def get_availability_range(barber_id):
+    """დღეების შეჯამება კალენდრისთვის (?from=&to=&service_id=) - ერთი მოთხოვნით"""
+    try:
+        today = datetime.now().date()
+        from_str = request.args.get('from')
+        to_str = request.args.get('to')
+        first_day = datetime.strptime(from_str, '%Y-%m-%d').date() if from_str else today
+        last_day = datetime.strptime(to_str, '%Y-%m-%d').date() if to_str else first_day + timedelta(days=6)
+
+        if last_day < first_day:
+            return jsonify({'success': False, 'error': 'არასწორი შუალედი'}), 400
+        if (last_day - first_day).days >= availability.MAX_RANGE_DAYS:
+            return jsonify({'success': False, 'error': f'მაქსიმუმ {availability.MAX_RANGE_DAYS} დღე'}), 400
+
+        user_barber = availability.load_barber(barber_id)
+        if not user_barber: return jsonify({'success': False, 'error': 'ბარბერი ვერ მოიძებნა'}), 404
+
+        service_duration = get_service_duration(request.args.get('service_id', type=int))
+        interval = availability.clamp_interval(request.args.get('interval', type=int))
+
+        # წარსული დღეები არ ითვლება
+        now = datetime.now()
+        days = availability.get_range_slots(barber_id, max(first_day, today), last_day,
+                                            service_duration, interval, user_barber) \
+            if last_day >= today else []
+
+        days_list = []
+        for day, cached_slots in days:
+            slot_starts = availability.upcoming_slots(cached_slots, day.day, now)
+            days_list.append({
+                'date': day.day.isoformat(),
+                'is_working': day.is_working,
+                'reason': day.reason,
+                'available': len(slot_starts),
+                'first_slot': availability.format_minute(slot_starts[0]) if slot_starts else None
+            })
+
+        return jsonify({
+            'success': True,
+            'from': first_day.isoformat(),
+            'to': last_day.isoformat(),
+            'days': days_list
+        })
+
+    except ValueError:
+        return jsonify({'success': False, 'error': 'არასწორი თარიღი'}), 400
+    except Exception as e:
+        logging.error(f"API ERROR (availability_range): {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api_bp.route('/availability/<int:barber_id>/next', methods=['GET'])
+def get_next_open_days(barber_id):
+    """ბარბერის უახლოესი დღეები თავისუფალი სლოტით (?service_id=&from=&limit=&days=)"""
+    try:
+        now = datetime.now()
+        today = now.date()
+        from_str = request.args.get('from')
+        first_day = datetime.strptime(from_str, '%Y-%m-%d').date() if from_str else today
+        first_day = max(first_day, today)
+
+        limit = request.args.get('limit', default=3, type=int)
+        limit = max(1, min(limit, availability.MAX_NEXT_DATES))
+        horizon = request.args.get('days', default=60, type=int)
+        horizon = max(1, min(horizon, availability.MAX_NEXT_HORIZON_DAYS))
+
+        user_barber = availability.load_barber(barber_id)
+        if not user_barber: return jsonify({'success': False, 'error': 'ბარბერი ვერ მოიძებნა'}), 404
+
+        service_duration = get_service_duration(request.args.get('service_id', type=int))
+        interval = availability.clamp_interval(request.args.get('interval', type=int))
+
+        open_days, searched_until = availability.find_next_open_days(
+            barber_id, first_day, service_duration, interval, limit, horizon, now, user_barber
+        )
+
+        return jsonify({
+            'success': True,
+            'dates': [{
+                'date': day.isoformat(),
+                'available': len(slot_starts),
+                'first_slot': availability.format_minute(slot_starts[0])
+            } for day, slot_starts in open_days],
+            'searched_until': searched_until.isoformat()
+        })
+
+    except ValueError:
+        return jsonify({'success': False, 'error': 'არასწორი თარიღი'}), 400
+    except Exception as e:
+        logging.error(f"API ERROR (availability_next): {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @api_bp.route('/clients/lookup', methods=['POST'])
 def lookup_client():
     try:
         data = request.get_json()
-        phone = data.get('phone', '').replace(' ', '').replace('-', '').replace('+', '')
+        phone = try_normalize_phone(data.get('phone'))
         if not phone: return jsonify({'found': False})
 
+        # ერთი წაკითხვა - ვიზიტების შეჯამება clients-შივეა (app/client_summary.py)
         client = Client.query.filter_by(phone=phone).first()
         if client:
-            last_booking = Booking.query.filter_by(client_id=client.id)\
-                .filter(Booking.status != 'cancelled')\
-                .order_by(Booking.start_time.desc())\
-                .first()
-            
             last_visit_info = None
-            if last_booking and last_booking.start_time:
-                service_name = last_booking.service.name if last_booking.service else 'უცნობი სერვისი'
-                barber_name = "უცნობი ოსტატი"
-                if last_booking.barber:
-                    barber_name = last_booking.barber.name
-
+            if client.last_visit_at:
                 last_visit_info = {
-                    'date': last_booking.start_time.strftime('%d.%m.%Y'),
-                    'barber': barber_name,
-                    'service': service_name
+                    'date': client.last_visit_at.strftime('%d.%m.%Y'),
+                    'barber': client.last_barber_name or 'უცნობი ოსტატი',
+                    'service': client.last_service_name or 'უცნობი სერვისი'
                 }
 
             return jsonify({
@@ -211,6 +284,8 @@ def lookup_client():
                 'name': client.name,
                 'email': client.email,
                 'is_blocked': client.is_blocked,
+                'visits': client.visit_count,
+                'no_shows': client.no_show_count,
                 'last_visit': last_visit_info
             })
             
@@ -237,27 +312,29 @@ def create_booking():
         if not real_barber_id:
              return jsonify({'success': False, 'error': 'ბარბერის პროფილი არ არსებობს'}), 400
 
-        raw_phone = data['customer_phone']
-        clean_phone = raw_phone.replace(' ', '').replace('-', '').replace('+', '')
+        try:
+            clean_phone = normalize_phone(data['customer_phone'])
+        except InvalidPhone:
+            return jsonify({'success': False, 'error': 'არასწორი ტელეფონის ნომერი'}), 400
         
-        client = Client.query.filter_by(phone=clean_phone).first()
-        if client and client.is_blocked:
+        client = clients.find_or_create_client(clean_phone, data['customer_name'], data.get('customer_email'))
+        if client.is_blocked:
             return jsonify({'success': False, 'error': 'შეზღუდული გაქვთ ჯავშნის გაკეთება'}), 403
-            
-        if not client:
-            client = Client(phone=clean_phone, name=data['customer_name'], email=data.get('customer_email'))
-            db.session.add(client)
-            db.session.flush()
-        else:
-            client.name = data['customer_name']
-            if data.get('customer_email'): client.email = data.get('customer_email')
+        
+        client.name = data['customer_name']
+        if data.get('customer_email'): client.email = data.get('customer_email')
 
         booking_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
         booking_time = datetime.strptime(data['time'], '%H:%M').time()
         start_datetime = datetime.combine(booking_date, booking_time)
         end_datetime = start_datetime + timedelta(minutes=service.duration)
         
-        if not is_slot_available(real_barber_id, booking_date, data['time'], service.duration):
+        # ✅ ბარბერის lock commit-მდე - პარალელური მოთხოვნები ერთ სლოტზე რიგში დგებიან
+        lock_barber(real_barber_id)
+        day = availability.compute_day_availability(user_barber.id, booking_date)
+        start_minute = availability.minute_of_day(booking_time)
+        if not availability.is_range_free(day, start_minute, start_minute + service.duration):
+             db.session.rollback()
              return jsonify({'success': False, 'error': 'დრო უკვე დაკავებულია'}), 409
 
         new_booking = Booking(
@@ -283,6 +360,12 @@ def create_booking():
         
         return jsonify({'success': True, 'booking_id': new_booking.id, 'message': 'წარმატებით შეიქმნა'})
 
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_overlap_error(e):
+            return jsonify({'success': False, 'error': 'დრო უკვე დაკავებულია'}), 409
+        logging.error(f"API ERROR (create_booking): {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
     except Exception as e:
         db.session.rollback()
         logging.error(f"API ERROR (create_booking): {str(e)}")
@@ -291,66 +374,168 @@ def create_booking():
 # ========================
 # ADMIN API
 # ========================
+@api_bp.route('/admin/cache-stats', methods=['GET'])
+@login_required
+def get_cache_stats():
+    if not current_user.is_admin():
+        return jsonify({'success': False, 'error': 'No access'}), 403
+    return jsonify({
+        'success': True,
+        'availability': availability.availability_cache.stats(),
+        'dashboard': dashboard.dashboard_cache.stats(),
+        'catalog': catalog.directory_cache.stats()
+    })
+
+@api_bp.route('/admin/occupancy', methods=['GET'])
+@login_required
+def get_occupancy():
+    """თვის დატვირთვის ბადე კალენდრის heatmap-ისთვის (?start=&end=&barber_id=&resolution=)"""
+    try:
+        today = datetime.now().date()
+        start_str = request.args.get('start')
+        end_str = request.args.get('end')
+        first_day = datetime.strptime(start_str, '%Y-%m-%d').date() if start_str else today.replace(day=1)
+        last_day = datetime.strptime(end_str, '%Y-%m-%d').date() if end_str else first_day + timedelta(days=30)
+
+        if last_day < first_day:
+            return jsonify({'success': False, 'error': 'არასწორი შუალედი'}), 400
+        if (last_day - first_day).days >= occupancy.MAX_OCCUPANCY_DAYS:
+            return jsonify({'success': False, 'error': f'მაქსიმუმ {occupancy.MAX_OCCUPANCY_DAYS} დღე'}), 400
+
+        resolution = request.args.get('resolution', occupancy.RESOLUTION, type=int)
+        if resolution not in occupancy.ALLOWED_RESOLUTIONS:
+            return jsonify({'success': False, 'error': 'არასწორი resolution'}), 400
+
+        # ბარბერი მხოლოდ საკუთარ დატვირთვას ხედავს
+        user_ids = None
+        if current_user.is_barber():
+            user_ids = [current_user.id]
+        elif request.args.get('barber_id', type=int):
+            user_ids = [request.args.get('barber_id', type=int)]
+
+        grid = occupancy.build_occupancy(first_day, last_day, user_ids, resolution)
+        return jsonify({'success': True, **grid})
+    except ValueError:
+        return jsonify({'success': False, 'error': 'არასწორი თარიღი'}), 400
+    except Exception as e:
+        logging.error(f"API ERROR (occupancy): {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api_bp.route('/admin/utilization', methods=['GET'])
+@login_required
+def get_utilization():
+    """დაჯავშნილი / სამუშაო წუთები ბარბერებზე (?start=&end=&group=day|week|month&barber_id=)"""
+    try:
+        today = datetime.now().date()
+        start_str = request.args.get('start')
+        end_str = request.args.get('end')
+        first_day = datetime.strptime(start_str, '%Y-%m-%d').date() if start_str else today.replace(day=1)
+        last_day = datetime.strptime(end_str, '%Y-%m-%d').date() if end_str else first_day + timedelta(days=30)
+
+        if last_day < first_day:
+            return jsonify({'success': False, 'error': 'არასწორი შუალედი'}), 400
+        if (last_day - first_day).days >= utilization.MAX_UTILIZATION_DAYS:
+            return jsonify({'success': False, 'error': f'მაქსიმუმ {utilization.MAX_UTILIZATION_DAYS} დღე'}), 400
+
+        group = request.args.get('group', 'day')
+        if group not in utilization.GROUPS:
+            return jsonify({'success': False, 'error': 'არასწორი group'}), 400
+
+        # ბარბერი მხოლოდ საკუთარ დატვირთვას ხედავს
+        user_ids = None
+        if current_user.is_barber():
+            user_ids = [current_user.id]
+        elif request.args.get('barber_id', type=int):
+            user_ids = [request.args.get('barber_id', type=int)]
+
+        report = utilization.build_utilization(first_day, last_day, user_ids, group)
+        return jsonify({'success': True, **report})
+    except ValueError:
+        return jsonify({'success': False, 'error': 'არასწორი თარიღი'}), 400
+    except Exception as e:
+        logging.error(f"API ERROR (utilization): {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @api_bp.route('/admin/all-bookings', methods=['GET'])
 @login_required
 def get_all_bookings():
+    """კალენდრის feed: ?start=&end= სავალდებულოა (მაქს. 62 დღე), პასუხი stream-ით.
+    ?since=<cursor> - მხოლოდ ცვლილებები: {cursor, events, deleted}"""
     try:
         start_str = request.args.get('start')
         end_str = request.args.get('end')
         barber_filter = request.args.get('barber_id')
-        
-        query = Booking.query
-        
+
+        if not start_str or not end_str:
+            return jsonify({'success': False, 'error': 'start და end სავალდებულოა'}), 400
+
+        start_dt = parse_calendar_datetime(start_str)
+        end_dt = parse_calendar_datetime(end_str)
+
+        if end_dt <= start_dt:
+            return jsonify({'success': False, 'error': 'არასწორი შუალედი'}), 400
+        if end_dt - start_dt > timedelta(days=calendar_feed.MAX_FEED_DAYS):
+            return jsonify({'success': False, 'error': f'მაქსიმუმ {calendar_feed.MAX_FEED_DAYS} დღე'}), 400
+
+        since_str = request.args.get('since')
+        since = calendar_feed.parse_cursor(since_str) if since_str else None
+
+        barber_id = None
         if current_user.is_barber():
-            if current_user.barber:
-                query = query.filter_by(barber_id=current_user.barber.id)
-            else:
+            if not current_user.barber:
+                # პროფილის გარეშე ბარბერს ჯავშნები არ აქვს - იგივე ფორმა, ცარიელი
+                if since is not None:
+                    return jsonify({'success': True, 'cursor': calendar_feed.new_cursor(),
+                                    'events': [], 'deleted': []})
                 return jsonify([])
-        
-        if start_str and end_str:
-            start_str = start_str.replace(' ', '+').replace('Z', '+00:00')
-            end_str = end_str.replace(' ', '+').replace('Z', '+00:00')
-            start_dt = datetime.fromisoformat(start_str)
-            end_dt = datetime.fromisoformat(end_str)
-            query = query.filter(Booking.start_time >= start_dt, Booking.start_time <= end_dt)
-
-        if barber_filter:
+            barber_id = current_user.barber.id
+        elif barber_filter:
             try:
-                real_id = get_real_barber_id(int(barber_filter))
-                if real_id: query = query.filter_by(barber_id=real_id)
-            except: pass
+                barber_id = get_real_barber_id(int(barber_filter))
+            except ValueError:
+                pass
+    except ValueError:
+        return jsonify({'success': False, 'error': 'არასწორი თარიღი'}), 400
 
-        bookings = query.all()
-        events = []
-        
-        for b in bookings:
-            color = '#f59e0b'
-            if b.status == 'confirmed': color = '#10b981'
-            elif b.status == 'cancelled': color = '#ef4444'
-            elif b.status == 'completed': color = '#3b82f6'
-
-            events.append({
-                'id': b.id,
-                'title': f"{b.customer_name}",
-                'start': b.start_time.isoformat(),
-                'end': b.end_time.isoformat(),
-                'backgroundColor': color,
-                'borderColor': color,
-                'extendedProps': {
-                    'customerName': b.customer_name,
-                    'customerPhone': b.customer_phone,
-                    'serviceName': b.service.name,
-                    'servicePrice': b.price,
-                    'serviceDuration': b.service.duration,
-                    'barberName': b.barber.name if b.barber else 'Unknown',
-                    'status': b.status,
-                    'notes': b.notes
-                }
-            })
-        return jsonify(events)
-    except Exception as e:
-        logging.error(f"API ERROR (calendar): {str(e)}")
-        return jsonify([])
+    cursor = calendar_feed.new_cursor()
+
+    if since is not None:
+        # ძალიან ძველი cursor - კვალი უკვე წაშლილია, კლიენტმა სრულად უნდა ჩატვირთოს
+        if calendar_feed.cursor_expired(since):
+            return jsonify({'success': False, 'reset': True}), 410
+        events, removed = calendar_feed.delta(since, start_dt, end_dt, barber_id)
+        return jsonify({
+            'success': True,
+            'cursor': cursor,
+            'events': [event.to_dict() for event in events],
+            'deleted': removed
+        })
+
+    def generate():
+        try:
+            yield from calendar_feed.stream_json(calendar_feed.iter_events(start_dt, end_dt, barber_id))
+        except Exception as e:
+            # სტატუსი უკვე გაგზავნილია - მხოლოდ ლოგი
+            logging.error(f"API ERROR (calendar): {str(e)}")
+            raise
+
+    response = Response(stream_with_context(generate()), mimetype='application/json')
+    response.headers['X-Calendar-Cursor'] = cursor
+    return response
+
+@api_bp.route('/admin/booking-events', methods=['GET'])
+@login_required
+def booking_events_stream():
+    """SSE: ჯავშნების შექმნა/ცვლილება/გადატანა/გაუქმება ღია კალენდრებისთვის.
+    event: booking - {type, id, barber_ids, event}, event: resync - delta sync საჭიროა"""
+    user_id = current_user.id if current_user.is_barber() else None
+    subscription = booking_events.hub.subscribe()
+    # გრძელი კავშირი ბაზის connection-ს არ უნდა იკავებდეს
+    db.session.remove()
+    response = Response(booking_events.stream(subscription, user_id), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @api_bp.route('/admin/bookings/<int:booking_id>/update-status', methods=['PATCH'])
 @login_required
@@ -360,10 +545,23 @@ def update_booking_status(booking_id):
             return jsonify({'success': False, 'error': 'No access'}), 403
         
         booking = Booking.query.get_or_404(booking_id)
-        data = request.get_json()
-        booking.status = data.get('status')
+        data = request.get_json(silent=True) or {}
+        new_status = data.get('status')
+        if new_status not in BOOKING_STATUSES:
+            return jsonify({'success': False, 'error': 'არასწორი სტატუსი'}), 400
+        
+        # გაუქმებულის აღდგენა დროს ისევ იკავებს
+        if booking.status == 'cancelled' and new_status != 'cancelled' and booking.start_time:
+            reserve(booking.barber_id, booking.start_time, booking.end_time, exclude_id=booking.id)
+        
+        booking.status = new_status
         db.session.commit()
         return jsonify({'success': True})
+    except (SlotTaken, IntegrityError) as e:
+        db.session.rollback()
+        if isinstance(e, IntegrityError) and not is_overlap_error(e):
+            return jsonify({'success': False, 'error': str(e)}), 500
+        return jsonify({'success': False, 'error': 'დრო დაკავებულია'}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -378,21 +576,11 @@ def update_booking_datetime(booking_id):
         booking = Booking.query.get_or_404(booking_id)
         data = request.get_json()
         
-        start_str = data['start_time'].replace('Z', '+00:00')
-        end_str = data['end_time'].replace('Z', '+00:00')
-        new_start = datetime.fromisoformat(start_str)
-        new_end = datetime.fromisoformat(end_str)
-        
-        overlapping = Booking.query.filter(
-            Booking.id != booking_id,
-            Booking.barber_id == booking.barber_id,
-            Booking.status.in_(['pending', 'confirmed']),
-            Booking.start_time < new_end,
-            Booking.end_time > new_start
-        ).first()
+        new_start = parse_calendar_datetime(data['start_time'])
+        new_end = parse_calendar_datetime(data['end_time'])
         
-        if overlapping:
-            return jsonify({'success': False, 'error': 'დრო დაკავებულია'}), 400
+        if booking.status != 'cancelled':
+            reserve(booking.barber_id, new_start, new_end, exclude_id=booking.id)
         
         booking.start_time = new_start
         booking.end_time = new_end
@@ -401,6 +589,170 @@ def update_booking_datetime(booking_id):
         logging.info(f"📅 Booking {booking.id} moved by {current_user.username}")
         return jsonify({'success': True})
         
+    except (SlotTaken, IntegrityError) as e:
+        db.session.rollback()
+        if isinstance(e, IntegrityError) and not is_overlap_error(e):
+            return jsonify({'success': False, 'error': str(e)}), 500
+        return jsonify({'success': False, 'error': 'დრო დაკავებულია'}), 400
     except Exception as e:
         db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def parse_bulk_operation(operation):
+    """bulk ოპერაციის ნორმალიზაცია; ValueError / KeyError / TypeError - არასწორი"""
+    action = operation['action']
+    parsed = {'id': int(operation['id']), 'action': action}
+    if action == 'status':
+        if operation['status'] not in BOOKING_STATUSES:
+            raise ValueError('status')
+        parsed['status'] = operation['status']
+    elif action == 'reschedule':
+        parsed['start'] = parse_calendar_datetime(operation['start_time'])
+        parsed['end'] = parse_calendar_datetime(operation['end_time']) if operation.get('end_time') else None
+        if parsed['end'] is not None and parsed['end'] <= parsed['start']:
+            raise ValueError('end_time')
+        parsed['barber_user_id'] = int(operation['barber_id']) if operation.get('barber_id') else None
+    elif action != 'delete':
+        raise ValueError('action')
+    return parsed
+
+@api_bp.route('/admin/bookings/bulk', methods=['POST'])
+@login_required
+def bulk_update_bookings():
+    """რამდენიმე ოპერაცია ერთი მოთხოვნით და ერთი commit-ით:
+    {"operations": [{"id", "action": "status", "status"},
+                    {"id", "action": "reschedule", "start_time", "end_time"?, "barber_id"? (User ID)},
+                    {"id", "action": "delete"}],
+     "atomic": false}
+    შედეგი თითო ოპერაციაზე; atomic=true - ერთი შეცდომისას არაფერი ინახება"""
+    if not (current_user.is_admin() or current_user.is_reception()):
+        return jsonify({'success': False, 'error': 'No access'}), 403
+
+    data = request.get_json(silent=True)
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'success': False, 'error': 'operations სავალდებულოა'}), 400
+    if len(operations) > MAX_BULK_OPERATIONS:
+        return jsonify({'success': False, 'error': f'მაქსიმუმ {MAX_BULK_OPERATIONS} ოპერაცია'}), 400
+    atomic = bool(data.get('atomic'))
+
+    results = [None] * len(operations)
+    parsed = []
+    for index, operation in enumerate(operations):
+        try:
+            parsed.append((index, parse_bulk_operation(operation)))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            operation_id = operation.get('id') if isinstance(operation, dict) else None
+            results[index] = {'id': operation_id, 'success': False, 'error': 'არასწორი ოპერაცია'}
+
+    try:
+        booking_ids = {op['id'] for _, op in parsed}
+        bookings = {b.id: b for b in Booking.query.filter(Booking.id.in_(booking_ids))}
+        target_user_ids = {op['barber_user_id'] for _, op in parsed if op.get('barber_user_id')}
+        barber_by_user = dict(
+            db.session.query(Barber.user_id, Barber.id).filter(Barber.user_id.in_(target_user_ids))
+        ) if target_user_ids else {}
+
+        # ყველა შეხებული ბარბერი ერთად (ზრდადი ID-ით) იკეტება, შემდეგ ჯავშნები თავიდან იკითხება.
+        # ჯავშანი ამასობაში სხვა ბარბერზე გადავიდა - rollback (lock-ები თავისუფლდება) და თავიდან
+        # გაზრდილი სიმრავლით: lock-ის რიგი მხოლოდ ერთი დალაგებული გავლით რჩება სწორი
+        barber_ids = {b.barber_id for b in bookings.values()} | set(barber_by_user.values())
+        for _ in range(BULK_LOCK_ATTEMPTS):
+            lock_barber(*barber_ids)
+            bookings = {b.id: b for b in Booking.query.filter(Booking.id.in_(booking_ids)).populate_existing()}
+            moved = {b.barber_id for b in bookings.values()} - barber_ids - {None}
+            if not moved:
+                break
+            db.session.rollback()
+            barber_ids |= moved
+        else:
+            db.session.rollback()
+            return jsonify({'success': False, 'error': 'ჯავშნები პარალელურად იცვლება, სცადეთ თავიდან'}), 409
+
+        # გადაფარვის შემოწმებისთვის საჭირო შუალედი - ერთი query ყველა ბარბერზე
+        ranges = []
+        for _, op in parsed:
+            booking = bookings.get(op['id'])
+            if booking is None:
+                continue
+            if op['action'] == 'reschedule':
+                duration = (booking.end_time - booking.start_time) if booking.end_time and booking.start_time \
+                    else timedelta(minutes=get_service_duration(booking.service_id))
+                op['end'] = op['end'] or op['start'] + duration
+                ranges.append((op['start'], op['end']))
+            elif op['action'] == 'status' and booking.start_time and booking.end_time:
+                ranges.append((booking.start_time, booking.end_time))
+        intervals = BarberIntervals(
+            barber_ids,
+            min((start for start, _ in ranges), default=None),
+            max((end for _, end in ranges), default=None)
+        )
+
+        deleted = set()
+        for index, op in parsed:
+            booking = bookings.get(op['id'])
+            result = {'id': op['id'], 'action': op['action'], 'success': False}
+            results[index] = result
+            if booking is None or op['id'] in deleted:
+                result['error'] = 'ჯავშანი ვერ მოიძებნა'
+                continue
+
+            if op['action'] == 'delete':
+                intervals.discard(booking.barber_id, booking.id)
+                db.session.delete(booking)
+                deleted.add(booking.id)
+
+            elif op['action'] == 'status':
+                restoring = booking.status == 'cancelled' and op['status'] != 'cancelled'
+                if restoring and booking.start_time and booking.end_time:
+                    if intervals.conflicts(booking.barber_id, booking.start_time, booking.end_time, booking.id):
+                        result['error'] = 'დრო დაკავებულია'
+                        continue
+                    intervals.add(booking.barber_id, booking.id, booking.start_time, booking.end_time)
+                elif op['status'] == 'cancelled':
+                    intervals.discard(booking.barber_id, booking.id)
+                booking.status = op['status']
+
+            else:
+                barber_id = booking.barber_id
+                if op['barber_user_id']:
+                    barber_id = barber_by_user.get(op['barber_user_id'])
+                    if barber_id is None:
+                        result['error'] = 'ბარბერი ვერ მოიძებნა'
+                        continue
+                if booking.status != 'cancelled':
+                    if intervals.conflicts(barber_id, op['start'], op['end'], booking.id):
+                        result['error'] = 'დრო დაკავებულია'
+                        continue
+                    intervals.discard(booking.barber_id, booking.id)
+                    intervals.add(barber_id, booking.id, op['start'], op['end'])
+                booking.barber_id = barber_id
+                booking.start_time = op['start']
+                booking.end_time = op['end']
+
+            # თანმიმდევრობით (unit of work-ი UPDATE-ებს DELETE-ებზე ადრე და ID-ით ალაგებს -
+            # ბაზის დაცვა შუალედურ გადაფარვას დაინახავდა); statement-ების რაოდენობა იგივეა
+            db.session.flush()
+            result['success'] = True
+
+        failed = sum(1 for result in results if not result['success'])
+        if atomic and failed:
+            db.session.rollback()
+            for result in results:
+                if result['success']:
+                    result.update(success=False, error='არ შესრულდა (atomic)')
+            return jsonify({'success': False, 'applied': 0, 'failed': len(results), 'results': results}), 409
+
+        db.session.commit()
+        logging.info(f"📦 Bulk update by {current_user.username}: {len(results) - failed} applied, {failed} failed")
+        return jsonify({'success': True, 'applied': len(results) - failed, 'failed': failed, 'results': results})
+
+    except IntegrityError as e:
+        db.session.rollback()
+        if not is_overlap_error(e):
+            return jsonify({'success': False, 'error': str(e)}), 500
+        return jsonify({'success': False, 'error': 'დრო დაკავებულია'}), 409
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"API ERROR (bulk bookings): {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -1,9 +1,14 @@
 # app/routes/main.py
 
 from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
-from app.models import Booking, Service, Barber, User
+from app.models import Booking, BookingTombstone, Service, Barber, User
 from app import db
+from app.bootstrap import build_bootstrap
+from app.catalog import service_catalog
+from app.http_cache import conditional
+from sqlalchemy import func
 from datetime import datetime
+import logging
 import os
 
 main = Blueprint('main', __name__)
@@ -24,6 +29,7 @@ def index():
         return render_template('index.html', services=[], barbers=[])
 
 @main.route('/services')
+@conditional('services')
 def services():
     """სერვისების სრული სია"""
     try:
@@ -32,7 +38,15 @@ def services():
     except Exception:
         return render_template('services.html', services=[])
 
+def bookings_marker():
+    """/barbers-ის სტატისტიკა ჯავშნების რაოდენობაზეა - ჩასმა ცვლის max(id)-ს, წაშლა კი კვალს"""
+    return db.session.query(
+        db.select(func.max(Booking.id)).scalar_subquery(),
+        db.select(func.max(BookingTombstone.id)).scalar_subquery()
+    ).one()
+
 @main.route('/barbers')
+@conditional('barbers', extra=bookings_marker)
 def barbers():
     """ბარბერების სრული სია და სტატისტიკა"""
     try:
@@ -70,8 +84,16 @@ def contact():
 
 @main.route('/booking', methods=['GET', 'POST'])
 def booking():
-    # Booking გვერდი მონაცემებს API-დან იღებს (JS-ით)
-    return render_template('booking.html')
+    # პირველი ეკრანის მონაცემები გვერდშივეა (app/bootstrap.py) - JS-ს დამატებითი მოთხოვნები
+    # აღარ სჭირდება; შეცდომისას booking.js API-დან წამოიღებს
+    try:
+        bootstrap = build_bootstrap()
+    except Exception as e:
+        logging.error(f"Booking bootstrap failed: {str(e)}")
+        db.session.rollback()
+        bootstrap = None
+    services_url = url_for('api.get_services', v=service_catalog.current().version)
+    return render_template('booking.html', services_url=services_url, bootstrap=bootstrap)
 
 @main.route('/booking/success/<int:booking_id>')
 def booking_success(booking_id):
@@ -1,5 +1,8 @@
 const ADMIN_PREFIX = '/madmen-secure-admin-2024';
 let calendar;
+let calendarCursor = null; // delta sync: ბოლო ჩატვირთვის cursor (X-Calendar-Cursor)
+const CALENDAR_SYNC_INTERVAL = 30000;
+let bookingEvents = null; // SSE კავშირი (/api/admin/booking-events)
 const isMobile = () => window.innerWidth < 768;
 
 // 🎨 ბარბერების ფერები
@@ -19,6 +22,7 @@ function getBarberColor(barberId) {
 document.addEventListener('DOMContentLoaded', function() {
     initializeCalendar();
     setupEventListeners();
+    connectBookingEvents();
     
     if (isMobile()) {
         setupMobileGestures();
@@ -227,6 +231,7 @@ function initializeCalendar() {
                     if (!res.ok) {
                         throw new Error(`HTTP ${res.status}: ${res.statusText}`);
                     }
+                    calendarCursor = res.headers.get('X-Calendar-Cursor');
                     return res.json();
                 })
                 .then(data => {
@@ -279,8 +284,11 @@ function initializeCalendar() {
         eventDrop: handleEventDrop,
         eventResize: handleEventResize,
         
-        datesSet: function() {
+        datesSet: function(info) {
             updateGeorgianTitle();
+            if (info.view.type === 'dayGridMonth') {
+                loadOccupancyHeatmap(info.start, info.end);
+            }
         }
     });
     
@@ -297,10 +305,135 @@ function buildEventsUrl(start, end) {
     return url;
 }
 
+// 🔄 Delta sync - მხოლოდ ბოლო cursor-ის შემდეგ შეცვლილი / წაშლილი ჯავშნები
+async function syncCalendar() {
+    if (!calendar) return;
+    if (!calendarCursor) {
+        calendar.refetchEvents();
+        return;
+    }
+    const view = calendar.view;
+    const url = buildEventsUrl(view.activeStart.toISOString(), view.activeEnd.toISOString()) +
+        `&since=${encodeURIComponent(calendarCursor)}`;
+    try {
+        const res = await fetch(url);
+        if (res.status === 410) {
+            // cursor ძალიან ძველია - სრული ჩატვირთვა
+            calendar.refetchEvents();
+            return;
+        }
+        const data = await res.json();
+        if (!data.success) return;
+
+        const source = calendar.getEventSources()[0];
+        data.deleted.forEach(id => {
+            const existing = calendar.getEventById(String(id));
+            if (existing) existing.remove();
+        });
+        data.events.forEach(event => {
+            const existing = calendar.getEventById(String(event.id));
+            if (existing) existing.remove();
+            calendar.addEvent({
+                ...event,
+                resourceId: event.barber_id ? event.barber_id.toString() : null
+            }, source);
+        });
+        calendarCursor = data.cursor;
+    } catch (err) {
+        console.error('Calendar sync error:', err);
+    }
+}
+
+// polling მხოლოდ მაშინ, როცა SSE კავშირი არ არის
+setInterval(() => {
+    const live = bookingEvents && bookingEvents.readyState === EventSource.OPEN;
+    if (!document.hidden && !live) syncCalendar();
+}, CALENDAR_SYNC_INTERVAL);
+
+// 📡 Live განახლებები (SSE) - სხვა მომხმარებლების / ონლაინ ჯავშნები polling-ის გარეშე
+function connectBookingEvents() {
+    if (!window.EventSource) return;
+    bookingEvents = new EventSource('/api/admin/booking-events');
+    // ხელახალი დაკავშირებისას გამოტოვებული ცვლილებები delta sync-ით
+    bookingEvents.addEventListener('open', () => {
+        if (calendarCursor) syncCalendar();
+    });
+    bookingEvents.addEventListener('resync', () => syncCalendar());
+    bookingEvents.addEventListener('booking', e => applyBookingEvent(JSON.parse(e.data)));
+}
+
+function applyBookingEvent(message) {
+    if (!calendar) return;
+    const existing = calendar.getEventById(String(message.id));
+    if (existing) existing.remove();
+
+    const event = message.event;
+    if (!event) {
+        // წაშლილია, სხვა ბარბერთან გადავიდა ან ზედმეტად დიდია - delta sync
+        if (message.type !== 'deleted') syncCalendar();
+        return;
+    }
+
+    const view = calendar.view;
+    const start = new Date(event.start);
+    if (start < view.activeStart || start >= view.activeEnd) return;
+    const filter = document.getElementById('barberFilter');
+    if (filter && filter.value !== 'all' && String(event.barber_id) !== filter.value) return;
+
+    calendar.addEvent({
+        ...event,
+        resourceId: event.barber_id ? event.barber_id.toString() : null
+    }, calendar.getEventSources()[0]);
+
+    if (message.type === 'created') {
+        showNotification(`📅 ახალი ჯავშანი: ${event.title}`, 'info');
+    }
+}
+
+// 🔥 თვის დატვირთვის heatmap (/api/admin/occupancy - ერთი მოთხოვნა მთელ ხილულ შუალედზე)
+function toDateString(date) {
+    const pad = n => String(n).padStart(2, '0');
+    return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}`;
+}
+
+function loadOccupancyHeatmap(start, end) {
+    // FullCalendar-ის end ექსკლუზიურია, API კი ბოლო დღეს მოიცავს
+    const last = new Date(end);
+    last.setDate(last.getDate() - 1);
+    let url = `/api/admin/occupancy?start=${toDateString(start)}&end=${toDateString(last)}`;
+    const filter = document.getElementById('barberFilter');
+    if (filter && filter.value !== 'all') {
+        url += `&barber_id=${filter.value}`;
+    }
+
+    fetch(url)
+        .then(res => res.json())
+        .then(data => {
+            if (!data.success || !data.total) return;
+            data.days.forEach((day, i) => {
+                const cell = document.querySelector(`.fc-daygrid-day[data-date="${day}"]`);
+                if (!cell) return;
+                const booked = data.total.booked[i];
+                const closed = data.total.closed[i];
+                const open = 100 - closed;
+                // ფერი - დაკავებული წილი გახსნილი დროიდან
+                const load = open > 0 ? booked / open : 0;
+                cell.style.backgroundColor = open > 0 ? `rgba(239, 68, 68, ${(load * 0.45).toFixed(2)})` : 'rgba(107, 114, 128, 0.15)';
+                cell.title = open > 0 ? `დატვირთვა: ${Math.round(load * 100)}%` : 'დაკეტილია';
+            });
+        })
+        .catch(err => console.error('Occupancy fetch error:', err));
+}
+
 function setupEventListeners() {
     const filter = document.getElementById('barberFilter');
     if(filter) {
-        filter.addEventListener('change', () => calendar.refetchEvents());
+        filter.addEventListener('change', () => {
+            calendar.refetchEvents();
+            if (calendar.view.type === 'dayGridMonth') {
+                loadOccupancyHeatmap(calendar.view.activeStart, calendar.view.activeEnd);
+            }
+        });
     }
     
     document.querySelectorAll('.modal-overlay').forEach(modal => {
@@ -475,7 +608,7 @@ async function deleteBooking(id) {
         const data = await res.json();
         if(data.success) {
             showNotification('🗑️ წაიშალა', 'success');
-            calendar.refetchEvents();
+            syncCalendar();
             closeAllModals();
         }
     } catch (e) { 
@@ -7,16 +7,48 @@ const bookingState = {
     selectedTime: null,
     customerInfo: {},
     currentMonth: new Date().getMonth(),
-    currentYear: new Date().getFullYear()
+    currentYear: new Date().getFullYear(),
+    monthAvailability: {}
 };
 
+// გვერდში ჩაშენებული პირველი ეკრანი (სერვისები, ბარბერები, უახლოესი ღია დღეები)
+const bootstrap = window.BOOKING_BOOTSTRAP || null;
+const bootstrapLoadedAt = Date.now();
+const BOOTSTRAP_MAX_AGE_MS = 60 * 1000; // ამის შემდეგ სლოტები ისევ API-დან
+
 document.addEventListener('DOMContentLoaded', () => {
-    loadServices();
-    loadBarbers();
+    if (bootstrap) {
+        renderServices(bootstrap.services);
+        renderBarbers(bootstrap.barbers);
+    } else {
+        loadServices();
+        loadBarbers();
+    }
     initializeCalendar();
     setupEventListeners();
 });
 
+// bootstrap-ის ღია დღეები არჩეული სერვისის ხანგრძლივობით და ბარბერით: [{date, slots}]
+function bootstrapDays() {
+    if (!bootstrap || Date.now() - bootstrapLoadedAt > BOOTSTRAP_MAX_AGE_MS) return null;
+    const service = bootstrap.services.find(s => s.id === bookingState.selectedService);
+    if (!service) return null;
+    const byBarber = bootstrap.slots[service.duration] || {};
+    return byBarber[bookingState.selectedBarber] || null;
+}
+
+// კალენდარზე გადასვლისას პირველი ღია დღე უკვე არჩეულია - სლოტები მაშინვე ჩანს
+function preselectFirstOpenDay() {
+    if (bookingState.selectedDate) return;
+    const days = bootstrapDays();
+    if (!days || !days.length) return;
+    const [year, month] = days[0].date.split('-').map(Number);
+    bookingState.selectedDate = days[0].date;
+    bookingState.currentYear = year;
+    bookingState.currentMonth = month - 1;
+    loadTimeSlots();
+}
+
 // Haptic Feedback Helper
 function triggerHaptic() {
     if (navigator.vibrate) navigator.vibrate(10);
@@ -108,6 +140,7 @@ function goToStep(step) {
     
     // თუ კალენდარზე გადავედით, გადავარენდეროთ რომ სქროლი ამუშავდეს
     if (step === 4) {
+        preselectFirstOpenDay();
         setTimeout(renderCalendar, 50); 
     }
     if (step === 5) renderConfirmationSummary();
@@ -115,7 +148,7 @@ function goToStep(step) {
 }
 
 async function loadServices() {
-    try { const res = await fetch('/api/services'); const data = await res.json(); if (data.success) renderServices(data.services); } catch (e) {}
+    try { const res = await fetch(window.SERVICES_URL || '/api/services'); const data = await res.json(); if (data.success) renderServices(data.services); } catch (e) {}
 }
 function renderServices(services) {
     document.getElementById('servicesGrid').innerHTML = services.map(s => `
@@ -133,6 +166,7 @@ function selectService(id) {
     document.querySelector(`[data-service-id="${id}"]`).classList.add('selected');
     bookingState.selectedService = id;
     bookingState.selectedBarber = null; bookingState.selectedDate = null; bookingState.selectedTime = null;
+    bookingState.monthAvailability = {};
     
     // Auto advance logic removed per request, waiting for user to click next or rely on design flow. 
     // But for flow:
@@ -160,6 +194,7 @@ function selectBarber(id) {
     document.querySelectorAll('.barber-card').forEach(el => el.classList.remove('selected'));
     document.querySelector(`[data-barber-id="${id}"]`).classList.add('selected');
     bookingState.selectedBarber = id;
+    bookingState.monthAvailability = {};
     
     const btn = document.getElementById('nextToDateTime');
     if(btn) {
@@ -214,7 +249,7 @@ function renderCalendar() {
         if (isSelected) classes += ' selected';
         
         const onclick = isPast ? '' : `onclick="selectDate('${dateStr}')"`;
-        html += `<div class="${classes}" ${onclick}>
+        html += `<div class="${classes}" data-date="${dateStr}" ${onclick}>
             <span class="text-[10px] uppercase text-gray-500 mb-1 md:hidden font-bold ${isSelected ? 'text-white/80' : ''}">${dayName}</span>
             <span class="text-lg">${day}</span>
         </div>`;
@@ -222,6 +257,7 @@ function renderCalendar() {
     
     const container = document.getElementById('calendarDays');
     container.innerHTML = html;
+    loadMonthAvailability();
 
     // ✅ AUTO-SCROLL LOGIC (მობილურისთვის)
     setTimeout(() => {
@@ -240,6 +276,34 @@ function renderCalendar() {
     }, 100);
 }
 
+// ✅ მთელი თვის ხელმისაწვდომობა ერთი მოთხოვნით - სავსე დღეები ნაცრისფერდება
+async function loadMonthAvailability() {
+    if (!bookingState.selectedBarber) return;
+    const year = bookingState.currentYear;
+    const month = bookingState.currentMonth;
+    const key = `${year}-${month}`;
+    
+    if (!bookingState.monthAvailability[key]) {
+        const pad = n => String(n).padStart(2, '0');
+        const from = `${year}-${pad(month + 1)}-01`;
+        const to = `${year}-${pad(month + 1)}-${pad(new Date(year, month + 1, 0).getDate())}`;
+        try {
+            const res = await fetch(`/api/availability/${bookingState.selectedBarber}?from=${from}&to=${to}&service_id=${bookingState.selectedService}`);
+            const data = await res.json();
+            if (!data.success) return;
+            bookingState.monthAvailability[key] = data.days;
+        } catch (e) { console.error(e); return; }
+    }
+    
+    // თვე შეიძლება უკვე შეიცვალა პასუხის მოლოდინში
+    if (key !== `${bookingState.currentYear}-${bookingState.currentMonth}`) return;
+    bookingState.monthAvailability[key].forEach(day => {
+        if (day.available > 0) return;
+        const el = document.querySelector(`#calendarDays [data-date="${day.date}"]`);
+        if (el) el.classList.add('opacity-30', 'line-through');
+    });
+}
+
 async function selectDate(dateStr) {
     triggerHaptic();
     bookingState.selectedDate = dateStr;
@@ -256,11 +320,14 @@ async function loadTimeSlots() {
     document.getElementById('afternoonSlots').innerHTML = '';
     document.getElementById('eveningSlots').innerHTML = '';
     
+    const cached = (bootstrapDays() || []).find(day => day.date === bookingState.selectedDate);
+    if (cached) { renderTimeSlots(cached.slots); return; }
+    
     try {
         const res = await fetch(`/api/available-slots/${bookingState.selectedBarber}/${bookingState.selectedDate}?service_id=${bookingState.selectedService}`);
         const data = await res.json();
         if (data.success && data.is_working) renderTimeSlots(data.slots);
-        else showNoSlotsMessage(data.message || 'ბარბერი არ მუშაობს');
+        else { showNoSlotsMessage(data.message || 'ბარბერი არ მუშაობს'); suggestNextDates(); }
     } catch (e) { console.error(e); showNoSlotsMessage('შეცდომა'); }
 }
 
@@ -276,7 +343,7 @@ function renderTimeSlots(slots) {
             grid.innerHTML = slots[sec].map(t => `<div class="time-slot bg-[#2a2a2a] border border-[#333] rounded-lg py-3 text-center text-sm font-medium cursor-pointer hover:border-[#B07D4A] transition-all" onclick="selectTime('${t}')">${t}</div>`).join('');
         } else { div.style.display = 'none'; }
     });
-    if (!hasSlots) showNoSlotsMessage('თავისუფალი დრო არ არის');
+    if (!hasSlots) { showNoSlotsMessage('თავისუფალი დრო არ არის'); suggestNextDates(); }
 }
 
 function showNoSlotsMessage(msg) {
@@ -285,6 +352,24 @@ function showNoSlotsMessage(msg) {
     document.getElementById('morningSlots').innerHTML = `<div class="text-gray-400 text-sm col-span-3 text-center py-4 border border-dashed border-gray-700 rounded-lg">${msg}</div>`;
 }
 
+// ✅ არჩეულ დღეს ადგილი არ არის - შემდეგი თავისუფალი დღეები ერთი მოთხოვნით
+async function suggestNextDates() {
+    const dateStr = bookingState.selectedDate;
+    const next = new Date(`${dateStr}T00:00:00`);
+    next.setDate(next.getDate() + 1);
+    const pad = n => String(n).padStart(2, '0');
+    const from = `${next.getFullYear()}-${pad(next.getMonth() + 1)}-${pad(next.getDate())}`;
+    try {
+        const res = await fetch(`/api/availability/${bookingState.selectedBarber}/next?from=${from}&limit=3&service_id=${bookingState.selectedService}`);
+        const data = await res.json();
+        // დღე შეიძლება უკვე შეიცვალა პასუხის მოლოდინში
+        if (!data.success || !data.dates.length || bookingState.selectedDate !== dateStr) return;
+        const buttons = data.dates.map(day => `<button type="button" class="bg-[#2a2a2a] border border-[#333] rounded-lg px-3 py-2 text-sm hover:border-[#B07D4A] transition-all" onclick="selectDate('${day.date}')">${day.date} · ${day.first_slot}</button>`).join('');
+        document.getElementById('morningSlots').insertAdjacentHTML('beforeend',
+            `<div class="col-span-3 text-center py-2"><div class="text-gray-500 text-xs mb-2">უახლოესი თავისუფალი დღეები</div><div class="flex flex-wrap gap-2 justify-center">${buttons}</div></div>`);
+    } catch (e) { console.error(e); }
+}
+
 function selectTime(time) {
     triggerHaptic();
     document.querySelectorAll('.time-slot').forEach(el => el.classList.remove('selected'));
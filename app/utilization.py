@@ -0,0 +1,217 @@
+"""ბარბერების დატვირთვა (utilization): დაჯავშნილი წუთები / სამუშაო წუთები
+
+ბარბერები, გრაფიკები და ჯავშნები იტვირთება 3 query-ით ნებისმიერი
+შუალედისთვის. დღეებზე და ჯავშნებზე ციკლი არ არის - ყველაფერი ინტერვალების
+არითმეტიკაა NumPy-ზე:
+
+    open_before(t)  - სამუშაო წუთები შუალედის დასაწყისიდან t-მდე
+                      (კვირის შაბლონი + შვებულება, დღეების cumsum)
+    ჯავშანი [a, b)  - open_before(b) - open_before(a) წუთი სამუშაო საათებში
+
+დღის საზღვრებზე დაჯავშნილი წუთების ჯამი searchsorted-ით ითვლება, ამიტომ
+შუაღამეზე გადასული ჯავშანიც სწორად ნაწილდება დღეებზე. დღეები კვირებად /
+თვეებად np.add.reduceat-ით ჯამდება.
+"""
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from sqlalchemy import Integer, cast, func
+
+from app import db
+from app.availability import load_active_barbers, load_schedules_by_user, minute_of_day
+from app.models import Booking
+
+GROUPS = ('day', 'week', 'month')
+MAX_UTILIZATION_DAYS = 366
+MINUTES_PER_DAY = 24 * 60
+
+
+def _open_hours(week, vacation, weekdays, day_numbers):
+    """(გახსნის წუთი, სამუშაო წუთების რაოდენობა) თითო დღეზე"""
+    opens = np.zeros(7, dtype=np.int64)
+    lengths = np.zeros(7, dtype=np.int64)
+    for day_of_week, row in week.items():
+        opens[day_of_week] = minute_of_day(row.start_time)
+        lengths[day_of_week] = max(minute_of_day(row.end_time) - opens[day_of_week], 0)
+    day_open = opens[weekdays]
+    day_length = lengths[weekdays]
+    if vacation is not None:
+        day_length[(day_numbers >= vacation[0]) & (day_numbers <= vacation[1])] = 0
+    return day_open, day_length
+
+
+def _open_before(minutes, day_open, day_length, open_cumulative):
+    """სამუშაო წუთები შუალედის დასაწყისიდან minutes-მდე (ვექტორულად)"""
+    days = len(day_length)
+    minutes = np.clip(minutes, 0, days * MINUTES_PER_DAY)
+    day = np.minimum(minutes // MINUTES_PER_DAY, days - 1)
+    offset = minutes - day * MINUTES_PER_DAY
+    return open_cumulative[day] + np.clip(offset - day_open[day], 0, day_length[day])
+
+
+def _minute_offset(column, origin, rounding):
+    """column - origin წუთებში, ბაზაში გამოთვლილი მთელი რიცხვი (Python datetime-ების გარეშე)"""
+    if db.engine.dialect.name == 'postgresql':
+        return cast(rounding(func.extract('epoch', column - origin) / 60), Integer)
+    # SQLite (dev / bench): julianday - დღეები float-ად
+    return cast(func.round((func.julianday(column) - func.julianday(origin)) * MINUTES_PER_DAY), Integer)
+
+
+def _load_busy_minutes(barber_ids, origin, window_end):
+    """ერთი Core query: {barber_id: (starts, ends)} - წუთები origin-დან, გაერთიანებული.
+    ORM ობიექტების და datetime-ების გარეშე (წლიური შუალედი - ათიათასობით სტრიქონი)."""
+    # session-ის connection - იგივე ტრანზაქცია, ORM-ის row loading-ის გარეშე
+    rows = db.session.connection().execute(
+        db.select(
+            Booking.barber_id,
+            _minute_offset(Booking.start_time, origin, func.floor),
+            _minute_offset(Booking.end_time, origin, func.ceil)
+        ).where(
+            Booking.barber_id.in_(barber_ids),
+            Booking.status != 'cancelled',
+            Booking.start_time != None,
+            Booking.start_time < window_end,
+            Booking.end_time > origin
+        ).order_by(Booking.barber_id, Booking.start_time)
+    ).all()
+    if not rows:
+        return {}
+    # Row-ების np.array() ნელია (sequence protocol) - ბრტყელი fromiter
+    flat = np.fromiter((value for row in rows for value in row), dtype=np.int64, count=3 * len(rows))
+    barbers, starts, ends = flat.reshape(-1, 3).T
+
+    busy = {}
+    bounds = np.flatnonzero(np.diff(barbers)) + 1
+    for first, last in zip(np.concatenate(([0], bounds)), np.append(bounds, len(rows))):
+        busy[int(barbers[first])] = _merge(starts[first:last], ends[first:last])
+    return busy
+
+
+def _merge(starts, ends):
+    """start-ით დალაგებული ინტერვალების გაერთიანება ვექტორულად (running max end)"""
+    reach = np.maximum.accumulate(ends)
+    opens_group = np.concatenate(([True], starts[1:] > reach[:-1]))
+    group_starts = np.flatnonzero(opens_group)
+    group_ends = np.append(group_starts[1:], len(starts)) - 1
+    return starts[group_starts], reach[group_ends]
+
+
+def _booked_minutes(busy, day_open, day_length):
+    """სამუშაო საათებში დაჯავშნილი წუთები თითო დღეზე.
+    busy - (starts, ends) დალაგებული, გადაუფარავი ინტერვალები."""
+    days = len(day_length)
+    if busy is None:
+        return np.zeros(days, dtype=np.int64)
+
+    open_cumulative = np.concatenate(([0], np.cumsum(day_length)[:-1]))
+    starts, ends = busy
+    start_open = _open_before(starts, day_open, day_length, open_cumulative)
+    covered = _open_before(ends, day_open, day_length, open_cumulative) - start_open
+    prefix = np.concatenate(([0], np.cumsum(covered)))
+
+    # დაჯავშნილი სამუშაო წუთები თითო დღის საზღვრამდე: დასრულებული ჯავშნები
+    # prefix-იდან + საზღვარზე გადამავალი ჯავშნის ნაწილი
+    boundaries = np.arange(days + 1, dtype=np.int64) * MINUTES_PER_DAY
+    finished = np.searchsorted(ends, boundaries, side='right')
+    booked = prefix[finished]
+    running = finished < len(starts)
+    crossing = np.flatnonzero(running)[starts[finished[running]] < boundaries[running]]
+    booked[crossing] += _open_before(boundaries[crossing], day_open, day_length, open_cumulative) - \
+        start_open[finished[crossing]]
+    return np.diff(booked)
+
+
+def _periods(first_day, days, group):
+    """(პერიოდების დასაწყისი ინდექსები, [(პირველი დღე, ბოლო დღე)])"""
+    day_numbers = np.arange(days)
+    dates = np.datetime64(first_day, 'D') + day_numbers
+    if group == 'week':
+        keys = (day_numbers + first_day.weekday()) // 7
+    elif group == 'month':
+        keys = dates.astype('datetime64[M]').astype(np.int64)
+    else:
+        keys = day_numbers
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    ends = np.append(starts[1:], days) - 1
+    labels = [(str(dates[start]), str(dates[end])) for start, end in zip(starts, ends)]
+    return starts, labels
+
+
+def _percent(booked, scheduled):
+    """პროცენტი 1 ათწილადით; სამუშაო დრო არ არის - None"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.round(booked * 100 / scheduled, 1)
+    return [None if total == 0 else float(value) for value, total in zip(values, scheduled)]
+
+
+def _summary(scheduled, booked):
+    return {
+        'scheduled': scheduled.tolist(),
+        'booked': booked.tolist(),
+        'utilization': _percent(booked, scheduled)
+    }
+
+
+def _overall(scheduled, booked):
+    """მთელი შუალედის ჯამი (სკალარები)"""
+    return {key: values[0] for key, values in
+            _summary(scheduled.sum(keepdims=True), booked.sum(keepdims=True)).items()}
+
+
+def build_utilization(first_day, last_day, user_ids=None, group='day'):
+    """[first_day, last_day] შუალედის დატვირთვა წუთებში, group-ის (day/week/month) პერიოდებით.
+
+    barbers - თითო ბარბერზე scheduled/booked/utilization (პერიოდების სიები) და overall,
+    total - ყველა ბარბერის ჯამი პერიოდებზე და მთელ შუალედზე (overall).
+    დაჯავშნილად ითვლება მხოლოდ სამუშაო საათებში მოხვედრილი არა-გაუქმებული დრო.
+    """
+    days = (last_day - first_day).days + 1
+    starts, labels = _periods(first_day, days, group)
+    result = {
+        'start': first_day.isoformat(),
+        'end': last_day.isoformat(),
+        'group': group,
+        'periods': [{'start': start, 'end': end} for start, end in labels],
+        'barbers': [],
+        'total': None
+    }
+
+    user_barbers = load_active_barbers(user_ids)
+    if not user_barbers:
+        return result
+    schedules = load_schedules_by_user([user.id for user, _ in user_barbers])
+    origin = datetime.combine(first_day, time.min)
+    busy = _load_busy_minutes(
+        [barber.id for _, barber in user_barbers],
+        origin,
+        origin + timedelta(days=days)
+    )
+
+    day_numbers = np.arange(days)
+    weekdays = (first_day.weekday() + day_numbers) % 7
+
+    scheduled_total = np.zeros(len(starts), dtype=np.int64)
+    booked_total = np.zeros(len(starts), dtype=np.int64)
+    for user, barber in user_barbers:
+        vacation = None
+        if barber.vacation_start and barber.vacation_end:
+            vacation = ((barber.vacation_start - first_day).days, (barber.vacation_end - first_day).days)
+        day_open, day_length = _open_hours(schedules.get(user.id, {}), vacation, weekdays, day_numbers)
+        booked_daily = _booked_minutes(busy.get(barber.id), day_open, day_length)
+
+        scheduled = np.add.reduceat(day_length, starts)
+        booked = np.add.reduceat(booked_daily, starts)
+        scheduled_total += scheduled
+        booked_total += booked
+        result['barbers'].append({
+            'id': user.id,
+            'name': barber.name or user.username,
+            **_summary(scheduled, booked),
+            'overall': _overall(scheduled, booked)
+        })
+
+    result['total'] = {
+        **_summary(scheduled_total, booked_total),
+        'overall': _overall(scheduled_total, booked_total)
+    }
+    return result
@@ -30,6 +30,20 @@ class Config:
     # WTF CSRF Protection
     WTF_CSRF_ENABLED = True
     WTF_CSRF_TIME_LIMIT = None
+    # Availability Cache (ბარბერი, დღე, ხანგრძლივობა)
+    AVAILABILITY_CACHE_SIZE = int(os.environ.get('AVAILABILITY_CACHE_SIZE') or 2048)
+    AVAILABILITY_CACHE_TTL = int(os.environ.get('AVAILABILITY_CACHE_TTL') or 60)  # წამი
+    # Dashboard Cache (სტატისტიკა თითო ბარბერზე / ყველასთვის)
+    DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL') or 10)  # წამი
+    # საჯარო კატალოგის Cache (ბარბერების ცნობარი; ვერსიით უქმდება, TTL - ფოტოს ფაილებისთვის)
+    CATALOG_CACHE_TTL = int(os.environ.get('CATALOG_CACHE_TTL') or 300)  # წამი
+    # სერვისების snapshot: რამდენ წამში ერთხელ შემოწმდეს ვერსია ბაზაში (სხვა worker-ის ცვლილებები)
+    SERVICE_CATALOG_TTL = int(os.environ.get('SERVICE_CATALOG_TTL') or 5)
+    # Booking Events (SSE): 'local' - ერთი პროცესი, 'postgres' - რამდენიმე worker (LISTEN/NOTIFY)
+    BOOKING_EVENTS_BACKEND = os.environ.get('BOOKING_EVENTS_BACKEND') or 'local'
+    # საჯარო კატალოგის Cache-Control max-age (წამი); 0 - ბრაუზერი ყოველთვის ETag-ით ამოწმებს
+    HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE') or 0)
+    
     # File Upload Settings
     UPLOAD_FOLDER = os.path.join('app', 'static', 'uploads', 'avatars')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB მაქსიმუმი
@@ -0,0 +1,82 @@
+"""Add booking overlap guard
+
+Revision ID: 3c9f1d7a2b64
+Revises: 883ed8c92e4e
+Create Date: 2026-10-17 12:40:08.551230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9f1d7a2b64'
+down_revision = '883ed8c92e4e'
+branch_labels = None
+depends_on = None
+
+
+OVERLAPS = sa.text("""
+    SELECT a.id, b.id FROM bookings a
+    JOIN bookings b ON a.barber_id = b.barber_id AND a.id < b.id
+    WHERE a.status <> 'cancelled' AND b.status <> 'cancelled'
+      AND a.start_time < b.end_time AND a.end_time > b.start_time
+    LIMIT 20
+""")
+
+
+PG_GUARD = """
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+ALTER TABLE bookings ADD CONSTRAINT bookings_no_overlap
+    EXCLUDE USING gist (barber_id WITH =, tsrange(start_time, end_time) WITH &&)
+    WHERE (status <> 'cancelled')
+"""
+
+SQLITE_INSERT_GUARD = """
+CREATE TRIGGER bookings_no_overlap_insert BEFORE INSERT ON bookings
+WHEN NEW.status IS NOT 'cancelled' AND NEW.start_time IS NOT NULL
+BEGIN
+    SELECT RAISE(ABORT, 'bookings_no_overlap') WHERE EXISTS (
+        SELECT 1 FROM bookings
+        WHERE barber_id = NEW.barber_id AND status IS NOT 'cancelled'
+          AND start_time < NEW.end_time AND end_time > NEW.start_time
+    );
+END
+"""
+
+SQLITE_UPDATE_GUARD = """
+CREATE TRIGGER bookings_no_overlap_update BEFORE UPDATE OF barber_id, start_time, end_time, status ON bookings
+WHEN NEW.status IS NOT 'cancelled' AND NEW.start_time IS NOT NULL
+BEGIN
+    SELECT RAISE(ABORT, 'bookings_no_overlap') WHERE EXISTS (
+        SELECT 1 FROM bookings
+        WHERE barber_id = NEW.barber_id AND id != NEW.id AND status IS NOT 'cancelled'
+          AND start_time < NEW.end_time AND end_time > NEW.start_time
+    );
+END
+"""
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # არსებული ორმაგი ჯავშნები constraint-ს ჩააგდებს - ჯერ ხელით უნდა გასწორდეს
+    overlaps = bind.execute(OVERLAPS).fetchall()
+    if overlaps:
+        pairs = ', '.join(f'{a}/{b}' for a, b in overlaps)
+        raise RuntimeError(f'Overlapping bookings must be resolved before this migration: {pairs}')
+
+    if bind.dialect.name == 'postgresql':
+        op.execute(PG_GUARD)
+    elif bind.dialect.name == 'sqlite':
+        op.execute(SQLITE_INSERT_GUARD)
+        op.execute(SQLITE_UPDATE_GUARD)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute('ALTER TABLE bookings DROP CONSTRAINT IF EXISTS bookings_no_overlap')
+    elif bind.dialect.name == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS bookings_no_overlap_insert')
+        op.execute('DROP TRIGGER IF EXISTS bookings_no_overlap_update')
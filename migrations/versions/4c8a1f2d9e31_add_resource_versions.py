@@ -0,0 +1,36 @@
+"""Add resource versions for HTTP caching
+
+Revision ID: 4c8a1f2d9e31
+Revises: 9b1f3e6c5d27
+Create Date: 2026-10-17 18:05:12.604117
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c8a1f2d9e31'
+down_revision = '9b1f3e6c5d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    resource_versions = op.create_table('resource_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # წინასწარ ჩაწერილი სტრიქონები - ვერსიის ზრდა მხოლოდ UPDATE-ია
+    op.bulk_insert(resource_versions, [
+        {'name': 'services', 'version': 1, 'updated_at': datetime.utcnow()},
+        {'name': 'barbers', 'version': 1, 'updated_at': datetime.utcnow()}
+    ])
+
+
+def downgrade():
+    op.drop_table('resource_versions')
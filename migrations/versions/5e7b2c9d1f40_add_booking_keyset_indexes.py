@@ -0,0 +1,31 @@
+"""Add booking keyset pagination indexes
+
+Revision ID: 5e7b2c9d1f40
+Revises: 4c8a1f2d9e31
+Create Date: 2026-10-17 19:12:40.331857
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e7b2c9d1f40'
+down_revision = '4c8a1f2d9e31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (start_time, id) ცვლის (start_time)-ს - keyset-ის თანაბარი start_time-ებიც ინდექსით ლაგდება
+    op.create_index('ix_bookings_start_id', 'bookings', ['start_time', 'id'], unique=False)
+    op.drop_index('ix_bookings_start_time', table_name='bookings')
+    op.create_index('ix_bookings_status_start_id', 'bookings', ['status', 'start_time', 'id'], unique=False)
+    op.create_index('ix_bookings_barber_start_id', 'bookings', ['barber_id', 'start_time', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_bookings_barber_start_id', table_name='bookings')
+    op.drop_index('ix_bookings_status_start_id', table_name='bookings')
+    op.create_index('ix_bookings_start_time', 'bookings', ['start_time'], unique=False)
+    op.drop_index('ix_bookings_start_id', table_name='bookings')
@@ -0,0 +1,74 @@
+"""Add booking query indexes
+
+Revision ID: 7d2e4b1c9a08
+Revises: 3c9f1d7a2b64
+Create Date: 2026-10-17 14:05:31.208114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2e4b1c9a08'
+down_revision = '3c9f1d7a2b64'
+branch_labels = None
+depends_on = None
+
+
+ACTIVE_BOOKING = sa.text("status <> 'cancelled'")
+PENDING_BOOKING = sa.text("status = 'pending'")
+
+# SQLite trigger-ები "status <> 'cancelled'"-ით, რომ ix_bookings_barber_active გამოიყენონ
+# ("IS NOT" პირობას partial index ვერ ემთხვევა და ყოველი ჩაწერა მთელ ცხრილს კითხულობს)
+SQLITE_TRIGGERS = """
+CREATE TRIGGER bookings_no_overlap_insert BEFORE INSERT ON bookings
+WHEN NEW.status IS NOT 'cancelled' AND NEW.start_time IS NOT NULL
+BEGIN
+    SELECT RAISE(ABORT, 'bookings_no_overlap') WHERE EXISTS (
+        SELECT 1 FROM bookings
+        WHERE barber_id = NEW.barber_id AND status {op} 'cancelled'
+          AND start_time < NEW.end_time AND end_time > NEW.start_time
+    );
+END
+;;
+CREATE TRIGGER bookings_no_overlap_update BEFORE UPDATE OF barber_id, start_time, end_time, status ON bookings
+WHEN NEW.status IS NOT 'cancelled' AND NEW.start_time IS NOT NULL
+BEGIN
+    SELECT RAISE(ABORT, 'bookings_no_overlap') WHERE EXISTS (
+        SELECT 1 FROM bookings
+        WHERE barber_id = NEW.barber_id AND id != NEW.id AND status {op} 'cancelled'
+          AND start_time < NEW.end_time AND end_time > NEW.start_time
+    );
+END
+"""
+
+
+def _replace_sqlite_triggers(op_sql):
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute('DROP TRIGGER IF EXISTS bookings_no_overlap_insert')
+    op.execute('DROP TRIGGER IF EXISTS bookings_no_overlap_update')
+    for statement in SQLITE_TRIGGERS.format(op=op_sql).split(';;'):
+        op.execute(statement)
+
+
+def upgrade():
+    # გადაფარვის შემოწმება / დაკავებული ინტერვალები - მხოლოდ არა-გაუქმებული ჯავშნები
+    op.create_index('ix_bookings_barber_active', 'bookings', ['barber_id', 'start_time', 'end_time'],
+                    postgresql_where=ACTIVE_BOOKING, sqlite_where=ACTIVE_BOOKING)
+    op.create_index('ix_bookings_pending', 'bookings', ['barber_id'],
+                    postgresql_where=PENDING_BOOKING, sqlite_where=PENDING_BOOKING)
+    op.create_index('ix_bookings_client_start', 'bookings', ['client_id', sa.text('start_time DESC')])
+    op.create_index('ix_bookings_start_time', 'bookings', ['start_time'])
+    op.create_index('ix_barber_schedules_barber_day', 'barber_schedules', ['barber_id', 'day_of_week'])
+    _replace_sqlite_triggers('<>')
+
+
+def downgrade():
+    _replace_sqlite_triggers('IS NOT')
+    op.drop_index('ix_barber_schedules_barber_day', table_name='barber_schedules')
+    op.drop_index('ix_bookings_start_time', table_name='bookings')
+    op.drop_index('ix_bookings_client_start', table_name='bookings')
+    op.drop_index('ix_bookings_pending', table_name='bookings')
+    op.drop_index('ix_bookings_barber_active', table_name='bookings')
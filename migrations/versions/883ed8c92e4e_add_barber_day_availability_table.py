@@ -0,0 +1,38 @@
+"""Add barber_day_availability table
+
+Revision ID: 883ed8c92e4e
+Revises: 61e31c96b3df
+Create Date: 2026-10-17 10:12:31.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '883ed8c92e4e'
+down_revision = '61e31c96b3df'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('barber_day_availability',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('barber_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('is_working', sa.Boolean(), nullable=False),
+    sa.Column('reason', sa.String(length=20), nullable=True),
+    sa.Column('open_minute', sa.Integer(), nullable=True),
+    sa.Column('close_minute', sa.Integer(), nullable=True),
+    sa.Column('free_intervals', sa.JSON(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['barber_id'], ['barbers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('barber_id', 'day', name='uq_barber_day_availability')
+    )
+    # ცხრილი ცარიელია - შესავსებად: flask availability rebuild
+
+
+def downgrade():
+    op.drop_table('barber_day_availability')
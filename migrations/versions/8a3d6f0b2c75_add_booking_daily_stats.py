@@ -0,0 +1,42 @@
+"""Add booking daily stats rollup
+
+Revision ID: 8a3d6f0b2c75
+Revises: 5e7b2c9d1f40
+Create Date: 2026-10-17 20:31:08.114529
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a3d6f0b2c75'
+down_revision = '5e7b2c9d1f40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('booking_daily_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('barber_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('service_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('bookings', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'barber_id', 'service_id', 'status')
+    )
+
+    # არსებული ჯავშნებიდან (იგივე დაჯგუფება, რაც app/daily_stats.py-ში)
+    op.execute("""
+        INSERT INTO booking_daily_stats (day, barber_id, service_id, status, bookings, revenue)
+        SELECT date(start_time), COALESCE(barber_id, 0), service_id, COALESCE(status, 'pending'),
+               COUNT(id), COALESCE(SUM(price), 0.0)
+        FROM bookings
+        WHERE start_time IS NOT NULL
+        GROUP BY date(start_time), COALESCE(barber_id, 0), service_id, COALESCE(status, 'pending')
+    """)
+
+
+def downgrade():
+    op.drop_table('booking_daily_stats')
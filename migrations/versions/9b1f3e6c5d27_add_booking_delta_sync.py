@@ -0,0 +1,39 @@
+"""Add booking delta sync
+
+Revision ID: 9b1f3e6c5d27
+Revises: 7d2e4b1c9a08
+Create Date: 2026-10-17 16:22:47.918305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1f3e6c5d27'
+down_revision = '7d2e4b1c9a08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('booking_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('booking_id', sa.Integer(), nullable=False),
+    sa.Column('barber_id', sa.Integer(), nullable=True),
+    sa.Column('start_time', sa.DateTime(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_booking_tombstones_deleted_at', 'booking_tombstones', ['deleted_at'], unique=False)
+
+    # ძველ ჩანაწერებს updated_at შეიძლება არ ჰქონდეთ - cursor-ისთვის აუცილებელია
+    op.execute('UPDATE bookings SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL')
+    op.create_index('ix_bookings_updated_at', 'bookings', ['updated_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_bookings_updated_at', table_name='bookings')
+    op.drop_index('ix_booking_tombstones_deleted_at', table_name='booking_tombstones')
+
+    op.drop_table('booking_tombstones')
@@ -0,0 +1,38 @@
+"""Sync barber profile names with users
+
+Revision ID: b6e1d4a8c352
+Revises: 8a3d6f0b2c75
+Create Date: 2026-10-17 22:05:41.380217
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1d4a8c352'
+down_revision = '8a3d6f0b2c75'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # /api/barbers სახელს წაკითხვისას აღარ ასწორებს - ძველი შეუსაბამობები ერთხელ
+    # (იგივე წესი, რაც User.get_full_name-ში)
+    op.execute("""
+        UPDATE barbers SET name = (
+            SELECT CASE
+                WHEN users.first_name IS NOT NULL AND users.first_name <> ''
+                     AND users.last_name IS NOT NULL AND users.last_name <> ''
+                THEN users.first_name || ' ' || users.last_name
+                ELSE users.username
+            END
+            FROM users WHERE users.id = barbers.user_id
+        )
+        WHERE user_id IS NOT NULL
+    """)
+
+
+def downgrade():
+    # მონაცემების სინქრონიზაცია - დასაბრუნებელი არაფერია
+    pass
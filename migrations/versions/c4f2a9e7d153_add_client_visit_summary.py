@@ -0,0 +1,65 @@
+"""Add client visit summary columns
+
+Revision ID: c4f2a9e7d153
+Revises: b6e1d4a8c352
+Create Date: 2026-10-17 23:12:47.530914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f2a9e7d153'
+down_revision = 'b6e1d4a8c352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('clients', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('visit_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('no_show_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('last_visit_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('last_barber_name', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('last_service_name', sa.String(length=100), nullable=True))
+
+    # არსებული ჯავშნებიდან (იგივე წესი, რაც app/client_summary.py-ში)
+    op.execute("""
+        UPDATE clients SET
+            visit_count = (
+                SELECT COUNT(b.id) FROM bookings b
+                WHERE b.client_id = clients.id AND b.start_time IS NOT NULL
+                  AND b.status NOT IN ('cancelled', 'no-show')
+            ),
+            no_show_count = (
+                SELECT COUNT(b.id) FROM bookings b
+                WHERE b.client_id = clients.id AND b.status = 'no-show'
+            ),
+            last_visit_at = (
+                SELECT MAX(b.start_time) FROM bookings b
+                WHERE b.client_id = clients.id AND b.start_time IS NOT NULL
+                  AND b.status NOT IN ('cancelled', 'no-show')
+            ),
+            last_barber_name = (
+                SELECT barbers.name FROM bookings b JOIN barbers ON barbers.id = b.barber_id
+                WHERE b.client_id = clients.id AND b.start_time IS NOT NULL
+                  AND b.status NOT IN ('cancelled', 'no-show')
+                ORDER BY b.start_time DESC, b.id DESC LIMIT 1
+            ),
+            last_service_name = (
+                SELECT services.name FROM bookings b JOIN services ON services.id = b.service_id
+                WHERE b.client_id = clients.id AND b.start_time IS NOT NULL
+                  AND b.status NOT IN ('cancelled', 'no-show')
+                ORDER BY b.start_time DESC, b.id DESC LIMIT 1
+            )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('clients', schema=None) as batch_op:
+        batch_op.drop_column('last_service_name')
+        batch_op.drop_column('last_barber_name')
+        batch_op.drop_column('last_visit_at')
+        batch_op.drop_column('no_show_count')
+        batch_op.drop_column('visit_count')
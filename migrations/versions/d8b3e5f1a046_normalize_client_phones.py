@@ -0,0 +1,203 @@
+"""Normalize client phones to E.164 and merge duplicates
+
+Revision ID: d8b3e5f1a046
+Revises: c4f2a9e7d153
+Create Date: 2026-10-17 23:58:19.204617
+
+"""
+from collections import defaultdict
+from datetime import datetime
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b3e5f1a046'
+down_revision = 'c4f2a9e7d153'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# app/phones.py-ის წესები მიგრაციის დროინდელი სახით (მიგრაცია აპის კოდს არ იყენებს)
+COUNTRY_CODE = '995'
+NATIONAL_NUMBER_LENGTH = 9
+_SEPARATORS = re.compile(r'[\s\-().]')
+_DIGITS = re.compile(r'[0-9]+')
+
+clients = sa.table(
+    'clients',
+    sa.column('id', sa.Integer),
+    sa.column('phone', sa.String),
+    sa.column('email', sa.String),
+    sa.column('notes', sa.Text),
+    sa.column('is_blocked', sa.Boolean)
+)
+bookings = sa.table(
+    'bookings',
+    sa.column('id', sa.Integer),
+    sa.column('client_id', sa.Integer),
+    sa.column('customer_phone', sa.String),
+    sa.column('client_phone', sa.String),
+    sa.column('updated_at', sa.DateTime)
+)
+
+# შეჯამება შეხებული კლიენტებისთვის (იგივე წესი, რაც c4f2a9e7d153-ში)
+REFRESH_SUMMARY = sa.text("""
+    UPDATE clients SET
+        visit_count = (
+            SELECT COUNT(b.id) FROM bookings b
+            WHERE b.client_id = clients.id AND b.start_time IS NOT NULL
+              AND b.status NOT IN ('cancelled', 'no-show')
+        ),
+        no_show_count = (
+            SELECT COUNT(b.id) FROM bookings b
+            WHERE b.client_id = clients.id AND b.status = 'no-show'
+        ),
+        last_visit_at = (
+            SELECT MAX(b.start_time) FROM bookings b
+            WHERE b.client_id = clients.id AND b.start_time IS NOT NULL
+              AND b.status NOT IN ('cancelled', 'no-show')
+        ),
+        last_barber_name = (
+            SELECT barbers.name FROM bookings b JOIN barbers ON barbers.id = b.barber_id
+            WHERE b.client_id = clients.id AND b.start_time IS NOT NULL
+              AND b.status NOT IN ('cancelled', 'no-show')
+            ORDER BY b.start_time DESC, b.id DESC LIMIT 1
+        ),
+        last_service_name = (
+            SELECT services.name FROM bookings b JOIN services ON services.id = b.service_id
+            WHERE b.client_id = clients.id AND b.start_time IS NOT NULL
+              AND b.status NOT IN ('cancelled', 'no-show')
+            ORDER BY b.start_time DESC, b.id DESC LIMIT 1
+        )
+    WHERE id IN :ids
+""").bindparams(sa.bindparam('ids', expanding=True))
+
+
+def normalize(raw):
+    """raw -> '+<ქვეყნის კოდი><ნომერი>' ან None"""
+    phone = _SEPARATORS.sub('', raw or '')
+    if phone.startswith('+'):
+        digits = phone[1:]
+    elif phone.startswith('00'):
+        digits = phone[2:]
+    elif len(phone) == len(COUNTRY_CODE) + NATIONAL_NUMBER_LENGTH and phone.startswith(COUNTRY_CODE):
+        digits = phone
+    elif len(phone) == NATIONAL_NUMBER_LENGTH + 1 and phone.startswith('0'):
+        digits = COUNTRY_CODE + phone[1:]
+    elif len(phone) == NATIONAL_NUMBER_LENGTH:
+        digits = COUNTRY_CODE + phone
+    else:
+        return None
+
+    if not _DIGITS.fullmatch(digits) or digits.startswith('0') or not 8 <= len(digits) <= 15:
+        return None
+    if digits.startswith(COUNTRY_CODE) and len(digits) != len(COUNTRY_CODE) + NATIONAL_NUMBER_LENGTH:
+        return None
+    return '+' + digits
+
+
+def batches(connection, table, *columns):
+    """ცხრილის სტრიქონები id-ის keyset ბლოკებად"""
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, *columns).where(table.c.id > last_id)
+            .order_by(table.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def chunks(items):
+    for start in range(0, len(items), BATCH_SIZE):
+        yield items[start:start + BATCH_SIZE]
+
+
+def merge(connection, survivor_id, duplicate_ids, now):
+    """დუბლიკატების ჯავშნები -> survivor; email / შენიშვნები / დაბლოკვა ერთიანდება"""
+    rows = connection.execute(
+        sa.select(clients.c.email, clients.c.notes, clients.c.is_blocked)
+        .where(clients.c.id.in_([survivor_id, *duplicate_ids])).order_by(clients.c.id)
+    ).all()
+    notes = [row.notes.strip() for row in rows if row.notes and row.notes.strip()]
+
+    connection.execute(bookings.update().where(bookings.c.client_id.in_(duplicate_ids))
+                       .values(client_id=survivor_id, updated_at=now))
+    connection.execute(clients.delete().where(clients.c.id.in_(duplicate_ids)))
+    connection.execute(clients.update().where(clients.c.id == survivor_id).values(
+        email=next((row.email for row in rows if row.email), None),
+        notes='\n'.join(dict.fromkeys(notes)) or None,
+        is_blocked=any(row.is_blocked for row in rows)
+    ))
+
+
+def upgrade():
+    # იგივე ნაბიჯები, რაც app/clients.py normalize_and_merge-ში:
+    # ერთ ნომერზე გადასული კლიენტები ერთიანდება ნომრის გადაწერამდე (unique ინდექსი)
+    connection = op.get_bind()
+    now = datetime.utcnow()  # delta sync-მა შეცვლილი ჯავშნები უნდა დაინახოს
+
+    groups = defaultdict(list)
+    renamed = {}
+    for rows in batches(connection, clients, clients.c.phone):
+        for client_id, phone in rows:
+            canonical = normalize(phone)
+            if canonical is None:
+                continue
+            groups[canonical].append(client_id)
+            if phone != canonical:
+                renamed[client_id] = canonical
+
+    touched = set()
+    for ids in groups.values():
+        if len(ids) > 1:
+            merge(connection, ids[0], ids[1:], now)
+            touched.add(ids[0])
+            for duplicate_id in ids[1:]:
+                renamed.pop(duplicate_id, None)
+    owners = {canonical: ids[0] for canonical, ids in groups.items()}
+
+    update_client = clients.update().where(clients.c.id == sa.bindparam('_id'))\
+        .values(phone=sa.bindparam('_phone'))
+    for chunk in chunks([{'_id': client_id, '_phone': phone} for client_id, phone in renamed.items()]):
+        connection.execute(update_client, chunk)
+
+    update_booking = bookings.update().where(bookings.c.id == sa.bindparam('_id')).values(
+        client_id=sa.bindparam('_client_id'),
+        customer_phone=sa.bindparam('_customer_phone'),
+        client_phone=sa.bindparam('_client_phone'),
+        updated_at=now
+    )
+    for rows in batches(connection, bookings, bookings.c.client_id,
+                        bookings.c.customer_phone, bookings.c.client_phone):
+        updates = []
+        for booking_id, client_id, customer_phone, client_phone in rows:
+            canonical = normalize(customer_phone)
+            values = {
+                '_id': booking_id,
+                '_client_id': client_id,
+                '_customer_phone': canonical or customer_phone,
+                '_client_phone': normalize(client_phone) or client_phone
+            }
+            if client_id is None and owners.get(canonical):
+                values['_client_id'] = owners[canonical]
+                touched.add(owners[canonical])
+            if (values['_client_id'], values['_customer_phone'], values['_client_phone']) != \
+                    (client_id, customer_phone, client_phone):
+                updates.append(values)
+        if updates:
+            connection.execute(update_booking, updates)
+
+    for chunk in chunks(sorted(touched)):
+        connection.execute(REFRESH_SUMMARY, {'ids': chunk})
+
+
+def downgrade():
+    # მონაცემების ნორმალიზაცია / გაერთიანება - დასაბრუნებელი არაფერია
+    pass
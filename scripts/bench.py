@@ -0,0 +1,269 @@
+"""ცხელი endpoint-ების benchmark seed-ით შევსებულ ბაზაზე
+
+გამოყენება (მხოლოდ ცალკე, სატესტო ბაზაზე - ცხრილები ყოველ scale-ზე თავიდან იქმნება!):
+    python scripts/bench.py --database-url postgresql://.../madmen_bench
+    python scripts/bench.py --database-url sqlite:////tmp/bench.db --scales b10-10k --iterations 20
+
+შედეგი JSON ფაილშია (ნაგულისხმევად bench-<commit>.json), რომ სხვადასხვა
+commit-ის გაშვებები ერთმანეთს შევადაროთ: latency პერცენტილები (ms) და
+SQL query-ების რაოდენობა თითო მოთხოვნაზე.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time as timer
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.seed import SLOT_MINUTES, SLOTS_PER_DAY, seed_database
+
+SCALES = {
+    'b10-10k': {'barbers': 10, 'bookings': 10_000, 'clients': 100_000},
+    'b50-10k': {'barbers': 50, 'bookings': 10_000, 'clients': 100_000},
+    'b10-1m': {'barbers': 10, 'bookings': 1_000_000, 'clients': 100_000},
+    'b50-1m': {'barbers': 50, 'bookings': 1_000_000, 'clients': 100_000},
+}
+DEFAULT_SCALES = 'b10-10k,b50-10k'
+PERCENTILES = (50, 90, 95, 99)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def percentile(sorted_values, q):
+    """nearest-rank პერცენტილი"""
+    index = max(0, math.ceil(q / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(latencies, queries, statuses):
+    latencies = sorted(latencies)
+    result = {'iterations': len(latencies)}
+    for q in PERCENTILES:
+        result[f'p{q}_ms'] = round(percentile(latencies, q), 3)
+    result.update({
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'max_ms': round(latencies[-1], 3),
+        'queries_mean': round(sum(queries) / len(queries), 2),
+        'queries_max': max(queries),
+        'status': {str(code): count for code, count in sorted(statuses.items())}
+    })
+    return result
+
+
+def clear_caches():
+    """პროცესის შიდა cache-ები - ცივი გაზომვისთვის ყოველი მოთხოვნის წინ"""
+    from app.availability import availability_cache
+    from app.catalog import directory_cache, service_catalog
+    from app.dashboard import dashboard_cache
+    availability_cache.clear()
+    directory_cache.clear()
+    service_catalog.invalidate()
+    dashboard_cache.clear()
+
+
+def endpoints(app, seeded, rng):
+    """(სახელი, ფუნქცია(client) -> response) - პარამეტრები ყოველ გამოძახებაზე იცვლება"""
+    from flask import url_for
+
+    with app.test_request_context():
+        dashboard_url = url_for('admin.dashboard')
+        statistics_url = url_for('admin.statistics')
+        clients_url = url_for('admin.clients')
+
+    def random_day(days=14):
+        return date.today() + timedelta(days=rng.randint(1, days))
+
+    def available_slots(client):
+        user_id = rng.choice(seeded.user_ids)
+        service_id = rng.choice(seeded.service_ids)
+        return client.get(f'/api/available-slots/{user_id}/{random_day()}?service_id={service_id}')
+
+    def next_open_days(client):
+        user_id = rng.choice(seeded.user_ids)
+        service_id = rng.choice(seeded.service_ids)
+        return client.get(f'/api/availability/{user_id}/next?from={random_day()}&limit=5&service_id={service_id}')
+
+    def create_booking(client):
+        slot = rng.randrange(SLOTS_PER_DAY)
+        start = datetime.combine(random_day(), datetime.min.time()) + timedelta(
+            hours=10, minutes=SLOT_MINUTES * slot)
+        return client.post('/api/bookings/create', json={
+            'service_id': seeded.service_ids[0],
+            'barber_id': rng.choice(seeded.user_ids),
+            'date': start.strftime('%Y-%m-%d'),
+            'time': start.strftime('%H:%M'),
+            'customer_name': 'Bench Client',
+            'customer_phone': f'59{rng.randrange(10 ** 7):07d}'
+        })
+
+    def all_bookings(client):
+        first = date.today() + timedelta(days=rng.randint(-30, 7))
+        last = first + timedelta(days=7)
+        return client.get(f'/api/admin/all-bookings?start={first}T00:00:00&end={last}T00:00:00')
+
+    def utilization(client):
+        last = date.today() + timedelta(days=rng.randint(0, 30))
+        group = rng.choice(('day', 'week', 'month'))
+        return client.get(f'/api/admin/utilization?start={last - timedelta(days=364)}&end={last}&group={group}')
+
+    def lookup_client(client):
+        return client.post('/api/clients/lookup', json={'phone': rng.choice(seeded.phones)})
+
+    return [
+        ('api.barbers', lambda client: client.get('/api/barbers')),
+        ('api.booking_bootstrap', lambda client: client.get('/api/booking/bootstrap')),
+        ('api.available_slots', available_slots),
+        ('api.next_open_days', next_open_days),
+        ('api.create_booking', create_booking),
+        ('api.admin_all_bookings', all_bookings),
+        ('api.admin_utilization', utilization),
+        ('api.lookup_client', lookup_client),
+        ('admin.dashboard', lambda client: client.get(dashboard_url)),
+        ('admin.statistics', lambda client: client.get(statistics_url)),
+        ('admin.clients', lambda client: client.get(clients_url)),
+    ]
+
+
+def run_scale(app, db, name, scale, args):
+    from sqlalchemy import event
+    from app.availability import rebuild_materialized
+    from app.client_summary import rebuild as rebuild_client_summary
+    from app.daily_stats import rebuild as rebuild_daily_stats
+
+    rng = random.Random(args.seed)
+    print(f'== {name}: {scale}')
+
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    started = timer.perf_counter()
+    seeded = seed_database(db, scale['barbers'], scale['clients'], scale['bookings'], rng)
+    materialized = rebuild_materialized()
+    rebuild_daily_stats()  # seed Core insert-ებით წერს - rollup ცალკე იგება
+    rebuild_client_summary()
+    if db.engine.dialect.name == 'postgresql':
+        with db.engine.connect() as conn:
+            conn.execution_options(isolation_level='AUTOCOMMIT').exec_driver_sql('VACUUM ANALYZE')
+    seed_seconds = round(timer.perf_counter() - started, 2)
+    print(f'   seeded in {seed_seconds}s')
+
+    query_count = [0]
+
+    def count_query(*_):
+        query_count[0] += 1
+
+    event.listen(db.engine, 'before_cursor_execute', count_query)
+    results = {}
+    try:
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(seeded.admin_id)
+            session['_fresh'] = True
+
+        for endpoint, call in endpoints(app, seeded, rng):
+            if args.endpoints and endpoint not in args.endpoints:
+                continue
+            latencies, queries, statuses = [], [], Counter()
+            spent = 0.0
+            for i in range(args.warmup + args.iterations):
+                # ნელ endpoint-ზე (მაგ. ათასობით query) გაზომვა budget-ით წყდება
+                if latencies and spent > args.budget:
+                    break
+                if not args.warm_cache:
+                    clear_caches()
+                query_count[0] = 0
+                begin = timer.perf_counter()
+                response = call(client)
+                # streamed პასუხი (მაგ. all-bookings) body-ის წაკითხვისას სრულდება
+                response.get_data()
+                response.close()
+                elapsed = (timer.perf_counter() - begin) * 1000
+                spent += elapsed / 1000
+                if i < args.warmup and spent <= args.budget:
+                    continue
+                latencies.append(elapsed)
+                queries.append(query_count[0])
+                statuses[response.status_code] += 1
+            results[endpoint] = summarize(latencies, queries, statuses)
+            summary = results[endpoint]
+            print(f'   {endpoint:24} p50={summary["p50_ms"]:>9}ms p99={summary["p99_ms"]:>9}ms '
+                  f'queries={summary["queries_mean"]:>6} status={summary["status"]}')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_query)
+
+    return {
+        **scale,
+        'materialized_days': materialized,
+        'seed_seconds': seed_seconds,
+        'endpoints': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='endpoint-ების benchmark')
+    parser.add_argument('--database-url', required=True, help='სატესტო ბაზა (ცხრილები წაიშლება!)')
+    parser.add_argument('--scales', default=DEFAULT_SCALES,
+                        help=f'მძიმით გამოყოფილი: {", ".join(SCALES)} (ნაგულისხმევი: {DEFAULT_SCALES})')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--budget', type=float, default=60.0,
+                        help='წამები თითო endpoint-ზე; გადაჭარბებისას იტერაციები წყდება (მინ. 1 გაზომვა)')
+    parser.add_argument('--endpoints', type=lambda value: set(value.split(',')),
+                        help='მხოლოდ ეს endpoint-ები (მძიმით, მაგ. api.available_slots,admin.dashboard)')
+    parser.add_argument('--warm-cache', action='store_true', help='cache-ები მოთხოვნებს შორის არ იწმინდება')
+    parser.add_argument('--output', help='JSON ფაილი (ნაგულისხმევად bench-<commit>.json)')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scales.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SCALES]
+    if unknown:
+        parser.error(f'უცნობი scale: {", ".join(unknown)}')
+
+    os.environ['DATABASE_URL'] = args.database_url
+
+    from app import create_app, db, limiter
+
+    app = create_app('production')
+    app.config['WTF_CSRF_ENABLED'] = False
+    limiter.enabled = False
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'iterations': args.iterations,
+        'warmup': args.warmup,
+        'seed': args.seed,
+        'warm_cache': args.warm_cache,
+        'budget_seconds': args.budget,
+        'scales': {}
+    }
+    with app.app_context():
+        report['database'] = db.engine.dialect.name
+        for name in names:
+            report['scales'][name] = run_scale(app, db, name, SCALES[name], args)
+
+    output = args.output or f'bench-{commit}.json'
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f'results -> {output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""ცხელი query-ების EXPLAIN შემოწმება დიდ, seed-ით შევსებულ ბაზაზე
+
+გამოყენება (მხოლოდ ცალკე, სატესტო ბაზაზე!):
+    python scripts/check_query_plans.py --database-url postgresql://.../madmen_plans
+
+ყოველი query api.py / admin.py / availability.py / booking_guard.py-დან
+იგივე ფორმით იგება და EXPLAIN-დება. თუ რომელიმე bookings / clients /
+barber_schedules ცხრილს მთლიანად (seq scan) კითხულობს - არანულოვანი კოდი.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+from datetime import date, datetime, time, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.seed import client_phone, seed_database
+
+CHECKED_TABLES = {'bookings', 'clients', 'barber_schedules'}
+
+
+def hot_queries(db, user_ids, barber_ids, client_ids, rng):
+    """(სახელი, statement) - იგივე ფილტრები, რაც აპლიკაციაში"""
+    from app.client_summary import summary_columns
+    from app.models import BarberSchedule, Booking, Client
+
+    day = date.today() + timedelta(days=rng.randint(1, 30))
+    window_start = datetime.combine(day, time.min)
+    window_end = window_start + timedelta(days=1)
+    barber_id = rng.choice(barber_ids)
+    user_id = rng.choice(user_ids)
+    client_id = rng.choice(client_ids)
+    slot_start = datetime.combine(day, time(12))
+
+    return [
+        ('booking_guard.find_overlap', db.select(Booking.id).where(
+            Booking.barber_id == barber_id,
+            Booking.status != 'cancelled',
+            Booking.start_time < slot_start + timedelta(minutes=45),
+            Booking.end_time > slot_start
+        ).limit(1)),
+        ('availability.load_busy', db.select(Booking.start_time, Booking.end_time).where(
+            Booking.barber_id == barber_id,
+            Booking.status != 'cancelled',
+            Booking.start_time != None,
+            Booking.start_time < window_end,
+            Booking.end_time > window_start
+        )),
+        ('availability.load_busy_by_barber', db.select(Booking.barber_id, Booking.start_time, Booking.end_time).where(
+            Booking.barber_id.in_(barber_ids[:10]),
+            Booking.status != 'cancelled',
+            Booking.start_time != None,
+            Booking.start_time < window_end + timedelta(days=14),
+            Booking.end_time > window_start
+        )),
+        ('availability.load_schedules', db.select(BarberSchedule).where(
+            BarberSchedule.barber_id == user_id,
+            BarberSchedule.is_working == True
+        )),
+        ('admin.barber_schedule (barber_id, day_of_week)', db.select(BarberSchedule).where(
+            BarberSchedule.barber_id == user_id,
+            BarberSchedule.day_of_week == day.weekday()
+        ).limit(1)),
+        ('admin.dashboard pending (all)', db.select(db.func.count()).select_from(Booking).where(
+            Booking.status == 'pending'
+        )),
+        ('admin.dashboard pending (barber)', db.select(db.func.count()).select_from(Booking).where(
+            Booking.barber_id == barber_id,
+            Booking.status == 'pending'
+        )),
+        ('dashboard.stats (barber)', db.select(
+            db.func.count(db.case(((Booking.start_time >= window_start) & (Booking.start_time < window_end),
+                                   Booking.id))),
+            db.func.count(db.case((Booking.status == 'pending', Booking.id))),
+            db.func.count(Booking.id)
+        ).where(Booking.barber_id == barber_id)),
+        ('admin.dashboard recent', db.select(Booking).order_by(Booking.start_time.desc()).limit(5)),
+        ('admin.bookings list (keyset)', db.select(Booking).where(
+            db.tuple_(Booking.start_time, Booking.id) < (slot_start, 10 ** 9)
+        ).order_by(Booking.start_time.desc(), Booking.id.desc()).limit(21)),
+        ('admin.bookings list (keyset, status)', db.select(Booking).where(
+            Booking.status == 'completed',
+            db.tuple_(Booking.start_time, Booking.id) < (slot_start, 10 ** 9)
+        ).order_by(Booking.start_time.desc(), Booking.id.desc()).limit(21)),
+        ('admin.bookings list (keyset, barber)', db.select(Booking).where(
+            Booking.barber_id == barber_id,
+            db.tuple_(Booking.start_time, Booking.id) < (slot_start, 10 ** 9)
+        ).order_by(Booking.start_time.desc(), Booking.id.desc()).limit(21)),
+        ('api.lookup_client client', db.select(Client).where(Client.phone == client_phone(1234)).limit(1)),
+        # ჯავშნის ჩაწერისას კლიენტის შეჯამების UPDATE-ის subquery-ები
+        ('client summary refresh', db.select(*summary_columns(Client.id).values())
+            .where(Client.id == client_id)),
+    ]
+
+
+def seq_scans(conn, dialect, sql):
+    """ცხრილები, რომლებსაც გეგმა მთლიანად კითხულობს + გეგმის ტექსტი"""
+    if dialect == 'postgresql':
+        plan = conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {sql}').scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        found = []
+        stack = [plan[0]['Plan']]
+        while stack:
+            node = stack.pop()
+            if node.get('Node Type') == 'Seq Scan':
+                found.append(node.get('Relation Name'))
+            stack.extend(node.get('Plans', []))
+        return found, plan
+
+    rows = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}').fetchall()
+    found = []
+    for row in rows:
+        match = re.match(r'^SCAN (\w+)$', row[-1])
+        if match:
+            found.append(match.group(1))
+    return found, '\n'.join(row[-1] for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ცხელი query-ების EXPLAIN შემოწმება')
+    parser.add_argument('--database-url', required=True, help='სატესტო ბაზა (ცხრილები შეიქმნება)')
+    parser.add_argument('--bookings', type=int, default=200000)
+    parser.add_argument('--clients', type=int, default=20000)
+    parser.add_argument('--barbers', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--verbose', action='store_true', help='ყველა გეგმის ჩვენება')
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url
+
+    from app import create_app, db
+
+    app = create_app('production')
+    rng = random.Random(args.seed)
+
+    with app.app_context():
+        db.create_all()
+        seeded = seed_database(db, args.barbers, args.clients, args.bookings, rng)
+
+        dialect = db.engine.dialect.name
+        with db.engine.connect() as conn:
+            if dialect == 'postgresql':
+                conn.execution_options(isolation_level='AUTOCOMMIT').exec_driver_sql('VACUUM ANALYZE')
+            else:
+                conn.exec_driver_sql('ANALYZE')
+
+            failures = 0
+            for name, statement in hot_queries(db, seeded.user_ids, seeded.barber_ids, seeded.client_ids, rng):
+                sql = str(statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+                scanned, plan = seq_scans(conn, dialect, sql)
+                tables = [t for t in scanned if t in CHECKED_TABLES]
+                status = 'SEQ SCAN ' + ', '.join(tables) if tables else 'ok'
+                print(f'{name:50} {status}')
+                if tables or args.verbose:
+                    print(f'    {plan}')
+                failures += bool(tables)
+
+    if failures:
+        print(f'FAIL: {failures} query იყენებს seq scan-ს', file=sys.stderr)
+        return 1
+    print('OK')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""სატესტო ბაზის შევსება დიდი მონაცემებით (benchmark / query plan შემოწმებისთვის)
+
+Core insert-ები ORM-ის გარეშე, ფიქსირებული random seed-ით - ერთი და იგივე
+პარამეტრები ყოველთვის ერთსა და იმავე მონაცემებს აძლევს.
+"""
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+
+CHUNK = 5000
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 18  # 10:00 - 19:00, ნახევარსაათიანი ჯავშნები
+FUTURE_DAYS = 30  # ბოლო ჯავშნები რამდენი დღით წინაა
+FILL_RATE = 0.75
+
+Seeded = namedtuple('Seeded', ['admin_id', 'user_ids', 'barber_ids', 'client_ids', 'service_ids', 'phones'])
+
+
+def client_phone(index):
+    # კანონიკური ფორმა (app/phones.py) - როგორც ჩაწერის გზები ინახავენ
+    return f'+9955{index:08d}'
+
+
+def seed_database(db, barbers, clients, bookings, rng):
+    """ცარიელ ბაზაში: ადმინი, barbers ბარბერი გრაფიკით, clients კლიენტი და
+    bookings ჯავშანი - ბარბერზე გადაფარვის გარეშე, დღეს + FUTURE_DAYS-მდე.
+    created_at ყველგან seed-ის დროა - წლიური სტატისტიკა ყველა ჯავშანს ითვლის."""
+    from app.models import Barber, BarberSchedule, Booking, Client, Service, User
+
+    conn = db.session.connection()
+    now = datetime.utcnow()
+
+    conn.execute(User.__table__.insert(), [
+        {'username': 'bench_admin', 'email': 'bench_admin@example.com', 'password_hash': '-',
+         'role': 'admin', 'is_active': True, 'created_at': now}
+    ])
+    admin_id = conn.execute(db.select(User.id).where(User.username == 'bench_admin')).scalar()
+
+    conn.execute(Service.__table__.insert(), [
+        {'name': f'Service {i}', 'price': 20 + i, 'duration': 30 + 15 * (i % 3), 'is_active': True}
+        for i in range(10)
+    ])
+    service_ids = [row[0] for row in conn.execute(db.select(Service.id).order_by(Service.id))]
+
+    conn.execute(User.__table__.insert(), [
+        {'username': f'barber{i}', 'email': f'barber{i}@example.com', 'password_hash': '-',
+         'first_name': 'Barber', 'last_name': str(i), 'role': 'barber', 'is_active': True, 'created_at': now}
+        for i in range(barbers)
+    ])
+    user_ids = [row[0] for row in conn.execute(
+        db.select(User.id).where(User.role == 'barber').order_by(User.id))]
+    conn.execute(Barber.__table__.insert(), [
+        {'user_id': user_id, 'name': f'Barber {user_id}', 'created_at': now} for user_id in user_ids
+    ])
+    barber_ids = [row[0] for row in conn.execute(db.select(Barber.id).order_by(Barber.id))]
+    conn.execute(BarberSchedule.__table__.insert(), [
+        {'barber_id': user_id, 'day_of_week': day, 'start_time': time(10), 'end_time': time(19),
+         'is_working': day < 6, 'created_at': now}
+        for user_id in user_ids for day in range(7)
+    ])
+
+    phones = [client_phone(i) for i in range(clients)]
+    for offset in range(0, clients, CHUNK):
+        conn.execute(Client.__table__.insert(), [
+            {'phone': phone, 'name': f'Client {phone}', 'created_at': now}
+            for phone in phones[offset:offset + CHUNK]
+        ])
+    client_ids = [row[0] for row in conn.execute(db.select(Client.id).order_by(Client.id))]
+
+    # დღეები უკან ბოლო დღიდან (დღეს + FUTURE_DAYS), სანამ bookings არ შეივსება;
+    # სლოტების ~FILL_RATE დაკავებულია, რომ ხელმისაწვდომობას რაიმე დარჩეს
+    past_statuses = ['completed'] * 12 + ['confirmed'] * 4 + ['cancelled'] * 2 + ['pending']
+    future_statuses = ['confirmed'] * 6 + ['pending'] * 3 + ['cancelled']
+
+    rows = []
+    inserted = 0
+    day = date.today() + timedelta(days=FUTURE_DAYS)
+    while inserted < bookings and barber_ids:
+        statuses = past_statuses if day < date.today() else future_statuses
+        for barber_id in barber_ids:
+            for slot in range(SLOTS_PER_DAY):
+                if inserted >= bookings or rng.random() >= FILL_RATE:
+                    continue
+                start = datetime.combine(day, time(10)) + timedelta(minutes=SLOT_MINUTES * slot)
+                rows.append({
+                    'service_id': rng.choice(service_ids), 'barber_id': barber_id,
+                    'client_id': rng.choice(client_ids) if client_ids else None, 'price': 30.0,
+                    'start_time': start, 'end_time': start + timedelta(minutes=SLOT_MINUTES),
+                    'status': rng.choice(statuses), 'customer_name': 'Seed', 'customer_phone': '+995500000000',
+                    'created_at': now, 'updated_at': now
+                })
+                inserted += 1
+                if len(rows) >= CHUNK:
+                    conn.execute(Booking.__table__.insert(), rows)
+                    rows = []
+        day -= timedelta(days=1)
+    if rows:
+        conn.execute(Booking.__table__.insert(), rows)
+
+    db.session.commit()
+    return Seeded(admin_id, user_ids, barber_ids, client_ids, service_ids, phones)
@@ -0,0 +1,83 @@
+"""ერთი და იგივე სლოტის პარალელური დაჯავშნის stress შემოწმება
+
+გამოყენება (მხოლოდ ცალკე, სატესტო ბაზაზე!):
+    python scripts/stress_booking.py --database-url postgresql://.../madmen_stress --requests 300
+
+მოსალოდნელი შედეგი: ზუსტად ერთი წარმატებული ჯავშანი, დანარჩენი 409.
+წარუმატებლობისას აბრუნებს არანულოვან კოდს.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='პარალელური ჯავშნების stress შემოწმება')
+    parser.add_argument('--database-url', required=True, help='სატესტო ბაზა (ცხრილები შეიქმნება)')
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--workers', type=int, default=32)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url
+
+    from app import create_app, db, limiter
+    from app.models import Barber, BarberSchedule, Booking, Service, User
+
+    app = create_app('production')
+    app.config['WTF_CSRF_ENABLED'] = False
+    limiter.enabled = False
+
+    with app.app_context():
+        db.create_all()
+        user = User(username='stress_barber', email='stress@example.com',
+                    first_name='Stress', last_name='Test', role='barber')
+        user.set_password('stress')
+        db.session.add(user)
+        db.session.flush()
+        barber = Barber(user_id=user.id, name='Stress Test')
+        service = Service(name='Stress', price=10, duration=30, is_active=True)
+        db.session.add_all([barber, service])
+        for day_of_week in range(7):
+            db.session.add(BarberSchedule(barber_id=user.id, day_of_week=day_of_week,
+                                          start_time=time(0), end_time=time(23, 59), is_working=True))
+        db.session.commit()
+        user_id, barber_id, service_id = user.id, barber.id, service.id
+
+    target_day = (date.today() + timedelta(days=1)).strftime('%Y-%m-%d')
+
+    def attempt(i):
+        with app.test_client() as client:
+            response = client.post('/api/bookings/create', json={
+                'service_id': service_id,
+                'barber_id': user_id,
+                'date': target_day,
+                'time': '12:00',
+                'customer_name': f'Stress {i}',
+                'customer_phone': f'555{i:06d}'
+            })
+            return response.status_code
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        codes = list(pool.map(attempt, range(args.requests)))
+
+    with app.app_context():
+        rows = Booking.query.filter(Booking.barber_id == barber_id, Booking.status != 'cancelled').count()
+
+    created = codes.count(201) + codes.count(200)
+    conflicts = codes.count(409)
+    other = len(codes) - created - conflicts
+    print(f'requests={len(codes)} created={created} conflicts={conflicts} other={other} rows={rows}')
+
+    if created != 1 or rows != 1 or other:
+        print('FAIL: სლოტი ერთზე მეტჯერ დაიჯავშნა ან მოულოდნელი პასუხი', file=sys.stderr)
+        return 1
+    print('OK')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())